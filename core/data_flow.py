@@ -2,7 +2,8 @@
 数据流管理 - 简化的依赖关系管理
 """
 
-from typing import Dict, List, Any, Tuple
+from collections import deque
+from typing import Dict, List, Any, Tuple, Optional, Set
 from .nodes import Node
 
 
@@ -12,11 +13,32 @@ class DataFlow:
     def __init__(self):
         self.nodes: Dict[str, Node] = {}
         self.dependencies: Dict[str, List[str]] = {}
+        # 反向邻接表：source -> 依赖 source 的节点列表
+        self.children: Dict[str, List[str]] = {}
+        # 依赖集合：与 dependencies 保持一致，用于O(1)成员判断
+        self._dep_sets: Dict[str, Set[str]] = {}
+        # 拓扑排序缓存，任何结构变更都会将其置为失效
+        self._order_cache: Optional[List[str]] = None
+        self._dirty = True
+        # 结构校验缓存，与拓扑排序缓存同时失效
+        self._validated = False
+        self._validation_errors: List[str] = []
+    
+    def _invalidate(self):
+        """结构变更后使拓扑排序与校验缓存失效"""
+        self._dirty = True
+        self._validated = False
     
     def add_node(self, node: Node):
         """添加节点到数据流"""
+        # 重复添加同名节点时会清空其依赖，需要同步清理反向邻接表
+        for dep in self.dependencies.get(node.name, []):
+            self.children[dep].remove(node.name)
         self.nodes[node.name] = node
         self.dependencies[node.name] = []
+        self._dep_sets[node.name] = set()
+        self.children.setdefault(node.name, [])
+        self._invalidate()
     
     def add_dependency(self, source_node: str, target_node: str):
         """添加依赖关系 - target_node 依赖 source_node"""
@@ -26,36 +48,56 @@ class DataFlow:
         # 添加依赖关系 - target_node 依赖 source_node
         if target_node not in self.dependencies:
             self.dependencies[target_node] = []
+            self._dep_sets[target_node] = set()
         
-        if source_node not in self.dependencies[target_node]:
+        dep_set = self._dep_sets[target_node]
+        if source_node not in dep_set:
+            dep_set.add(source_node)
             self.dependencies[target_node].append(source_node)
+            self.children[source_node].append(target_node)
+            self._invalidate()
+    
+    def _bulk_set_dependencies(self, dependencies: Dict[str, List[str]]):
+        """批量设置依赖关系并一次性重建索引，引用不存在节点的依赖会被忽略"""
+        self.dependencies = {name: [] for name in self.nodes}
+        self._dep_sets = {name: set() for name in self.nodes}
+        self.children = {name: [] for name in self.nodes}
+        for target, sources in dependencies.items():
+            if target not in self.nodes:
+                continue
+            dep_list = self.dependencies[target]
+            dep_set = self._dep_sets[target]
+            for source in sources:
+                if source in self.nodes and source not in dep_set:
+                    dep_set.add(source)
+                    dep_list.append(source)
+                    self.children[source].append(target)
+        self._invalidate()
     
     def get_execution_order(self) -> List[str]:
-        """获取执行顺序（拓扑排序）"""
-        return self._topological_sort()
+        """获取执行顺序（拓扑排序），结构未变更时复用缓存结果"""
+        if self._dirty or self._order_cache is None:
+            self._order_cache = self._topological_sort()
+            self._dirty = False
+        return list(self._order_cache)
     
     def _topological_sort(self) -> List[str]:
-        """拓扑排序"""
-        in_degree = {node: 0 for node in self.nodes}
-        
-        # 计算入度：node 依赖 deps，node 入度+1
-        for node, deps in self.dependencies.items():
-            for dep in deps:
-                in_degree[node] += 1
+        """拓扑排序（Kahn算法，O(V+E)）"""
+        # 计算入度：node 依赖 deps，node 入度为 len(deps)
+        in_degree = {node: len(self.dependencies.get(node, [])) for node in self.nodes}
 
-        queue = [node for node, degree in in_degree.items() if degree == 0]
+        queue = deque(node for node, degree in in_degree.items() if degree == 0)
         result = []
 
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             result.append(current)
             
             # 当前节点被移除后，所有依赖它的节点入度-1
-            for child, deps in self.dependencies.items():
-                if current in deps:
-                    in_degree[child] -= 1
-                    if in_degree[child] == 0:
-                        queue.append(child)
+            for child in self.children.get(current, []):
+                in_degree[child] -= 1
+                if in_degree[child] == 0:
+                    queue.append(child)
 
         if len(result) != len(self.nodes):
             raise ValueError("Circular dependency detected")
@@ -67,11 +109,7 @@ class DataFlow:
     
     def get_node_dependents(self, node_name: str) -> List[str]:
         """获取依赖该节点的节点"""
-        dependents = []
-        for node, deps in self.dependencies.items():
-            if node_name in deps:
-                dependents.append(node)
-        return dependents
+        return list(self.children.get(node_name, []))
     
     def remove_node(self, node_name: str):
         """删除节点"""
@@ -80,39 +118,54 @@ class DataFlow:
             
         # 从依赖关系中删除
         if node_name in self.dependencies:
+            for dep in self.dependencies[node_name]:
+                self.children[dep].remove(node_name)
             del self.dependencies[node_name]
+            del self._dep_sets[node_name]
         
-        # 从其他节点的依赖中删除
-        for deps in self.dependencies.values():
-            if node_name in deps:
-                deps.remove(node_name)
+        # 从其他节点的依赖中删除（只需遍历依赖该节点的下游节点）
+        for child in self.children.pop(node_name, []):
+            self._dep_sets[child].discard(node_name)
+            self.dependencies[child].remove(node_name)
+        self._invalidate()
     
     def remove_dependency(self, source_node: str, target_node: str):
         """删除依赖关系"""
-        if target_node in self.dependencies and source_node in self.dependencies[target_node]:
+        if target_node in self._dep_sets and source_node in self._dep_sets[target_node]:
+            self._dep_sets[target_node].discard(source_node)
             self.dependencies[target_node].remove(source_node)
+            self.children[source_node].remove(target_node)
+            self._invalidate()
     
     def validate_structure(self) -> Tuple[bool, List[str]]:
-        """验证数据结构"""
+        """验证数据结构，结构未变更时直接返回上次的校验结果"""
+        if self._validated:
+            return len(self._validation_errors) == 0, list(self._validation_errors)
+        
+        errors = self._check_structure()
+        self._validation_errors = errors
+        self._validated = True
+        return len(errors) == 0, list(errors)
+    
+    def _check_structure(self) -> List[str]:
+        """执行结构校验，返回错误列表"""
         errors = []
         
         # 1. 检查start_node是否存在
         if "start_node" not in self.nodes:
             errors.append("Missing start_node")
-            return False, errors
+            return errors
         
         # 2. 计算所有与start_node连通的节点
         reachable = set()
-        queue = ["start_node"]
+        queue = deque(["start_node"])
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             if current in reachable:
                 continue
             reachable.add(current)
             # 找到所有依赖current的节点（即current是source，child是target）
-            for child, deps in self.dependencies.items():
-                if current in deps:
-                    queue.append(child)
+            queue.extend(self.children.get(current, []))
         
         # 3. 检查所有节点是否都可达
         for node_name in self.nodes:
@@ -125,7 +178,7 @@ class DataFlow:
         except ValueError as e:
             errors.append(str(e))
         
-        return len(errors) == 0, errors
+        return errors
     
     def __repr__(self):
         return f"DataFlow(nodes={list(self.nodes.keys())}, dependencies={len(self.dependencies)})" 
\ No newline at end of file
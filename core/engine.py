@@ -7,17 +7,26 @@
 
 import logging
 import json
-from typing import Dict, List, Any, Optional, Tuple, Union
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Set, Tuple, Union
 from .nodes import Node, NodeResult, StartNode, GateNode, LogicNode, CollectionNode, parse_dynamic_parameters
 from .data_flow import DataFlow
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
+
 
 class RuleEngine:
     """规则引擎核心类 - 简化版本"""
     
-    def __init__(self, name: str = "default"):
+    def __init__(self, name: str = "default", max_workers: int = 1):
         self.name = name
+        # 并行执行的最大线程数，1表示按拓扑顺序串行执行
+        self.max_workers = max_workers
         self.data_flow = DataFlow()
         self.context: Dict[str, Any] = {}
         self.placeholders: Dict[str, Any] = {}
@@ -34,15 +43,15 @@ class RuleEngine:
     def add_node(self, node: Node):
         """添加节点到引擎"""
         self.data_flow.add_node(node)
-        self.logger.info(f"Added node: {node.name} ({node.__class__.__name__})")
+        self.logger.info("Added node: %s (%s)", node.name, node.__class__.__name__)
     
     def get_node(self, node_name: str) -> Optional[Node]:
         """获取节点"""
         return self.data_flow.nodes.get(node_name)
     
-    def get_all_nodes(self) -> Dict[str, Node]:
-        """获取所有节点"""
-        return self.data_flow.nodes.copy()
+    def get_all_nodes(self) -> Mapping[str, Node]:
+        """获取所有节点（只读视图，需要可变副本时使用 dict(...)）"""
+        return MappingProxyType(self.data_flow.nodes)
     
     def get_nodes_by_type(self, node_type: str) -> Dict[str, Node]:
         """根据节点类型获取节点"""
@@ -83,7 +92,7 @@ class RuleEngine:
 
         # 添加依赖关系
         self.data_flow.add_dependency(source_node.name, target_node.name)
-        self.logger.info(f"Added dependency: {source_node.name} -> {target_node.name}")
+        self.logger.info("Added dependency: %s -> %s", source_node.name, target_node.name)
     
     def get_node_dependencies(self, node_name: str) -> List[str]:
         """获取节点的依赖"""
@@ -102,15 +111,15 @@ class RuleEngine:
     def set_context(self, context: Dict[str, Any]):
         """设置执行上下文"""
         self.context = context
-        self.logger.info(f"Set context with {len(context)} items")
+        self.logger.info("Set context with %s items", len(context))
     
-    def get_context(self) -> Dict[str, Any]:
-        """获取执行上下文"""
-        return self.context.copy()
+    def get_context(self) -> Mapping[str, Any]:
+        """获取执行上下文（只读视图，需要可变副本时使用 dict(...)）"""
+        return MappingProxyType(self.context)
     
-    def get_placeholders(self) -> Dict[str, Any]:
-        """获取占位符"""
-        return self.placeholders.copy()
+    def get_placeholders(self) -> Mapping[str, Any]:
+        """获取占位符（只读视图，需要可变副本时使用 dict(...)）"""
+        return MappingProxyType(self.placeholders)
     
     def get_job_date(self) -> str:
         """获取作业日期"""
@@ -140,6 +149,11 @@ class RuleEngine:
             execution_context.update(variables)
         if placeholders:
             execution_context.update(placeholders)
+        
+        # 上下文中含动态参数的字符串在每次执行时统一解析一次，节点内无需再逐个扫描
+        for key, value in execution_context.items():
+            if isinstance(value, str) and '${' in value:
+                execution_context[key] = parse_dynamic_parameters(value, job_date, placeholders)
 
         self.context = execution_context
         
@@ -148,68 +162,111 @@ class RuleEngine:
         if not is_valid:
             raise ValueError(f"Rule engine validation failed: {errors}")
         
-        self.logger.info(f"Starting execution of rule engine: {self.name}")
+        self.logger.info("Starting execution of rule engine: %s", self.name)
         if job_date:
-            self.logger.info(f"Job date: {job_date}")
+            self.logger.info("Job date: %s", job_date)
         
         # 获取执行顺序
         execution_order = self.get_execution_order()
-        self.logger.info(f"Execution order: {execution_order}")
+        self.logger.info("Execution order: %s", execution_order)
+        
+        # 预先构建GateNode名称集合和各节点依赖列表，避免在节点循环中重复做类型判断
+        gate_nodes = self._get_gate_nodes()
+        deps_of = {name: self.get_node_dependencies(name) for name in execution_order}
+        
+        # 复用结果字典，每次执行前清空上次的结果；只写入已完成节点的结果，执行中断时不会留下空槽位
+        results = self.execution_results
+        results.clear()
+        
+        # 节点循环内的INFO日志只在启用时记录
+        log_info = self.logger.isEnabledFor(logging.INFO)
+        if self.max_workers > 1:
+            self._execute_parallel(execution_order, gate_nodes, deps_of, log_info)
+            # 并行执行按完成顺序写入，结束后原地恢复为执行顺序
+            ordered = [(name, results[name]) for name in execution_order]
+            results.clear()
+            results.update(ordered)
+        else:
+            # 按顺序执行节点
+            for node_name in execution_order:
+                results[node_name] = self._run_node(node_name, gate_nodes, deps_of[node_name], log_info)
         
-        # 按顺序执行节点
-        for node_name in execution_order:
-            try:
-                result = self._execute_node(node_name)
-                self.execution_results[node_name] = result
+        self.logger.info("Rule engine execution completed")
+        return results
+    
+    def _execute_parallel(self, execution_order: List[str], gate_nodes: Set[str], deps_of: Dict[str, List[str]], log_info: bool):
+        """
+        并行执行节点：依赖全部完成的节点进入就绪队列，提交到线程池执行。
+        执行结果只在主线程写入，下游节点提交时其依赖结果均已就绪。
+        """
+        in_degree = {name: len(deps_of[name]) for name in execution_order}
+        ready = deque(name for name in execution_order if in_degree[name] == 0)
+        children = self.data_flow.children
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {}
+            while ready or futures:
+                while ready:
+                    node_name = ready.popleft()
+                    future = pool.submit(self._run_node, node_name, gate_nodes, deps_of[node_name], log_info)
+                    futures[future] = node_name
                 
-                if result.success:
-                    self.logger.info(f"Node {node_name} executed successfully")
-                else:
-                    self.logger.error(f"Node {node_name} failed: {result.error}")
-                    
-            except Exception as e:
-                node = self.data_flow.nodes[node_name]
-                node_type = node.node_type if hasattr(node, 'node_type') else 'unknown'
-                error_result = NodeResult(success=False, error=str(e), node_type=node_type)
-                self.execution_results[node_name] = error_result
-                self.logger.error(f"Node {node_name} execution error: {e}")
-        
-        self.logger.info(f"Rule engine execution completed")
-        return self.execution_results
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node_name = futures.pop(future)
+                    self.execution_results[node_name] = future.result()
+                    for child in children.get(node_name, []):
+                        in_degree[child] -= 1
+                        if in_degree[child] == 0:
+                            ready.append(child)
+    
+    def _run_node(self, node_name: str, gate_nodes: Set[str], dep_names: List[str], log_info: bool = True) -> NodeResult:
+        """执行单个节点并记录日志，未捕获的异常转换为失败结果"""
+        try:
+            result = self._execute_node(node_name, gate_nodes, dep_names)
+        except Exception as e:
+            node = self.data_flow.nodes[node_name]
+            node_type = node.node_type if hasattr(node, 'node_type') else 'unknown'
+            self.logger.error("Node %s execution error: %s", node_name, e)
+            return NodeResult(success=False, error=str(e), node_type=node_type)
+        
+        if result.success:
+            if log_info:
+                self.logger.info("Node %s executed successfully", node_name)
+        else:
+            self.logger.error("Node %s failed: %s", node_name, result.error)
+        return result
     
-    def _execute_node(self, node_name: str) -> NodeResult:
+    def _get_gate_nodes(self) -> Set[str]:
+        """获取所有GateNode的名称集合"""
+        return {name for name, node in self.data_flow.nodes.items() if isinstance(node, GateNode)}
+    
+    def _find_passing_gate(self, gate_deps: List[str]) -> Optional[str]:
+        """返回第一个执行成功且允许继续的GateNode依赖名称"""
+        for gate_dep_name in gate_deps:
+            gate_result = self.execution_results.get(gate_dep_name)
+            if gate_result and gate_result.success and self.data_flow.nodes[gate_dep_name].should_continue:
+                return gate_dep_name
+        return None
+    
+    def _execute_node(self, node_name: str, gate_nodes: Optional[Set[str]] = None, dep_names: Optional[List[str]] = None) -> NodeResult:
         """执行单个节点"""
         node = self.data_flow.nodes[node_name]
+        if gate_nodes is None:
+            gate_nodes = self._get_gate_nodes()
         
         # 检查GateNode依赖：只要有一个GateNode通过就允许执行
-        dep_names = self.get_node_dependencies(node_name)
+        if dep_names is None:
+            dep_names = self.get_node_dependencies(node_name)
         if dep_names:
             # 检查是否有GateNode依赖
-            gate_deps = []
-            other_deps = []
-            for dep_node_name in dep_names:
-                dep_node = self.data_flow.nodes[dep_node_name]
-                if isinstance(dep_node, GateNode):
-                    gate_deps.append(dep_node_name)
-                else:
-                    other_deps.append(dep_node_name)
+            gate_deps = [dep for dep in dep_names if dep in gate_nodes]
+            other_deps = [dep for dep in dep_names if dep not in gate_nodes]
             
-            # 如果有GateNode依赖，检查是否至少有一个通过
-            if gate_deps:
-                has_passing_gate = False
-                for gate_dep_name in gate_deps:
-                    gate_dep_node = self.data_flow.nodes[gate_dep_name]
-                    gate_result = self.execution_results.get(gate_dep_name)
-                    if gate_result and gate_result.success:
-                        if hasattr(gate_dep_node, 'should_continue') and gate_dep_node.should_continue:
-                            has_passing_gate = True
-                            break
-                
-                # 如果所有GateNode都阻止，则阻止执行
-                if not has_passing_gate:
-                    node = self.data_flow.nodes[node_name]
-                    node_type = node.node_type if hasattr(node, 'node_type') else 'unknown'
-                    return NodeResult(success=False, error=f"All gate dependencies blocked execution for node {node_name}", status="blocked", node_type=node_type)
+            # 如果所有GateNode都阻止，则阻止执行
+            if gate_deps and self._find_passing_gate(gate_deps) is None:
+                node_type = node.node_type if hasattr(node, 'node_type') else 'unknown'
+                return NodeResult(success=False, error=f"All gate dependencies blocked execution for node {node_name}", status="blocked", node_type=node_type)
             
             # 检查其他非GateNode依赖：如果有依赖节点且所有依赖节点都未成功，则本节点被阻断
             if other_deps:
@@ -220,54 +277,43 @@ class RuleEngine:
                         all_blocked_or_failed = False
                         break
                 if all_blocked_or_failed:
-                    node = self.data_flow.nodes[node_name]
                     node_type = node.node_type if hasattr(node, 'node_type') else 'unknown'
                     return NodeResult(success=False, error=f"All non-gate dependencies failed or blocked for node {node_name}", status="blocked", node_type=node_type)
         
         # 获取节点输入数据
-        inputs = self._get_node_inputs(node_name)
+        inputs = self._get_node_inputs(node_name, dep_names, gate_nodes)
         
         # 设置节点输入
-        for input_name, input_data in inputs.items():
-            node.add_input(input_name, input_data)
+        node.replace_inputs(inputs)
         
         # 执行节点
         result = node.execute(self.context, self.job_date, self.placeholders)
         
         return result
     
-    def _get_node_inputs(self, node_name: str) -> Dict[str, Any]:
+    def _get_node_inputs(self, node_name: str, dep_names: Optional[List[str]] = None, gate_nodes: Optional[Set[str]] = None) -> Dict[str, Any]:
         """获取节点的输入数据"""
-        node = self.data_flow.nodes[node_name]
         inputs = {}
         
         # 从依赖节点获取数据
-        dep_names = self.get_node_dependencies(node_name)
+        if dep_names is None:
+            dep_names = self.get_node_dependencies(node_name)
         if dep_names:
-            # 检查是否有GateNode依赖
-            gate_deps = []
-            other_deps = []
-            for dep_node_name in dep_names:
-                dep_node = self.data_flow.nodes[dep_node_name]
-                if isinstance(dep_node, GateNode):
-                    gate_deps.append(dep_node_name)
-                else:
-                    other_deps.append(dep_node_name)
+            if gate_nodes is None:
+                gate_nodes = self._get_gate_nodes()
             
             # 处理GateNode依赖：只要有一个通过就传递数据
+            gate_deps = [dep for dep in dep_names if dep in gate_nodes]
             if gate_deps:
-                for gate_dep_name in gate_deps:
-                    gate_dep_node = self.data_flow.nodes[gate_dep_name]
-                    gate_result = self.execution_results.get(gate_dep_name)
-                    if gate_result and gate_result.success:
-                        if hasattr(gate_dep_node, 'should_continue') and gate_dep_node.should_continue:
-                            # 传递通过的GateNode数据
-                            inputs[f"__node_{gate_dep_name}"] = gate_dep_node
-                            break  # 只要有一个通过就够了
+                passing_gate = self._find_passing_gate(gate_deps)
+                if passing_gate is not None:
+                    # 传递通过的GateNode数据
+                    inputs[f"__node_{passing_gate}"] = self.data_flow.nodes[passing_gate]
             
             # 处理其他非GateNode依赖
-            for dep_node_name in other_deps:
-                dep_node = self.data_flow.nodes[dep_node_name]
+            for dep_node_name in dep_names:
+                if dep_node_name in gate_nodes:
+                    continue
                 
                 # 检查依赖节点的执行结果，只传递成功执行的节点的数据
                 dep_result = self.execution_results.get(dep_node_name)
@@ -276,11 +322,9 @@ class RuleEngine:
                     continue
                 
                 # 传递节点对象，以便访问flow_context
-                inputs[f"__node_{dep_node_name}"] = dep_node
-        
-        # 合并上下文数据到输入，确保全局变量可用
-        inputs.update(self.context)
+                inputs[f"__node_{dep_node_name}"] = self.data_flow.nodes[dep_node_name]
         
+        # 全局上下文不再复制进每个节点的输入，节点通过execute的context参数读取
         return inputs
     
     # ==================== 结果查询 ====================
@@ -321,27 +365,39 @@ class RuleEngine:
     def get_execution_summary(self) -> Dict[str, Any]:
         """获取执行摘要"""
         total_nodes = len(self.data_flow.nodes)
-        successful_nodes = sum(1 for result in self.execution_results.values() if result.success)
-        failed_nodes = sum(1 for result in self.execution_results.values() if not result.success and result.status == "failed")
-        blocked_nodes = sum(1 for result in self.execution_results.values() if not result.success and result.status == "blocked")
-        executed_nodes = sum(1 for result in self.execution_results.values() if result.status == "executed")
+        successful_nodes = failed_nodes = blocked_nodes = executed_nodes = 0
+        failed_nodes_list = []
+        blocked_nodes_list = []
         
-        # 按节点类型统计执行结果
+        # 单次遍历同时完成总体计数和按节点类型统计
         node_type_results = {}
         for node_name, result in self.execution_results.items():
+            status = result.status
+            if result.success:
+                successful_nodes += 1
+            elif status == "failed":
+                failed_nodes += 1
+                failed_nodes_list.append(node_name)
+            elif status == "blocked":
+                blocked_nodes += 1
+                blocked_nodes_list.append(node_name)
+            if status == "executed":
+                executed_nodes += 1
+            
             node = self.data_flow.nodes.get(node_name)
             if node and hasattr(node, 'node_type'):
                 node_type = node.node_type
                 if node_type not in node_type_results:
                     node_type_results[node_type] = {'total': 0, 'successful': 0, 'failed': 0, 'blocked': 0}
                 
-                node_type_results[node_type]['total'] += 1
+                type_results = node_type_results[node_type]
+                type_results['total'] += 1
                 if result.success:
-                    node_type_results[node_type]['successful'] += 1
-                elif result.status == "failed":
-                    node_type_results[node_type]['failed'] += 1
-                elif result.status == "blocked":
-                    node_type_results[node_type]['blocked'] += 1
+                    type_results['successful'] += 1
+                elif status == "failed":
+                    type_results['failed'] += 1
+                elif status == "blocked":
+                    type_results['blocked'] += 1
         
         return {
             'total_nodes': total_nodes,
@@ -354,14 +410,8 @@ class RuleEngine:
             'execution_order': self.get_execution_order(),
             'node_types_count': self.get_node_types_count(),
             'node_type_results': node_type_results,
-            'failed_nodes_list': [
-                node_name for node_name, result in self.execution_results.items() 
-                if not result.success and result.status == "failed"
-            ],
-            'blocked_nodes_list': [
-                node_name for node_name, result in self.execution_results.items() 
-                if not result.success and result.status == "blocked"
-            ]
+            'failed_nodes_list': failed_nodes_list,
+            'blocked_nodes_list': blocked_nodes_list
         }
     
     # ==================== 状态管理 ====================
@@ -387,38 +437,38 @@ class RuleEngine:
         node = self.get_node(node_name)
         if node:
             node.set_tracked_variables(variables)
-            self.logger.info(f"Set tracked variables for node {node_name}: {variables}")
+            self.logger.info("Set tracked variables for node %s: %s", node_name, variables)
         else:
-            self.logger.warning(f"Node {node_name} not found")
+            self.logger.warning("Node %s not found", node_name)
     
     def add_node_tracked_variable(self, node_name: str, variable: str):
         """为节点添加单个要跟踪的变量"""
         node = self.get_node(node_name)
         if node:
             node.add_tracked_variable(variable)
-            self.logger.info(f"Added tracked variable {variable} for node {node_name}")
+            self.logger.info("Added tracked variable %s for node %s", variable, node_name)
         else:
-            self.logger.warning(f"Node {node_name} not found")
+            self.logger.warning("Node %s not found", node_name)
     
     def set_node_expected_input_schema(self, node_name: str, schema: Dict[str, str]):
         """设置节点的期望输入schema"""
         node = self.get_node(node_name)
         if node:
             node.set_expected_input_schema(schema)
-            self.logger.info(f"Set expected input schema for node {node_name}: {schema}")
+            self.logger.info("Set expected input schema for node %s: %s", node_name, schema)
         else:
-            self.logger.warning(f"Node {node_name} not found")
+            self.logger.warning("Node %s not found", node_name)
     
     def add_node_expected_input_schema(self, node_name: str, variable: str, schema: str):
         """为节点添加单个期望的输入schema"""
         node = self.get_node(node_name)
         if node:
             node.add_expected_input_schema(variable, schema)
-            self.logger.info(f"Added expected input schema for node {node_name}: {variable} -> {schema}")
+            self.logger.info("Added expected input schema for node %s: %s -> %s", node_name, variable, schema)
         else:
-            self.logger.warning(f"Node {node_name} not found")
+            self.logger.warning("Node %s not found", node_name)
     
-    def get_node_flow_context(self, node_name: str) -> Dict[str, Tuple[Any, str, datetime]]:
+    def get_node_flow_context(self, node_name: str) -> Dict[str, Tuple[Any, str, int]]:
         """获取节点的flow_context"""
         node = self.get_node(node_name)
         if node and hasattr(node, 'get_flow_context'):
@@ -432,7 +482,7 @@ class RuleEngine:
             return node.get_flow_context_values()
         return {}
     
-    def get_all_nodes_flow_context(self) -> Dict[str, Dict[str, Tuple[Any, str, datetime]]]:
+    def get_all_nodes_flow_context(self) -> Dict[str, Dict[str, Tuple[Any, str, int]]]:
         """获取所有节点的flow_context"""
         flow_contexts = {}
         for node_name, node in self.data_flow.nodes.items():
@@ -549,6 +599,13 @@ class RuleEngine:
     # ==================== JSON导入导出 ====================
     def export_to_json(self) -> str:
         """导出规则引擎配置为JSON字符串"""
+        config = self._build_export_config()
+        if orjson is not None:
+            return orjson.dumps(config, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        return json.dumps(config, ensure_ascii=True)
+    
+    def _build_export_config(self) -> Dict[str, Any]:
+        """构建导出用的配置字典"""
         config = {
             'name': self.name,
             'nodes': {},
@@ -578,12 +635,12 @@ class RuleEngine:
             
             config['nodes'][node_name] = node_config
         
-        return json.dumps(config, ensure_ascii=True)
+        return config
     
     @staticmethod
-    def import_from_json(json_str: str) -> 'RuleEngine':
-        """从JSON字符串创建新的规则引擎实例"""
-        config = json.loads(json_str)
+    def import_from_json(json_str: Union[str, bytes]) -> 'RuleEngine':
+        """从JSON字符串（或UTF-8字节）创建新的规则引擎实例"""
+        config = orjson.loads(json_str) if orjson is not None else json.loads(json_str)
         
         # 创建新的引擎实例
         engine_name = config.get('name', 'default')
@@ -616,28 +673,30 @@ class RuleEngine:
             
             engine.data_flow.add_node(node)
         
-        # 恢复依赖关系
-        for target, sources in config.get('dependencies', {}).items():
-            for source in sources:
-                if source in engine.data_flow.nodes and target in engine.data_flow.nodes:
-                    engine.data_flow.add_dependency(source, target)
+        # 恢复依赖关系（所有节点已添加，一次性重建依赖索引）
+        engine.data_flow._bulk_set_dependencies(config.get('dependencies', {}))
         
         return engine
     
     def save_to_file(self, file_path: str):
         """保存规则引擎配置到文件"""
-        json_str = self.export_to_json()
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(json_str)
-        self.logger.info(f"Configuration saved to: {file_path}")
+        if orjson is not None:
+            # 直接写入orjson生成的UTF-8字节，省去一次str编码
+            data = orjson.dumps(self._build_export_config(), option=orjson.OPT_NON_STR_KEYS)
+        else:
+            data = self.export_to_json().encode('utf-8')
+        with open(file_path, 'wb') as f:
+            f.write(data)
+        self.logger.info("Configuration saved to: %s", file_path)
     
     @staticmethod
     def load_from_file(file_path: str) -> 'RuleEngine':
         """从文件创建新的规则引擎实例"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            json_str = f.read()
-        engine = RuleEngine.import_from_json(json_str)
-        engine.logger.info(f"Configuration loaded from: {file_path}")
+        # 以字节读取，由JSON解析器直接解码UTF-8，省去文本模式的解码副本
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        engine = RuleEngine.import_from_json(data)
+        engine.logger.info("Configuration loaded from: %s", file_path)
         return engine
     
     def __repr__(self):
@@ -1,12 +1,44 @@
+import base64
+import enum
 import json
+import uuid
 import pandas as pd
 import numpy as np
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as paf
+except ImportError:  # pyarrow 为可选依赖，仅 ArrowEncoder 及其解码需要
+    pa = None
+    paf = None
+
+# 缓存常用函数引用，避免每个标量都做一次属性查找
+_isna = pd.isna
+
+# 常见的具体NumPy标量类型，type(obj) in 集合 比 isinstance 检查抽象基类更快
+_NP_SCALARS = frozenset({
+    np.int8, np.int16, np.int32, np.int64,
+    np.uint8, np.uint16, np.uint32, np.uint64,
+    np.float16, np.float32, np.float64,
+    np.bool_,
+})
+
+
 class UniversalEncoder(json.JSONEncoder):
     """
     一个可以处理 Pandas DataFrame, Timestamp, NaN, 以及 NumPy 类型的通用编码器。
     """
     def default(self, obj):
+        # 快速路径：具体的NumPy标量类型（NaN 与下方 pd.isna 分支一致地转为 None）
+        if type(obj) in _NP_SCALARS:
+            value = obj.item()
+            return None if value != value else value
+
         # 处理 Pandas DataFrame
         if isinstance(obj, pd.DataFrame):
             # 将 DataFrame 转换为字典，并添加类型元数据
@@ -14,55 +46,154 @@ class UniversalEncoder(json.JSONEncoder):
                 "__type__": "DataFrame",
                 "data": obj.to_dict(orient="tight")
             }
-        
+
         # 处理 Pandas Timestamp
         if isinstance(obj, pd.Timestamp):
             return {
                 "__type__": "Timestamp",
                 "value": obj.isoformat()
             }
-        
-        # 处理 NaN 和 NaT
-        if pd.isna(obj):
+
+        # 处理 NaN 和 NaT（先处理常见情况，避免调用较慢的 pd.isna）
+        if obj is None or (isinstance(obj, float) and obj != obj):
             return None
-        
-        # 处理 NumPy 类型，因为它们不被 json 库识别
+        if _isna(obj):
+            return None
+
+        # 处理 NumPy 类型（子类等不在快速路径中的情况）
         if isinstance(obj, (np.integer, np.floating, np.bool_)):
             return obj.item()
 
         # 对于其他类型，使用默认编码器
         return super().default(obj)
 
+
+class ArrowEncoder(UniversalEncoder):
+    """
+    DataFrame 以 Feather(Arrow) 二进制 + base64 编码的编码器，数值型大表体积更小、编解码更快。
+    pyarrow 不可用或 DataFrame 无法转换为 Arrow（如非字符串列名、混合类型列）时回退到 tight 格式。
+    """
+    def default(self, obj):
+        if pa is not None and isinstance(obj, pd.DataFrame):
+            try:
+                sink = pa.BufferOutputStream()
+                paf.write_feather(obj, sink)
+            except (pa.ArrowException, TypeError, ValueError):
+                return super().default(obj)
+            return {
+                "__type__": "DataFrame_arrow",
+                "data": base64.b64encode(sink.getvalue().to_pybytes()).decode("ascii")
+            }
+        return super().default(obj)
+
+
+_universal_default = UniversalEncoder().default
+
+# orjson原生序列化、但标准库 json + UniversalEncoder 会拒绝的类型，不会经过default回调
+_ORJSON_ONLY_TYPES = (uuid.UUID, enum.Enum) + ((orjson.Fragment,) if orjson is not None else ())
+# 探测时无需继续检查的标量类型
+_PLAIN_SCALARS = frozenset({str, int, float, bool, type(None)})
+
+
+def _contains_orjson_only_value(obj) -> bool:
+    """判断对象（含嵌套的dict/list/tuple）中是否有orjson接受而标准库拒绝的值"""
+    stack = [obj]
+    seen = set()
+    while stack:
+        item = stack.pop()
+        item_type = type(item)
+        if item_type is dict:
+            children = item.values()
+        elif item_type is list or item_type is tuple:
+            children = item
+        else:
+            if isinstance(item, _ORJSON_ONLY_TYPES):
+                return True
+            continue
+        # 循环引用只检查一次，交给序列化器报错
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        if set(map(type, children)) <= _PLAIN_SCALARS:
+            continue
+        stack.extend(child for child in children if type(child) not in _PLAIN_SCALARS)
+    return False
+
+
+def _strict_probe_default(obj):
+    """orjson探测用的default：转换结果含orjson独有支持的值时拒绝，交给标准库复核"""
+    result = _universal_default(obj)
+    if _contains_orjson_only_value(result):
+        raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+    return result
+
+
+def dumps_fast(obj) -> str:
+    """
+    序列化为JSON字符串，优先使用orjson。
+
+    NumPy标量由orjson原生处理，DataFrame/Timestamp等交给UniversalEncoder.default；
+    orjson不可用或无法处理时回退到标准库 json + UniversalEncoder。
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj,
+                default=_universal_default,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            ).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, cls=UniversalEncoder)
+
+
+def ensure_json_serializable(obj) -> None:
+    """
+    校验对象能否被 json.dumps + UniversalEncoder 序列化，不能时抛出与其相同的 TypeError/ValueError。
+
+    优先用orjson做快速探测（datetime、dataclass、子类交给UniversalEncoder.default，与标准库行为一致）；
+    UUID、Enum等orjson原生支持而标准库拒绝的值不走探测；orjson拒绝时再用标准库 json 复核，
+    保证错误信息与判定结果不变。
+    """
+    if orjson is not None and not _contains_orjson_only_value(obj):
+        try:
+            orjson.dumps(
+                obj,
+                default=_strict_probe_default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_SUBCLASS,
+            )
+            return
+        except TypeError:
+            pass
+    json.dumps(obj, cls=UniversalEncoder)
+
+
+def _decode_dataframe(data):
+    """根据序列化格式还原DataFrame"""
+    # split 格式
+    if set(data.keys()) == {"index", "columns", "data"}:
+        return pd.DataFrame(data["data"], index=data["index"], columns=data["columns"])
+    # tight 格式
+    elif "index_names" in data or "column_names" in data:
+        return pd.DataFrame.from_dict(data, orient="tight")
+    else:
+        raise ValueError("未知的DataFrame序列化格式")
+
+
 def universal_decoder(dct):
     """
     根据元数据将字典还原为 Pandas DataFrame 或其他对象。
+
+    作为 json.loads 的 object_hook 使用时，嵌套字典会先于外层被回调处理，
+    因此这里只需处理当前字典本身。
     """
-    if "__type__" in dct:
-        data_type = dct["__type__"]
-        if data_type == "DataFrame":
-            data = dct["data"]
-            # split 格式
-            if set(data.keys()) == {"index", "columns", "data"}:
-                return pd.DataFrame(data["data"], index=data["index"], columns=data["columns"])
-            # tight 格式
-            elif "index_names" in data or "column_names" in data:
-                return pd.DataFrame.from_dict(data, orient="tight")
-            else:
-                raise ValueError("未知的DataFrame序列化格式")
-        if data_type == "Timestamp":
-            return pd.Timestamp(dct["value"])
-    # 递归处理嵌套字典
-    for key, value in dct.items():
-        if isinstance(value, dict) and "__type__" in value:
-            data_type = value["__type__"]
-            if data_type == "DataFrame":
-                data = value["data"]
-                if set(data.keys()) == {"index", "columns", "data"}:
-                    dct[key] = pd.DataFrame(data["data"], index=data["index"], columns=data["columns"])
-                elif "index_names" in data or "column_names" in data:
-                    dct[key] = pd.DataFrame.from_dict(data, orient="tight")
-                else:
-                    raise ValueError("未知的DataFrame序列化格式")
-            elif data_type == "Timestamp":
-                dct[key] = pd.Timestamp(value["value"])
-    return dct
\ No newline at end of file
+    data_type = dct.get("__type__")
+    if data_type == "DataFrame":
+        return _decode_dataframe(dct["data"])
+    if data_type == "DataFrame_arrow":
+        if paf is None:
+            raise ValueError("解码Arrow格式的DataFrame需要安装pyarrow")
+        return paf.read_feather(pa.BufferReader(base64.b64decode(dct["data"])))
+    if data_type == "Timestamp":
+        return pd.Timestamp(dct["value"])
+    return dct
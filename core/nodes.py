@@ -4,10 +4,18 @@
 所有输出通过tracked_variables/flow_context维护
 """
 
+import ast
 import io
+import itertools
+import operator
+import sys
+import threading
+import numpy as np
 import pandas as pd
-from contextlib import redirect_stdout
-from typing import Any, Dict, List, Optional, Tuple
+from contextlib import contextmanager
+from functools import lru_cache
+from types import CodeType
+from typing import Any, Dict, List, Optional, Tuple, Union
 from abc import ABC, abstractmethod
 from datetime import datetime
 import json
@@ -16,10 +24,10 @@ import string
 import builtins
 
 # 添加utils目录到路径
-from utils.datetime_parser import parse_datetime
+from utils.datetime_parser import parse_datetime, is_standard_job_datetime
 from type.validator import DataValidator
 
-from core.json_helper import UniversalEncoder
+from core.json_helper import UniversalEncoder, ensure_json_serializable
 
 
 def generate_random_name(length=8):
@@ -31,27 +39,310 @@ def generate_random_name(length=8):
     return random_name
 
 
-def execute_code_safely(code: str, local_vars: Dict[str, Any], text_output: io.StringIO) -> None:
+@lru_cache(maxsize=128)
+def _compile_source(source: str, mode: str = 'exec') -> CodeType:
+    """编译源码并按源码缓存，容量有限，避免动态参数展开后的大量变体无限增长"""
+    return compile(source, '<string>', mode)
+
+
+_COMPARE_OPS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
+_UNARY_OPS = {
+    ast.Not: operator.not_,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+
+def _lookup_name(name: str, local_vars: Dict[str, Any]) -> Any:
+    """按 eval(expr, {}, local_vars) 的规则查找变量：先局部变量，再内置名称"""
+    try:
+        return local_vars[name]
+    except KeyError:
+        pass
+    try:
+        return getattr(builtins, name)
+    except AttributeError:
+        raise NameError(f"name '{name}' is not defined") from None
+
+
+def _build_evaluator(node: ast.AST):
+    """
+    将简单表达式的AST构建为求值闭包，仅支持比较、布尔运算、一元运算、变量、常量、属性与下标访问。
+    遇到不支持的节点（如函数调用）时返回None，由调用方回退到eval。
+    """
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return lambda local_vars: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        return lambda local_vars: _lookup_name(name, local_vars)
+
+    if isinstance(node, ast.Attribute):
+        target = _build_evaluator(node.value)
+        if target is None:
+            return None
+        attr = node.attr
+        return lambda local_vars: getattr(target(local_vars), attr)
+
+    if isinstance(node, ast.Subscript):
+        target = _build_evaluator(node.value)
+        key = _build_evaluator(node.slice)
+        if target is None or key is None:
+            return None
+        return lambda local_vars: target(local_vars)[key(local_vars)]
+
+    if isinstance(node, (ast.Tuple, ast.List)):
+        items = [_build_evaluator(item) for item in node.elts]
+        if any(item is None for item in items):
+            return None
+        container = tuple if isinstance(node, ast.Tuple) else list
+        return lambda local_vars: container(item(local_vars) for item in items)
+
+    if isinstance(node, ast.UnaryOp):
+        op = _UNARY_OPS.get(type(node.op))
+        operand = _build_evaluator(node.operand)
+        if op is None or operand is None:
+            return None
+        return lambda local_vars: op(operand(local_vars))
+
+    if isinstance(node, ast.BoolOp):
+        values = [_build_evaluator(value) for value in node.values]
+        if any(value is None for value in values):
+            return None
+        is_and = isinstance(node.op, ast.And)
+
+        # 与Python语义一致：短路求值并返回最后一个被求值的操作数
+        def eval_bool_op(local_vars):
+            for value in values:
+                result = value(local_vars)
+                if bool(result) is not is_and:
+                    return result
+            return result
+        return eval_bool_op
+
+    if isinstance(node, ast.Compare):
+        ops = [_COMPARE_OPS.get(type(op)) for op in node.ops]
+        left = _build_evaluator(node.left)
+        comparators = [_build_evaluator(comparator) for comparator in node.comparators]
+        if left is None or None in ops or any(comparator is None for comparator in comparators):
+            return None
+        if len(ops) == 1:
+            op, right = ops[0], comparators[0]
+            return lambda local_vars: op(left(local_vars), right(local_vars))
+        pairs = list(zip(ops, comparators))
+
+        # 链式比较：a < b < c 等价于 a < b and b < c，且每个操作数只求值一次
+        def eval_chain(local_vars):
+            current = left(local_vars)
+            for op, comparator in pairs:
+                right = comparator(local_vars)
+                result = op(current, right)
+                if not result:
+                    return result
+                current = right
+            return result
+        return eval_chain
+
+    return None
+
+
+@lru_cache(maxsize=128)
+def _compile_condition(condition: str):
+    """将条件表达式编译为求值闭包，无法解析或包含不支持的语法时返回None"""
+    try:
+        tree = ast.parse(condition, mode='eval')
+    except SyntaxError:
+        return None
+    return _build_evaluator(tree.body)
+
+
+_JSON_SCALARS = frozenset({str, int, float, bool, type(None)})
+_JSON_CONTAINERS = frozenset({dict, list, tuple})
+
+
+# 区分变量不存在与变量值为None
+_MISSING = object()
+
+
+def _is_plain_dataframe(df: pd.DataFrame) -> bool:
+    """判断DataFrame是否一定能被UniversalEncoder序列化：列为数值/布尔/datetime64，行列标签为同类或字符串"""
+    for dtype in df.dtypes:
+        if not (isinstance(dtype, np.dtype) and dtype.kind in 'biufM'):
+            return False
+    for labels in (df.index, df.columns):
+        dtype = labels.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in 'biufM':
+            pass
+        elif dtype == object and all(type(label) is str for label in labels):
+            pass
+        else:
+            return False
+        if any(type(name) not in _JSON_SCALARS for name in labels.names):
+            return False
+    return True
+
+
+def _check_json_serializable(value: Any) -> None:
+    """
+    校验值能否序列化为JSON，不满足时抛出与 json.dumps 相同的 TypeError/ValueError。
+
+    使用显式栈遍历常见的dict/list/tuple与基础类型，无需真正构造JSON字符串；
+    其余类型（Timestamp、NumPy标量等）交给 ensure_json_serializable 单独校验。
+    """
+    stack = [value]
+    seen = set()
+    while stack:
+        item = stack.pop()
+        item_type = type(item)
+        if item_type in _JSON_SCALARS:
+            continue
+        if item_type in _JSON_CONTAINERS:
+            if id(item) in seen:
+                # 同一容器被多次引用（可能是循环引用），对整个值做完整校验
+                ensure_json_serializable(value)
+                return
+            seen.add(id(item))
+            if item_type is dict:
+                for key in item:
+                    if type(key) not in _JSON_SCALARS:
+                        json.dumps({key: None}, cls=UniversalEncoder)
+                stack.extend(item.values())
+            else:
+                stack.extend(item)
+            continue
+        if item_type is pd.DataFrame and _is_plain_dataframe(item):
+            continue
+        ensure_json_serializable(item)
+
+
+class _ThreadLocalStdout(io.TextIOBase):
+    """按线程分发的stdout：设置了捕获目标的线程写入自己的缓冲区，其余线程写入原stdout"""
+    
+    def __init__(self, default):
+        self.default = default
+        self.local = threading.local()
+    
+    def _target(self):
+        return getattr(self.local, 'target', None) or self.default
+    
+    def write(self, s):
+        return self._target().write(s)
+    
+    def flush(self):
+        self._target().flush()
+
+
+_stdout_lock = threading.Lock()
+_stdout_router: Optional[_ThreadLocalStdout] = None
+_stdout_users = 0
+
+
+@contextmanager
+def capture_stdout(text_output: io.StringIO):
+    """
+    捕获当前线程的标准输出，效果等同于 redirect_stdout，
+    但在多个节点并行执行时各线程的输出互不干扰，且结束后能正确恢复 sys.stdout
+    """
+    global _stdout_router, _stdout_users
+    with _stdout_lock:
+        if _stdout_users == 0:
+            _stdout_router = _ThreadLocalStdout(sys.stdout)
+            sys.stdout = _stdout_router
+        _stdout_users += 1
+        router = _stdout_router
+    previous = getattr(router.local, 'target', None)
+    router.local.target = text_output
+    try:
+        yield text_output
+    finally:
+        router.local.target = previous
+        with _stdout_lock:
+            _stdout_users -= 1
+            if _stdout_users == 0:
+                sys.stdout = router.default
+                _stdout_router = None
+
+
+# 不会产生输出的内置函数，只调用这些函数的代码无需捕获stdout
+_SILENT_BUILTINS = frozenset({
+    'abs', 'all', 'any', 'bool', 'dict', 'divmod', 'enumerate', 'filter', 'float',
+    'frozenset', 'int', 'isinstance', 'len', 'list', 'map', 'max', 'min', 'pow',
+    'range', 'reversed', 'round', 'set', 'sorted', 'str', 'sum', 'tuple', 'zip',
+})
+
+
+@lru_cache(maxsize=128)
+def _needs_stdout_capture(source: str) -> bool:
+    """
+    判断代码执行时是否可能产生标准输出。
+
+    只有当代码中读取的名称全部是未被重新定义的静默内置函数、且没有import语句时才返回False；
+    读取其他名称（可能是作为参数传入的print、别名或自定义函数，如 map(print, ...)）、
+    方法调用等任何可能输出的情况都保守地返回True。
+    """
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return True
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            return True
+        if isinstance(node, ast.Call):
+            if not (isinstance(node.func, ast.Name) and node.func.id in _SILENT_BUILTINS):
+                return True
+        elif isinstance(node, ast.Name):
+            # 读取非静默名称，或重新绑定静默内置函数名，都可能导致输出
+            if (node.id not in _SILENT_BUILTINS) == isinstance(node.ctx, ast.Load):
+                return True
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            if node.name in _SILENT_BUILTINS:
+                return True
+        elif isinstance(node, ast.arg) and node.arg in _SILENT_BUILTINS:
+            return True
+    return False
+
+
+def execute_code_safely(code: Union[str, CodeType], local_vars: Dict[str, Any], text_output: io.StringIO, capture: bool = True) -> None:
     """
     安全地执行Python代码，支持动态导入操作
     
     Args:
-        code: 要执行的Python代码字符串
+        code: 要执行的Python代码字符串或预编译的code对象
         local_vars: 本地变量空间
         text_output: 输出捕获对象
+        capture: 是否捕获标准输出，确定不会产生输出的代码可以跳过
     """
     # 创建包含内置模块的全局命名空间，支持动态导入
     # globals_dict = {
     #     '__builtins__': builtins,
     # }
     
-    with redirect_stdout(text_output):
+    if not capture:
+        exec(code, local_vars)
+        return
+    with capture_stdout(text_output):
         exec(code, local_vars)
 
 
 class NodeResult:
     """节点执行结果"""
     
+    # 每次节点执行都会创建，使用__slots__省去实例字典
+    __slots__ = ("success", "data", "text_output", "error", "status", "node_type")
+    
     def __init__(self, success: bool, data: Any = None, text_output: str = None, error: Optional[str] = None, status: str = "executed", node_type: str = None):
         self.success = success
         self.data = data
@@ -67,17 +358,33 @@ class NodeResult:
 class Node(ABC):
     """节点基类"""
     
+    # 节点字段固定，使用__slots__省去实例字典；子类声明各自新增的字段
+    __slots__ = ("name", "inputs", "_node_inputs", "flow_context", "_flow_values", "tracked_variables",
+                 "expected_input_schema", "node_type", "_code_source", "_code", "_validators")
+    
+    # flow_context 版本号：全局单调递增，用于判断变量的先后写入
+    _version_counter = itertools.count()
+    
     def __init__(self, name: str):
         self.name = name
         self.inputs: Dict[str, Any] = {}
-        # 初始化flow_context - 所有输出都通过这里维护
-        self.flow_context: Dict[str, Tuple[Any, str, datetime]] = {}
+        # 上游节点输入（以__node_开头的输入），在添加输入时分拣，合并flow_context时只需遍历这一部分
+        self._node_inputs: Dict[str, Any] = {}
+        # 初始化flow_context - 所有输出都通过这里维护，值为 (变量值, 来源节点, 版本号)
+        self.flow_context: Dict[str, Tuple[Any, str, int]] = {}
+        # flow_context中变量值的视图，与flow_context同步写入，读取时无需从元组中重建
+        self._flow_values: Dict[str, Any] = {}
         # 指定要跟踪的变量名列表（即输出变量）
         self.tracked_variables: List[str] = []
         # 期望的输入schema - 用于校验上游变量
         self.expected_input_schema: Dict[str, str] = {}
         # 节点类型
         self.node_type: str = self._get_node_type()
+        # 编译缓存：源码不变时复用已编译的code对象
+        self._code_source: Optional[str] = None
+        self._code: Optional[CodeType] = None
+        # 校验器缓存：按schema字符串缓存已解析的校验器
+        self._validators: Dict[str, DataValidator] = {}
     
     def _get_node_type(self) -> str:
         """获取节点类型，子类可以重写此方法"""
@@ -98,9 +405,39 @@ class Node(ABC):
         """执行节点逻辑"""
         pass
     
+    def _get_compiled_code(self, source: str, mode: str = 'exec') -> CodeType:
+        """获取源码对应的code对象，源码与上次相同时直接复用，否则查询全局编译缓存"""
+        if self._code is None or self._code_source != source:
+            self._code = _compile_source(source, mode)
+            self._code_source = source
+        return self._code
+    
+    def _precompile(self, source: Optional[str], mode: str = 'exec'):
+        """设置代码时预编译；含动态参数或语法错误的代码留到执行时处理"""
+        if source and '${' not in source:
+            try:
+                self._get_compiled_code(source, mode)
+            except SyntaxError:
+                pass
+    
+    def _get_validator(self, schema_str: str) -> DataValidator:
+        """获取schema字符串对应的校验器，同一schema只解析一次"""
+        validator = self._validators.get(schema_str)
+        if validator is None:
+            validator = DataValidator.from_string(schema_str)
+            self._validators[schema_str] = validator
+        return validator
+    
     def add_input(self, name: str, value: Any):
-        """添加输入数据"""
+        """添加输入数据（全局上下文通过execute的context参数传入，无需放入inputs）"""
         self.inputs[name] = value
+        if name.startswith("__node_"):
+            self._node_inputs[name] = value
+    
+    def replace_inputs(self, inputs: Dict[str, Any]):
+        """整体替换输入数据（引擎每次执行时调用，不保留上一次执行的输入）"""
+        self.inputs = inputs
+        self._node_inputs = {name: value for name, value in inputs.items() if name.startswith("__node_")}
     
     def set_tracked_variables(self, variables: List[str]):
         """设置要跟踪的变量名列表（输出变量）"""
@@ -121,59 +458,63 @@ class Node(ABC):
             self.expected_input_schema[variable] = schema
     
     def update_flow_context(self, variable_name: str, value: Any, source_node: str = None, context: Dict[str, Any] = None):
-        """更新flow_context，如果变量已存在且时间更新，则更新"""
-        current_time = datetime.now()
+        """更新flow_context，如果变量已存在且版本更新，则更新"""
+        current_version = next(Node._version_counter)
         source_node_name = source_node if source_node else self.name
                 
         # 方法1: 严格验证 - 如果无法序列化则抛出异常
         try:
-            # 若非pandas dataframe, 必须校验其是否能序列化;  
-            # pandas dataframe 需要单独处理
-            json.dumps(value, cls=UniversalEncoder)
+            # 结构化校验，不构造JSON字符串；非object列的pandas dataframe直接通过
+            _check_json_serializable(value)
         except (TypeError, ValueError) as e:
             raise ValueError(f"变量 '{variable_name}' 无法序列化为JSON: {value}, 错误: {e}")
         
         if variable_name in self.flow_context:
-            # 如果变量已存在，比较时间戳
-            existing_value, existing_node, existing_time = self.flow_context[variable_name]
-            if current_time > existing_time:
-                self.flow_context[variable_name] = (value, source_node_name, current_time)
+            # 如果变量已存在，比较版本号
+            existing_value, existing_node, existing_version = self.flow_context[variable_name]
+            if current_version > existing_version:
+                self.flow_context[variable_name] = (value, source_node_name, current_version)
+                self._flow_values[variable_name] = value
         else:
             # 如果变量不存在，直接添加
-            self.flow_context[variable_name] = (value, source_node_name, current_time)
+            self.flow_context[variable_name] = (value, source_node_name, current_version)
+            self._flow_values[variable_name] = value
     
     def merge_flow_context_from_inputs(self):
         """从输入中合并flow_context，并进行校验"""
-        for input_name, input_data in self.inputs.items():
-            # 跳过以__node_开头的特殊输入（这些是节点对象）
-            if input_name.startswith("__node_"):
-                # 如果输入是节点对象且有flow_context
-                if hasattr(input_data, 'flow_context') and isinstance(input_data.flow_context, dict):
-                    for var_name, (var_value, var_node, var_time) in input_data.flow_context.items():
-                        # 检查是否有schema限制
-                        if var_name in self.expected_input_schema:
-                            # input节点需要检查，collection节点这一步不需要检查，在collection节点中检查
-                            if isinstance(self, CollectionNode):
-                                continue
-                            schema_str = self.expected_input_schema[var_name]
-                            # 创建校验器并校验
-                            validator = DataValidator.from_string(schema_str)
-                            if not validator.validate(var_value): 
-                                raise ValueError(f"Input variable {var_name} validation failed. Expected: {schema_str}, Got: {type(var_value).__name__}")
-                        # 校验通过或无schema限制，继承变量（取最新的）
-                        self.update_flow_context(var_name, var_value, var_node)
-    
-    def get_flow_context(self) -> Dict[str, Tuple[Any, str, datetime]]:
+        # 没有上游节点输入（如直接挂在start_node下的节点）时无需合并
+        if not self._node_inputs:
+            return
+        # 只处理以__node_开头的上游节点输入，普通输入数据不参与合并
+        for input_data in self._node_inputs.values():
+            # 如果输入是节点对象且有flow_context
+            if hasattr(input_data, 'flow_context') and isinstance(input_data.flow_context, dict):
+                for var_name, (var_value, var_node, var_version) in input_data.flow_context.items():
+                    # 检查是否有schema限制
+                    if var_name in self.expected_input_schema:
+                        # input节点需要检查，collection节点这一步不需要检查，在collection节点中检查
+                        if isinstance(self, CollectionNode):
+                            continue
+                        schema_str = self.expected_input_schema[var_name]
+                        # 获取（缓存的）校验器并校验
+                        validator = self._get_validator(schema_str)
+                        if not validator.validate(var_value): 
+                            raise ValueError(f"Input variable {var_name} validation failed. Expected: {schema_str}, Got: {type(var_value).__name__}")
+                    # 校验通过或无schema限制，继承变量（取最新的）
+                    self.update_flow_context(var_name, var_value, var_node)
+    
+    def get_flow_context(self) -> Dict[str, Tuple[Any, str, int]]:
         """获取flow_context的副本"""
         return self.flow_context.copy()
     
     def get_flow_context_values(self) -> Dict[str, Any]:
-        """获取flow_context中的值（不包含元数据）"""
-        return {var_name: value for var_name, (value, _, _) in self.flow_context.items()}
+        """获取flow_context中的值（不包含元数据）的副本"""
+        return self._flow_values.copy()
     
     def clear_flow_context(self):
         """清空flow_context"""
         self.flow_context.clear()
+        self._flow_values.clear()
     
     def __repr__(self):
         return f"{self.__class__.__name__}(name='{self.name}')"
@@ -182,6 +523,8 @@ class Node(ABC):
 class StartNode(Node):
     """开始节点 - 不做任何事情，逻辑的开始"""
     
+    __slots__ = ()
+    
     def __init__(self, name: str = "start_node"):
         super().__init__(name)
     
@@ -193,17 +536,21 @@ class StartNode(Node):
 class GateNode(Node):
     """门控节点 - 判断数据流是否往下执行"""
     
+    __slots__ = ("condition", "should_continue")
+    
     def __init__(self, name: Optional[str] = None, condition: Optional[str] = None):
         if name is None:
             name = f"gate_{generate_random_name()}"
 
         super().__init__(name)
-        self.condition = "False" if condition is None else condition
+        self.set_condition("False" if condition is None else condition)
         self.should_continue = False
     
     def set_condition(self, condition: str):
-        """设置判断条件，例如: x == 1, y > 10"""
+        """设置判断条件，例如: x == 1, y > 10，简单条件构建AST求值闭包，其余预编译为eval模式的code对象"""
         self.condition = condition
+        if not condition or '${' in condition or _compile_condition(condition) is None:
+            self._precompile(condition, 'eval')
     
     def execute(self, context: Dict[str, Any], job_date: str = None, placeholders: Dict[str, Any] = None) -> NodeResult:
         """执行门控节点"""
@@ -217,12 +564,21 @@ class GateNode(Node):
         text_output = io.StringIO()
         try:
             # 创建本地变量空间，包含输入数据、上下文和flow_context
-            local_vars = {**self.inputs, **context, **self.get_flow_context_values()}
-            with redirect_stdout(text_output):
-                # 解析动态参数
-                parsed_condition = parse_dynamic_parameters(self.condition, job_date, placeholders)
-                # 执行条件判断
-                self.should_continue = eval(parsed_condition, {}, local_vars)
+            local_vars = dict(self.inputs)
+            local_vars.update(context)
+            local_vars.update(self._flow_values)
+            # 解析动态参数（不含动态参数的条件无需解析）
+            parsed_condition = self.condition
+            if '${' in parsed_condition:
+                parsed_condition = parse_dynamic_parameters(parsed_condition, job_date, placeholders)
+            # 简单条件直接按AST求值，不会产生输出，无需捕获stdout
+            evaluator = _compile_condition(parsed_condition)
+            if evaluator is not None:
+                self.should_continue = evaluator(local_vars)
+            else:
+                with capture_stdout(text_output):
+                    # 执行条件判断
+                    self.should_continue = eval(self._get_compiled_code(parsed_condition, 'eval'), {}, local_vars)
             return NodeResult(success=True, data={'should_continue': self.should_continue}, text_output=text_output.getvalue(), node_type=self.node_type)
         except Exception as e:
             error_msg = str(e)
@@ -235,17 +591,20 @@ class GateNode(Node):
 class LogicNode(Node):
     """逻辑节点 - 生产数据"""
     
+    __slots__ = ("logic_code",)
+    
     def __init__(self, name: Optional[str] = None, logic_code: Optional[str] = None):
         if name is None:
             name = f"logic_{generate_random_name()}"
 
         super().__init__(name)
         
-        self.logic_code = logic_code
+        self.set_logic(logic_code)
     
     def set_logic(self, logic_code: str):
-        """设置逻辑代码"""
+        """设置逻辑代码，并预编译为code对象"""
         self.logic_code = logic_code
+        self._precompile(logic_code)
     
     def execute(self, context: Dict[str, Any], job_date: str = None, placeholders: Dict[str, Any] = None) -> NodeResult:
         """执行逻辑节点"""
@@ -259,16 +618,17 @@ class LogicNode(Node):
         text_output = io.StringIO()
         try:
             # 创建本地变量空间，包含输入数据、上下文和flow_context
-            local_vars = {**self.inputs, **context, **self.get_flow_context_values()}
+            # 上下文中的动态参数已由引擎在执行开始时统一解析
+            local_vars = dict(self.inputs)
+            local_vars.update(context)
+            local_vars.update(self._flow_values)
             # 添加pandas导入（但不包含在flow_context中）
             local_vars['pd'] = pd
-            # 解析动态参数
-            parsed_code = parse_dynamic_parameters(self.logic_code, job_date, placeholders)
-            # 将解析后的代码中的动态参数替换到local_vars中
-            for key, value in local_vars.items():
-                if isinstance(value, str) and '${' in value:
-                    local_vars[key] = parse_dynamic_parameters(value, job_date, placeholders)
-            execute_code_safely(parsed_code, local_vars, text_output)
+            # 解析动态参数（不含动态参数的代码无需解析）
+            parsed_code = self.logic_code
+            if '${' in parsed_code:
+                parsed_code = parse_dynamic_parameters(parsed_code, job_date, placeholders)
+            execute_code_safely(self._get_compiled_code(parsed_code), local_vars, text_output, capture=_needs_stdout_capture(parsed_code))
 
             # 更新flow_context - 将输出数据中需要跟踪的变量添加到flow_context
             for var_name in self.tracked_variables:
@@ -289,17 +649,20 @@ class LogicNode(Node):
 class CollectionNode(Node):
     """Collection节点 - 收集多个上游数据"""
     
+    __slots__ = ("logic_code", "collected_data")
+    
     def __init__(self, name: Optional[str] = None, logic_code: Optional[str] = None):
         if name is None:
             name = f"collection_{generate_random_name()}"
 
         super().__init__(name)
-        self.logic_code = logic_code
+        self.set_logic(logic_code)
         self.collected_data = {}
     
     def set_logic(self, logic_code: str):
-        """设置逻辑代码"""
+        """设置逻辑代码，并预编译为code对象"""
         self.logic_code = logic_code
+        self._precompile(logic_code)
     
     def execute(self, context: Dict[str, Any], job_date: str = None, placeholders: Dict[str, Any] = None) -> NodeResult:
         """执行collection节点"""
@@ -309,26 +672,25 @@ class CollectionNode(Node):
             
             # 收集所有上游节点的数据
             collected_items = {}
-            for input_name, input_data in self.inputs.items():
+            for input_name, input_data in self._node_inputs.items():
                 # 跳过上下文数据
                 if input_name in context:
                     continue
                 
                 # 如果input_data是节点对象，获取其flow_context
-                if input_name.startswith("__node_") and hasattr(input_data, 'flow_context') and isinstance(input_data.flow_context, dict):
+                if hasattr(input_data, 'flow_context') and isinstance(input_data.flow_context, dict):
                     node_name = input_data.name
-                    flow_context_values = input_data.get_flow_context_values()
+                    # 只读访问，Node直接使用其变量值视图，无需复制
+                    flow_context_values = input_data._flow_values if isinstance(input_data, Node) else input_data.get_flow_context_values()
                     if flow_context_values:
+                        # schema中的变量全部存在且校验通过，才能往下游走，遇到第一个不满足的变量即跳过该节点
                         schema_values = {}
-                        for var_name in flow_context_values:
-                            if var_name in self.expected_input_schema:
-                                schema_str = self.expected_input_schema[var_name]
-                                validator = DataValidator.from_string(schema_str)
-                                if validator.validate(flow_context_values[var_name]):
-                                    schema_values[var_name] = flow_context_values[var_name]
-                        
-                        # 长度相等，才能往下游走，否则跳过
-                        if len(schema_values) == len(self.expected_input_schema):
+                        for var_name, schema_str in self.expected_input_schema.items():
+                            value = flow_context_values.get(var_name, _MISSING)
+                            if value is _MISSING or not self._get_validator(schema_str).validate(value):
+                                break
+                            schema_values[var_name] = value
+                        else:
                             collected_items[node_name] = schema_values
 
 
@@ -342,10 +704,12 @@ class CollectionNode(Node):
                     local_vars = {**self.inputs, **context}
                     local_vars['collection'] = collected_items  # 添加collection变量
                     
-                    # 解析动态参数
-                    parsed_code = parse_dynamic_parameters(self.logic_code, job_date, placeholders)
+                    # 解析动态参数（不含动态参数的代码无需解析）
+                    parsed_code = self.logic_code
+                    if '${' in parsed_code:
+                        parsed_code = parse_dynamic_parameters(parsed_code, job_date, placeholders)
                     
-                    execute_code_safely(parsed_code, local_vars, text_output)
+                    execute_code_safely(self._get_compiled_code(parsed_code), local_vars, text_output, capture=_needs_stdout_capture(parsed_code))
                     
                     # 更新flow_context - 将输出数据中需要跟踪的变量添加到flow_context
                     for var_name in self.tracked_variables:
@@ -378,7 +742,8 @@ class CollectionNode(Node):
 
 def parse_dynamic_parameters(text: str, job_date: str = None, placeholders: Dict[str, Any] = None) -> str:
     """解析动态参数，支持时间参数和占位符"""
-    if not text:
+    # 时间参数和占位符都以 ${ 开头，不含 ${ 的文本无需解析
+    if not text or '${' not in text:
         return text
     
     result = text
@@ -418,7 +783,14 @@ def parse_job_date(job_date: str) -> datetime:
     Raises:
         ValueError: 如果日期格式不支持
     """
-    # 尝试解析为完整日期时间格式
+    # 快速路径：标准的 'YYYY-MM-DD' / 'YYYY-MM-DD HH:MM:SS' 直接用C实现的fromisoformat解析
+    if is_standard_job_datetime(job_date):
+        try:
+            return datetime.fromisoformat(job_date)
+        except ValueError:
+            pass
+    
+    # 尝试解析为完整日期时间格式（兼容未补零等strptime可接受的写法）
     try:
         return datetime.strptime(job_date, '%Y-%m-%d %H:%M:%S')
     except ValueError:
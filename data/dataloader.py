@@ -1,22 +1,139 @@
 
+import logging
 import pandas as pd
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Tuple, Sequence
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from .redis_connector import RedisConnector
-from utils.datetime_parser import parse_datetime, parse_datetime_to_timestamp
+from utils.datetime_parser import parse_datetime, parse_datetime_to_timestamp, is_standard_job_datetime
+from utils.json_parser import loads_fast
 import re
 import time
 
 
-def parse_job_datetime(job_datetime: str) -> datetime:
+# 占位符与日期表达式正则，模块加载时编译一次
+_DATE_RE = re.compile(r'\$\{(yyyyMMdd|yyyy-MM-dd|yyyyMMddHHmmss|yyyy-MM-dd HH:mm:ss)([+-]\d+[yMwHmd])?\}')
+# 日期表达式与普通占位符合并为一个模式，一次扫描即可区分；日期分支不匹配时回溯为普通占位符
+_TOKEN_RE = re.compile(r'\$\{(?:(?P<date>(?:yyyyMMdd|yyyy-MM-dd|yyyyMMddHHmmss|yyyy-MM-dd HH:mm:ss)(?:[+-]\d+[yMwHmd])?)|(?P<name>[^}]+))\}')
+
+# 批量结果中不存在对应键时的标记，区别于值本身
+_MISSING = object()
+
+# densets数值列的批量转换函数
+_NUMERIC_CONVERTERS = {'int': int, 'double': float}
+# densets数值列整列解析时使用的dtype，由numpy在C层完成字符串到数值的转换
+_NUMERIC_DTYPES = {'int': np.int64, 'double': np.float64}
+# densets布尔列可识别的取值（不区分大小写）
+_BOOLEAN_VALUES = {'true': True, '1': True, 'yes': True, 'on': True,
+                   'false': False, '0': False, 'no': False, 'off': False}
+
+
+def _to_boolean(value: str) -> bool:
+    """按 _BOOLEAN_VALUES 转换布尔值，无法识别时抛出KeyError"""
+    return _BOOLEAN_VALUES[value.lower()]
+
+
+# densets单个值的类型转换函数，按目标类型直接分派
+_VALUE_CONVERTERS = {'string': lambda value: value, **_NUMERIC_CONVERTERS, 'boolean': _to_boolean}
+
+
+@lru_cache(maxsize=1024)
+def _compile_template(template: str):
+    """
+    将占位符模板预解析为 (字面量片段, 占位符名称, 日期表达式原文, 是否含日期表达式)。
+
+    names 与 segments[1:] 一一对应，日期表达式对应的名称为 None，替换时按顺序取 date_tokens 原样保留。
+    """
+    segments = []
+    names = []
+    date_tokens = []
+    has_date = False
+    last_end = 0
+    for match in _TOKEN_RE.finditer(template):
+        segments.append(template[last_end:match.start()])
+        if match.lastgroup == "date":
+            names.append(None)
+            date_tokens.append(match.group(0))
+            has_date = True
+        else:
+            names.append(match.group("name"))
+        last_end = match.end()
+    segments.append(template[last_end:])
+    return tuple(segments), tuple(names), tuple(date_tokens), has_date
+
+
+@lru_cache(maxsize=1024)
+def _format_date_token(token: str, base_datetime: datetime) -> str:
+    """按基准时间格式化单个日期表达式，同一作业时间下的相同表达式只计算一次"""
+    return parse_datetime(token, base_datetime=base_datetime)
+
+
+@lru_cache(maxsize=1024)
+def _datetime_timestamp(expression: str, base_datetime: datetime) -> int:
+    """按基准时间解析日期表达式并转换为时间戳，同一作业时间下的相同表达式只计算一次"""
+    return parse_datetime_to_timestamp(parse_datetime(expression, base_datetime=base_datetime))
+
+
+def _timestamps_strictly_increasing(timestamps: pd.Series) -> bool:
+    """时间戳严格递增（已有序且没有重复）时，keep_latest去重无需排序也不会删除任何记录"""
+    values = timestamps.to_numpy()
+    return bool((values[1:] > values[:-1]).all())
+
+
+@lru_cache(maxsize=1024)
+def _prefix_layout(pairs):
+    """
+    预先计算前缀 (key, value模板) 的拼接顺序。
+
+    键名中的前缀按 "key=value" 字符串的字典序排列；key互不相同时该顺序等价于按 "key=" 排序，
+    与替换后的值无关，可以缓存。存在重复key时返回None，由调用方替换后再排序。
+    """
+    keys = [key for key, _ in pairs]
+    if len(set(keys)) != len(keys):
+        return None
+    return tuple(sorted(pairs, key=lambda pair: pair[0] + "="))
+
+
+@lru_cache(maxsize=64)
+def _parse_schema(schema_str: str) -> Tuple[Tuple[str, str], ...]:
+    """解析densets的schema字符串为 ((列名, 类型), ...)，schema是静态配置，同一字符串只解析和校验一次"""
+    if not schema_str.strip():
+        return ()
+    
+    columns = []
+    for col_def in schema_str.split(','):
+        col_def = col_def.strip()
+        if ':' not in col_def:
+            raise ValueError(f"列定义格式错误: {col_def}，应为 'name:type' 格式")
+        
+        name, col_type = col_def.split(':', 1)
+        name = name.strip()
+        col_type = col_type.strip()
+        
+        if not name:
+            raise ValueError(f"列名不能为空: {col_def}")
+        
+        # 验证类型
+        valid_types = {'string', 'int', 'double', 'boolean'}
+        if col_type not in valid_types:
+            raise ValueError(f"不支持的类型: {col_type}，支持的类型: {valid_types}")
+        
+        columns.append((name, col_type))
+    
+    return tuple(columns)
+
+
+def parse_job_datetime(job_datetime: Union[str, datetime]) -> datetime:
     """
     解析job_datetime，支持两种格式：
     - '%Y-%m-%d' (如: '2024-01-01')
     - '%Y-%m-%d %H:%M:%S' (如: '2024-01-01 10:30:00')
+    已解析的datetime对象直接返回，便于在一次加载中只解析一次。
     
     Args:
-        job_datetime: 日期时间字符串
+        job_datetime: 日期时间字符串或datetime对象
         
     Returns:
         datetime: 解析后的datetime对象
@@ -24,7 +141,22 @@ def parse_job_datetime(job_datetime: str) -> datetime:
     Raises:
         ValueError: 如果日期格式不支持
     """
-    # 尝试解析为完整日期时间格式
+    if isinstance(job_datetime, datetime):
+        return job_datetime
+    return _parse_job_datetime_str(job_datetime)
+
+
+@lru_cache(maxsize=128)
+def _parse_job_datetime_str(job_datetime: str) -> datetime:
+    """解析job_datetime字符串，同一作业时间只解析一次（datetime不可变，可安全共享）"""
+    # 快速路径：标准的 'YYYY-MM-DD' / 'YYYY-MM-DD HH:MM:SS' 直接用C实现的fromisoformat解析
+    if is_standard_job_datetime(job_datetime):
+        try:
+            return datetime.fromisoformat(job_datetime)
+        except ValueError:
+            pass
+    
+    # 尝试解析为完整日期时间格式（兼容未补零等strptime可接受的写法）
     try:
         return datetime.strptime(job_datetime, '%Y-%m-%d %H:%M:%S')
     except ValueError:
@@ -43,14 +175,64 @@ def parse_job_datetime(job_datetime: str) -> datetime:
 class DataLoader:
     """数据加载器：根据data_config从Redis中加载数据"""
     
-    def __init__(self, redis_connector: RedisConnector):
+    def __init__(self, redis_connector: RedisConnector, max_workers: int = 1):
         """
         初始化数据加载器
         
         Args:
             redis_connector: Redis连接器实例
+            max_workers: 并发加载变量的最大线程数，1表示逐个加载
         """
         self.redis_connector = redis_connector
+        self.max_workers = max_workers
+        self.logger = logging.getLogger("DataLoader")
+    
+    def _load_variables(self, variables: List[Dict[str, Any]], load_func, success_message: str, failure_message: str) -> Dict[str, Any]:
+        """
+        逐个或并发加载变量，结果按配置顺序收集，单个变量加载失败或不存在时置为None，
+        加载结果汇总后统一记录日志
+        
+        Args:
+            variables: 变量配置列表
+            load_func: 加载单个变量的函数，参数为变量配置，返回_MISSING表示变量不存在
+            success_message: 加载成功时的日志前缀
+            failure_message: 加载失败时的日志前缀
+            
+        Returns:
+            变量名到数据的映射
+        """
+        def load_safely(variable_config):
+            try:
+                return load_func(variable_config), None
+            except Exception as e:
+                return None, e
+        
+        if self.max_workers > 1 and len(variables) > 1:
+            # Redis请求为I/O密集型，线程等待网络时会释放GIL，多个变量的请求可以同时进行
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(variables))) as executor:
+                outcomes = list(executor.map(load_safely, variables))
+        else:
+            outcomes = [load_safely(variable_config) for variable_config in variables]
+        
+        loaded_data = {}
+        succeeded = []
+        failed = []
+        for variable_config, (value, error) in zip(variables, outcomes):
+            variable_name = variable_config["name"]
+            if error is None and value is _MISSING:
+                error = KeyError(f"变量 '{variable_name}' 在Redis中不存在")
+            if error is None:
+                loaded_data[variable_name] = value
+                succeeded.append(variable_name)
+            else:
+                loaded_data[variable_name] = None
+                failed.append(f"{variable_name}, 错误: {error}")
+        
+        if succeeded and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("%s: %s", success_message, ", ".join(succeeded))
+        if failed and self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error("%s: %s", failure_message, "; ".join(failed))
+        return loaded_data
     
     def load_data(self, data_config: Dict[str, Any], placeholders: Dict[str, Any], job_datetime: str) -> Dict[str, Any]:
         """
@@ -67,29 +249,68 @@ class DataLoader:
         # 验证占位符
         self._validate_placeholders(data_config, placeholders)
         
-        # 验证job_datetime格式
+        # 验证job_datetime格式，解析结果传给后续各变量的加载，避免重复解析
         try:
-            parse_job_datetime(job_datetime)
+            job_datetime = parse_job_datetime(job_datetime)
         except ValueError as e:
             raise ValueError(f"job_datetime格式错误: {e}")
         
-        # 加载所有变量
-        loaded_data = {}
-        for variable_config in data_config.get("variable", []):
-            variable_name = variable_config["name"]
+        # 加载所有变量，多个时间序列/densets变量的范围查询先通过一个pipeline预取
+        namespace = data_config["namespace"]
+        variables = data_config.get("variable", [])
+        prefetched = self._prefetch_ranges(variables, namespace, placeholders, job_datetime)
+        return self._load_variables(
+            variables,
+            lambda variable_config: self._load_variable(variable_config, namespace, placeholders, job_datetime,
+                                                        prefetched.get(id(variable_config))),
+            "成功加载变量",
+            "加载变量失败"
+        )
+    
+    def _prefetch_ranges(self, variables: List[Dict[str, Any]], namespace: str, placeholders: Dict[str, Any], job_datetime: str) -> Dict[int, List[Dict]]:
+        """
+        通过一个pipeline批量预取所有时间序列和densets变量的数据，减少网络往返
+        
+        连接器不支持批量查询、此类变量不足两个或批量查询失败时返回空字典，
+        此时各变量仍按原方式逐个查询；单个变量的查询参数解析失败时跳过该变量，
+        由逐个查询时报告错误。
+        
+        Args:
+            variables: 变量配置列表
+            namespace: 全局命名空间
+            placeholders: 占位符值映射
+            job_datetime: 作业日期时间
+            
+        Returns:
+            变量配置的id到时间序列/densets数据的映射
+        """
+        get_batch = getattr(self.redis_connector, "pipeline_range_queries", None)
+        if get_batch is None:
+            return {}
+        
+        config_ids = []
+        queries = []
+        for variable_config in variables:
+            redis_config = variable_config.get("redis_config") or {}
+            redis_type = redis_config.get("type")
+            if redis_type not in ("timeseries", "densets"):
+                continue
+            effective_namespace = variable_config.get("namespace") or namespace
             try:
-                loaded_data[variable_name] = self._load_variable(
-                    variable_config, 
-                    data_config["namespace"], 
-                    placeholders,
-                    job_datetime
-                )
-                print(f"✅ 成功加载变量: {variable_name}")
-            except Exception as e:
-                print(f"❌ 加载变量失败: {variable_name}, 错误: {e}")
-                loaded_data[variable_name] = None
+                query = self._range_query(redis_config, effective_namespace, redis_type, placeholders, job_datetime)
+            except Exception:
+                continue
+            config_ids.append(id(variable_config))
+            queries.append((redis_type, effective_namespace) + query)
         
-        return loaded_data
+        if len(queries) < 2:
+            return {}
+        
+        try:
+            results = get_batch(queries)
+        except Exception:
+            return {}
+        return dict(zip(config_ids, results))
     
     def load_data_batch(self, data_config: Dict[str, Any], placeholders: Dict[str, Any], job_datetime: str) -> Dict[str, Any]:
         """
@@ -106,36 +327,30 @@ class DataLoader:
         # 验证占位符
         self._validate_placeholders(data_config, placeholders)
         
-        # 验证job_datetime格式
+        # 验证job_datetime格式，解析结果传给后续各变量的加载，避免重复解析
         try:
-            parse_job_datetime(job_datetime)
+            job_datetime = parse_job_datetime(job_datetime)
         except ValueError as e:
             raise ValueError(f"job_datetime格式错误: {e}")
         
         # 收集所有需要批量获取的键
-        batch_keys = self._collect_batch_keys(data_config, placeholders, job_datetime)
-        
-        # 批量获取数据
-        batch_results = self._batch_get_data(batch_keys)
-        
-        # 处理结果并构建返回数据
-        loaded_data = {}
-        for variable_config in data_config.get("variable", []):
-            variable_name = variable_config["name"]
-            try:
-                loaded_data[variable_name] = self._process_batch_result(
-                    variable_config,
-                    data_config["namespace"],
-                    batch_results,
-                    placeholders,
-                    job_datetime
-                )
-                print(f"✅ 成功批量加载变量: {variable_name}")
-            except Exception as e:
-                print(f"❌ 批量加载变量失败: {variable_name}, 错误: {e}")
-                loaded_data[variable_name] = None
-        
-        return loaded_data
+        redis_keys, variable_keys = self._collect_batch_keys(data_config, placeholders, job_datetime)
+        
+        # 批量获取数据：value/json通过一次MGET获取，时间序列和densets的范围查询通过一个pipeline预取
+        batch_results = self._batch_get_data(redis_keys)
+        namespace = data_config["namespace"]
+        variables = data_config.get("variable", [])
+        prefetched = self._prefetch_ranges(variables, namespace, placeholders, job_datetime)
+        
+        # 处理结果并构建返回数据（未能预取的时间序列和densets在这一步单独查询，可并发进行）
+        return self._load_variables(
+            variables,
+            lambda variable_config: self._process_batch_result(variable_config, namespace, batch_results, placeholders, job_datetime,
+                                                               variable_keys.get(id(variable_config)),
+                                                               prefetched.get(id(variable_config))),
+            "成功批量加载变量",
+            "批量加载变量失败"
+        )
     
     def _validate_placeholders(self, data_config: Dict[str, Any], placeholders: Dict[str, Any]):
         """验证占位符是否完整"""
@@ -146,7 +361,8 @@ class DataLoader:
         if missing:
             raise ValueError(f"缺少必需的占位符: {missing}")
     
-    def _load_variable(self, variable_config: Dict[str, Any], namespace: str, placeholders: Dict[str, Any], job_datetime: str) -> Any:
+    def _load_variable(self, variable_config: Dict[str, Any], namespace: str, placeholders: Dict[str, Any], job_datetime: str,
+                       range_data: Optional[List[Dict]] = None) -> Any:
         """
         加载单个变量
         
@@ -155,6 +371,7 @@ class DataLoader:
             namespace: 命名空间
             placeholders: 占位符值映射
             job_datetime: 作业日期时间，支持格式：'YYYY-MM-DD' 或 'YYYY-MM-DD HH:MM:SS'
+            range_data: 已预取的时间序列/densets数据，为None时从Redis查询
             
         Returns:
             加载的变量数据
@@ -168,9 +385,9 @@ class DataLoader:
         if redis_type in ["value", "json"]:
             return self._load_simple_variable(redis_config, effective_namespace, placeholders, job_datetime)
         elif redis_type == "timeseries":
-            return self._load_timeseries(variable_config, effective_namespace, placeholders, job_datetime)
+            return self._load_timeseries(variable_config, effective_namespace, placeholders, job_datetime, range_data)
         elif redis_type == "densets":
-            return self._load_densets(variable_config, effective_namespace, placeholders, job_datetime)
+            return self._load_densets(variable_config, effective_namespace, placeholders, job_datetime, range_data)
         else:
             raise ValueError(f"不支持的Redis类型: {redis_type}")
     
@@ -189,56 +406,51 @@ class DataLoader:
         Returns:
             Redis键名
         """
-        # 替换占位符
-        prefix_parts = []
-        for prefix in prefixes:
-            key = prefix["key"]
-            value_template = prefix["value"]
-            # 替换占位符 ${placeholder_name} 和日期时间模式
-            value = self._replace_placeholders(value_template, placeholders, job_datetime)
-            prefix_parts.append(f"{key}={value}")
-        
-        ##  按字典序排序前缀
-        prefix_parts.sort()
+        if not prefixes:
+            return f"{namespace}::{redis_type}::{field}"
         
-        # 构建完整的键名
-        if prefix_parts:
-            redis_key = f"{namespace}::{redis_type}::{'::'.join(prefix_parts)}::{field}"
+        # 前缀顺序只取决于key，按配置预先排好序，替换占位符 ${placeholder_name} 和日期时间模式后直接拼接
+        layout = _prefix_layout(tuple((prefix["key"], prefix["value"]) for prefix in prefixes))
+        if layout is not None:
+            prefix_parts = [f"{key}={self._replace_placeholders(value_template, placeholders, job_datetime)}" for key, value_template in layout]
         else:
-            redis_key = f"{namespace}::{redis_type}::{field}"
+            # 存在重复key时顺序还取决于替换后的值，按字典序排序前缀
+            prefix_parts = sorted(f"{prefix['key']}={self._replace_placeholders(prefix['value'], placeholders, job_datetime)}" for prefix in prefixes)
         
-        return redis_key
+        # 构建完整的键名
+        return f"{namespace}::{redis_type}::{'::'.join(prefix_parts)}::{field}"
     
     def _replace_placeholders(self, template: str, placeholders: Dict[str, Any], job_datetime: str = None) -> str:
         """先用placeholders替换占位符，再判断是否有日期表达式并进行日期替换"""
-        if not template:
+        # 不含 ${ 的模板（如固定前缀值）无需解析
+        if not template or '${' not in template:
             return template
-        # 1. 先识别日期表达式，避免被当作占位符处理
-        date_pattern = r'\$\{(yyyyMMdd|yyyy-MM-dd|yyyyMMddHHmmss|yyyy-MM-dd HH:mm:ss)([+-]\d+[yMwHmd])?\}'
-        
-        # 2. 替换非日期表达式的占位符
-        def replace_func(match):
-            placeholder_name = match.group(1)
-            # 检查是否是日期表达式
-            if re.match(date_pattern, match.group(0)):
-                return match.group(0)  # 保留日期表达式，稍后处理
-            # 处理普通占位符
-            if placeholder_name in placeholders:
-                return str(placeholders[placeholder_name])
+        segments, names, date_tokens, has_date = _compile_template(template)
+        
+        # job_datetime如果是字符串，转为datetime
+        base_dt = parse_job_datetime(job_datetime) if has_date and job_datetime else None
+        
+        # 一次遍历完成替换：普通占位符取placeholders中的值，日期表达式直接格式化
+        parts = [segments[0]]
+        date_iter = iter(date_tokens)
+        nested = False
+        for name, segment in zip(names, segments[1:]):
+            if name is None:
+                token = next(date_iter)
+                # 未指定作业时间时以当前时间为基准，不能缓存
+                parts.append(_format_date_token(token, base_dt) if base_dt else parse_datetime(token))
+            elif name in placeholders:
+                value = str(placeholders[name])
+                nested = nested or '${' in value
+                parts.append(value)
             else:
-                raise ValueError(f"占位符 '{placeholder_name}' 未找到")
-        
-        result = re.sub(r'\$\{([^}]+)\}', replace_func, template)
-        
-        # 3. 处理日期表达式
-        if re.search(date_pattern, result):
-            # job_datetime如果是字符串，转为datetime
-            base_dt = None
-            if job_datetime:
-                if isinstance(job_datetime, str):
-                    base_dt = parse_job_datetime(job_datetime)
-                else:
-                    base_dt = job_datetime
+                raise ValueError(f"占位符 '{name}' 未找到")
+            parts.append(segment)
+        result = "".join(parts)
+        
+        # 占位符的值中也可能包含日期表达式，此时对替换结果整体再做一次日期替换
+        if nested and (has_date or _DATE_RE.search(result)):
+            base_dt = parse_job_datetime(job_datetime) if job_datetime else None
             result = parse_datetime(result, base_datetime=base_dt)
         return result
     
@@ -275,7 +487,8 @@ class DataLoader:
             return full_key[len(prefix):]
         return full_key
     
-    def _load_timeseries(self, variable_config: Dict[str, Any], namespace: str, placeholders: Dict[str, Any], job_datetime: str) -> pd.DataFrame:
+    def _load_timeseries(self, variable_config: Dict[str, Any], namespace: str, placeholders: Dict[str, Any], job_datetime: str,
+                         timeseries_data: Optional[List[Dict]] = None) -> pd.DataFrame:
         """
         加载时间序列数据
         
@@ -284,6 +497,7 @@ class DataLoader:
             namespace: 命名空间
             placeholders: 占位符值映射
             job_datetime: 作业日期时间，支持格式：'YYYY-MM-DD' 或 'YYYY-MM-DD HH:MM:SS'
+            timeseries_data: 已预取的时间序列数据，为None时从Redis查询
             
         Returns:
             DataFrame格式的时间序列数据
@@ -294,7 +508,8 @@ class DataLoader:
         drop_duplicate = redis_config.get("drop_duplicate", "none")
         
         # 获取时间序列数据
-        timeseries_data = self._get_timeseries_data(redis_config, namespace, placeholders, job_datetime)
+        if timeseries_data is None:
+            timeseries_data = self._get_timeseries_data(redis_config, namespace, placeholders, job_datetime)
         
         if not timeseries_data:
             # 返回空DataFrame
@@ -318,6 +533,28 @@ class DataLoader:
         Returns:
             时间序列数据列表
         """
+        series_key, from_timestamp, to_timestamp = self._range_query(redis_config, namespace, "timeseries", placeholders, job_datetime)
+        return self.redis_connector.get_timeseries_range(
+            namespace, 
+            series_key, 
+            start_time=from_timestamp, 
+            end_time=to_timestamp
+        )
+    
+    def _range_query(self, redis_config: Dict[str, Any], namespace: str, redis_type: str, placeholders: Dict[str, Any], job_datetime: str) -> Tuple[str, Optional[float], Optional[float]]:
+        """
+        解析时间序列/densets的范围查询参数
+        
+        Args:
+            redis_config: Redis配置
+            namespace: 命名空间
+            redis_type: Redis类型 (timeseries, densets)
+            placeholders: 占位符值映射
+            job_datetime: 作业日期时间，支持格式：'YYYY-MM-DD' 或 'YYYY-MM-DD HH:MM:SS'
+            
+        Returns:
+            (序列键, 起始时间戳, 结束时间戳)，时间戳为None表示不限制
+        """
         field = redis_config["field"]
         prefixes = redis_config.get("prefix", [])
         from_datetime = redis_config.get("from_datetime")
@@ -329,21 +566,14 @@ class DataLoader:
         to_timestamp = None
         
         if from_datetime:
-            from_datetime_str = parse_datetime(from_datetime, base_datetime=job_dt)
-            from_timestamp = parse_datetime_to_timestamp(from_datetime_str)
+            from_timestamp = _datetime_timestamp(from_datetime, job_dt)
         if to_datetime:
-            to_datetime_str = parse_datetime(to_datetime, base_datetime=job_dt)
-            to_timestamp = parse_datetime_to_timestamp(to_datetime_str)
+            to_timestamp = _datetime_timestamp(to_datetime, job_dt)
         
-        redis_key = self._build_redis_key(namespace, "timeseries", prefixes, field, placeholders, job_datetime)
-        series_key = self._extract_key_suffix(redis_key, namespace, "timeseries")
+        redis_key = self._build_redis_key(namespace, redis_type, prefixes, field, placeholders, job_datetime)
+        series_key = self._extract_key_suffix(redis_key, namespace, redis_type)
         
-        return self.redis_connector.get_timeseries_range(
-            namespace, 
-            series_key, 
-            start_time=from_timestamp, 
-            end_time=to_timestamp
-        )
+        return series_key, from_timestamp, to_timestamp
     
     def _convert_timeseries_to_dataframe(self, timeseries_data: List[Dict], drop_duplicate: str = "none") -> pd.DataFrame:
         """
@@ -359,46 +589,44 @@ class DataLoader:
         if not timeseries_data:
             return pd.DataFrame()
         
-        # 展开数据
-        rows = []
-        for item in timeseries_data:
-            timestamp = item["timestamp"]
-            value_data = item["value"]
-            
-            # 添加所有字段
-            row = {}
-            for key, value in value_data.items():
-                row[key] = value
-            row["__timestamp__"] = timestamp
-            rows.append(row)
-        
-        # 创建DataFrame
-        df = pd.DataFrame(rows)
-        
-        if len(df) == 0:
-            return df
+        # 按列构建DataFrame，时间戳单独生成一列
+        n = len(timeseries_data)
+        values = [item["value"] for item in timeseries_data]
+        first_keys = values[0].keys() if isinstance(values[0], dict) else None
+        if first_keys is not None and all(isinstance(value, dict) and value.keys() == first_keys for value in values):
+            # 各数据点字段一致（ETL产出的常见情况）：逐列收集后一次性构建，避免逐行展开字典
+            df = pd.DataFrame({key: [value[key] for value in values] for key in first_keys}, index=pd.RangeIndex(n))
+        else:
+            df = pd.DataFrame.from_records(values, index=pd.RangeIndex(n))
+        df["__timestamp__"] = np.fromiter((item["timestamp"] for item in timeseries_data), dtype=np.float64, count=n)
         
         # 根据去重策略处理数据
         if drop_duplicate == "none":
-            # 不做任何处理，容忍同一个score有多个值
-            df = df.sort_values('__timestamp__').reset_index(drop=True)
+            # 不做任何处理，容忍同一个score有多个值；ZRANGEBYSCORE 返回的数据已按时间戳有序，无需再排序
+            if not df['__timestamp__'].is_monotonic_increasing:
+                df = df.sort_values('__timestamp__', kind='mergesort').reset_index(drop=True)
             df = df.drop(columns=['__timestamp__'])
         elif drop_duplicate == "keep_latest":
             # 根据etl_time字段，筛选出最新的字段
             if 'etl_time' not in df.columns:
                 raise ValueError("使用keep_latest策略时，数据中必须包含etl_time字段")
             
-            # 按etl_time排序，保留最新的记录
-            df = df.sort_values('etl_time', ascending=False)
-            df = df.drop_duplicates(subset=['__timestamp__'], keep='first')
-            df = df.sort_values('__timestamp__').reset_index(drop=True)
-            df = df.drop(columns=['__timestamp__'])
+            if _timestamps_strictly_increasing(df['__timestamp__']):
+                # 每个时间戳只有一条记录（常见情况），线性检查即可确认无需排序去重
+                df = df.drop(columns=['__timestamp__'])
+            else:
+                # 按(时间戳, etl_time)一次稳定排序，每个时间戳保留etl_time最新的记录；缺少etl_time的记录排在最前，不会被保留
+                df = (df.sort_values(['__timestamp__', 'etl_time'], kind='mergesort', na_position='first')
+                        .drop_duplicates(subset=['__timestamp__'], keep='last')
+                        .reset_index(drop=True)
+                        .drop(columns=['__timestamp__']))
         else:
             raise ValueError(f"不支持的去重策略: {drop_duplicate}")
         
         return df
 
-    def _load_densets(self, variable_config: Dict[str, Any], namespace: str, placeholders: Dict[str, Any], job_datetime: str) -> pd.DataFrame:
+    def _load_densets(self, variable_config: Dict[str, Any], namespace: str, placeholders: Dict[str, Any], job_datetime: str,
+                      densets_data: Optional[List[Dict]] = None) -> pd.DataFrame:
         """
         加载densets数据
         
@@ -407,6 +635,7 @@ class DataLoader:
             namespace: 命名空间
             placeholders: 占位符值映射
             job_datetime: 作业日期时间，支持格式：'YYYY-MM-DD' 或 'YYYY-MM-DD HH:MM:SS'
+            densets_data: 已预取的densets数据，为None时从Redis查询
             
         Returns:
             DataFrame格式的densets数据
@@ -423,7 +652,8 @@ class DataLoader:
         schema_str = redis_config.get("schema")
         
         # 获取densets数据
-        densets_data = self._get_densets_data(redis_config, namespace, placeholders, job_datetime)
+        if densets_data is None:
+            densets_data = self._get_densets_data(redis_config, namespace, placeholders, job_datetime)
         
         if not densets_data:
             # 返回空DataFrame
@@ -447,26 +677,7 @@ class DataLoader:
         Returns:
             densets数据列表
         """
-        field = redis_config["field"]
-        prefixes = redis_config.get("prefix", [])
-        from_datetime = redis_config.get("from_datetime")
-        to_datetime = redis_config.get("to_datetime")
-        
-        # 解析job_datetime为datetime对象
-        job_dt = parse_job_datetime(job_datetime)
-        from_timestamp = None
-        to_timestamp = None
-        
-        if from_datetime:
-            from_datetime_str = parse_datetime(from_datetime, base_datetime=job_dt)
-            from_timestamp = parse_datetime_to_timestamp(from_datetime_str)
-        if to_datetime:
-            to_datetime_str = parse_datetime(to_datetime, base_datetime=job_dt)
-            to_timestamp = parse_datetime_to_timestamp(to_datetime_str)
-        
-        redis_key = self._build_redis_key(namespace, "densets", prefixes, field, placeholders, job_datetime)
-        series_key = self._extract_key_suffix(redis_key, namespace, "densets")
-        
+        series_key, from_timestamp, to_timestamp = self._range_query(redis_config, namespace, "densets", placeholders, job_datetime)
         return self.redis_connector.get_densets_range(
             namespace, 
             series_key, 
@@ -491,72 +702,59 @@ class DataLoader:
             return pd.DataFrame()
         
         # 解析schema字符串
-        schema_columns = []
+        schema_columns = ()
         if schema_str:
             schema_columns = self._parse_schema_string(schema_str)
         
-        # 展开数据
-        rows = []
-        for item in densets_data:
-            timestamp = item["timestamp"]
-            value_str = item["value"]
-            
-            # 按分隔符分割字符串
-            values = value_str.split(split_char)
-            
-            # 验证值的数量
-            if schema_columns and len(values) < len(schema_columns):
-                raise ValueError(f"数据值数量不足: 期望至少 {len(schema_columns)} 个值，实际只有 {len(values)} 个值。数据: {value_str}")
-            
-            # 创建行数据
-            if schema_columns:
-                # 如果有schema，创建有意义的列并进行类型验证
-                row = {"__timestamp__": timestamp}
-                for i, (col_name, col_type) in enumerate(schema_columns):
-                    if i < len(values):
-                        # 类型转换和验证
-                        converted_value = self._convert_value_type(values[i], col_type)
-                        row[col_name] = converted_value
-                rows.append(row)
-            else:
-                # 否则保持原始格式
-                row = {
-                    "__timestamp__": timestamp,
-                    "__values__": values
-                }
-                rows.append(row)
+        # 按分隔符分割字符串；有schema时最多切出 len(schema)+1 段，多余的值留在最后一段中整体忽略
+        n = len(densets_data)
+        maxsplit = len(schema_columns) if schema_columns else -1
+        split_rows = [item["value"].split(split_char, maxsplit) for item in densets_data]
+        data = {"__timestamp__": np.fromiter((item["timestamp"] for item in densets_data), dtype=np.float64, count=n)}
+        
+        if schema_columns:
+            # 验证值的数量，只在存在不足的行时再逐行定位
+            if min(map(len, split_rows)) < len(schema_columns):
+                for item, values in zip(densets_data, split_rows):
+                    if len(values) < len(schema_columns):
+                        raise ValueError(f"数据值数量不足: 期望至少 {len(schema_columns)} 个值，实际只有 {len(values)} 个值。数据: {item['value']}")
+            # 如果有schema，按列转置后逐列做类型转换和验证，多出的值忽略
+            for (col_name, col_type), column in zip(schema_columns, zip(*split_rows)):
+                data[col_name] = self._convert_column_type(column, col_type)
+        else:
+            # 否则保持原始格式
+            data["__values__"] = split_rows
         
         # 创建DataFrame
-        df = pd.DataFrame(rows)
-        
-        if len(df) == 0:
-            return df
+        df = pd.DataFrame(data, index=pd.RangeIndex(n))
         
         # 根据去重策略处理数据
         if drop_duplicate == "none":
-            # 不做任何处理，容忍同一个score有多个值
-            df = df.sort_values('__timestamp__').reset_index(drop=True)
+            # 不做任何处理，容忍同一个score有多个值；ZRANGEBYSCORE 返回的数据已按时间戳有序，无需再排序
+            if not df['__timestamp__'].is_monotonic_increasing:
+                df = df.sort_values('__timestamp__', kind='mergesort').reset_index(drop=True)
             df = df.drop(columns=['__timestamp__'])
         elif drop_duplicate == "keep_latest":
-            # 对于 densets，如果有 etl_time 字段，按 etl_time 排序；否则按时间戳排序
-            if 'etl_time' in df.columns:
-                # 按 etl_time 排序，保留最新的记录
-                df = df.sort_values('etl_time', ascending=False)
-                df = df.drop_duplicates(subset=['__timestamp__'], keep='first')
-                df = df.sort_values('__timestamp__').reset_index(drop=True)
+            if _timestamps_strictly_increasing(df['__timestamp__']):
+                # 每个时间戳只有一条记录（常见情况），线性检查即可确认无需排序去重
                 df = df.drop(columns=['__timestamp__'])
             else:
-                # 没有 etl_time 字段，按时间戳排序（Redis 中后添加的数据会覆盖先添加的）
-                df = df.sort_values('__timestamp__', ascending=False)
-                df = df.drop_duplicates(subset=['__timestamp__'], keep='first')
-                df = df.sort_values('__timestamp__').reset_index(drop=True)
-                df = df.drop(columns=['__timestamp__'])
+                # 对于 densets，如果有 etl_time 字段，按 etl_time 排序；否则按时间戳排序
+                if 'etl_time' in df.columns:
+                    # 按(时间戳, etl_time)一次稳定排序，保留最新的记录；缺少etl_time的记录排在最前，不会被保留
+                    df = df.sort_values(['__timestamp__', 'etl_time'], kind='mergesort', na_position='first')
+                elif not df['__timestamp__'].is_monotonic_increasing:
+                    # 没有 etl_time 字段，按时间戳稳定排序（同一时间戳保留最后一条）
+                    df = df.sort_values('__timestamp__', kind='mergesort')
+                df = (df.drop_duplicates(subset=['__timestamp__'], keep='last')
+                        .reset_index(drop=True)
+                        .drop(columns=['__timestamp__']))
         else:
             raise ValueError(f"不支持的去重策略: {drop_duplicate}")
         
         return df
     
-    def _parse_schema_string(self, schema_str: str) -> List[tuple]:
+    def _parse_schema_string(self, schema_str: str) -> Tuple[Tuple[str, str], ...]:
         """
         解析schema字符串
         
@@ -564,32 +762,33 @@ class DataLoader:
             schema_str: schema字符串，如 "job_date:string,fcst_date:string,fcst_qty:double,etl_time:string"
             
         Returns:
-            列名和类型的元组列表
+            列名和类型的元组（相同schema返回同一个缓存对象）
         """
-        if not schema_str.strip():
-            return []
+        return _parse_schema(schema_str)
+    
+    def _convert_column_type(self, column: Sequence[str], target_type: str) -> Union[list, np.ndarray]:
+        """
+        将一列字符串值转换为指定类型，整列批量转换，失败时逐个转换以给出具体的错误值
         
-        columns = []
-        for col_def in schema_str.split(','):
-            col_def = col_def.strip()
-            if ':' not in col_def:
-                raise ValueError(f"列定义格式错误: {col_def}，应为 'name:type' 格式")
-            
-            name, col_type = col_def.split(':', 1)
-            name = name.strip()
-            col_type = col_type.strip()
-            
-            if not name:
-                raise ValueError(f"列名不能为空: {col_def}")
-            
-            # 验证类型
-            valid_types = {'string', 'int', 'double', 'boolean'}
-            if col_type not in valid_types:
-                raise ValueError(f"不支持的类型: {col_type}，支持的类型: {valid_types}")
+        Args:
+            column: 字符串值序列
+            target_type: 目标类型
             
-            columns.append((name, col_type))
-        
-        return columns
+        Returns:
+            转换后的列，数值列为numpy数组，其余为列表
+        """
+        if target_type == 'string':
+            return list(column)
+        try:
+            if target_type == 'boolean':
+                return [_BOOLEAN_VALUES[value.lower()] for value in column]
+            dtype = _NUMERIC_DTYPES.get(target_type)
+            if dtype is not None:
+                return np.array(column, dtype=dtype)
+        except (KeyError, ValueError, OverflowError):
+            # 超出int64范围的整数也回退到逐个转换，保持Python int
+            pass
+        return [self._convert_value_type(value, target_type) for value in column]
     
     def _convert_value_type(self, value: str, target_type: str) -> Any:
         """
@@ -602,40 +801,24 @@ class DataLoader:
         Returns:
             转换后的值
         """
-        if target_type == 'string':
-            return value
-        elif target_type == 'int':
-            try:
-                return int(value)
-            except ValueError:
-                raise ValueError(f"无法将值 '{value}' 转换为 int 类型")
-        elif target_type == 'double':
-            try:
-                return float(value)
-            except ValueError:
-                raise ValueError(f"无法将值 '{value}' 转换为 double 类型")
-        elif target_type == 'boolean':
-            value_lower = value.lower()
-            if value_lower in {'true', '1', 'yes', 'on'}:
-                return True
-            elif value_lower in {'false', '0', 'no', 'off'}:
-                return False
-            else:
-                raise ValueError(f"无法将值 '{value}' 转换为 boolean 类型")
-        else:
+        converter = _VALUE_CONVERTERS.get(target_type)
+        if converter is None:
             raise ValueError(f"不支持的类型: {target_type}")
+        try:
+            return converter(value)
+        except (KeyError, ValueError):
+            raise ValueError(f"无法将值 '{value}' 转换为 {target_type} 类型")
 
-    def _collect_batch_keys(self, data_config: Dict[str, Any], placeholders: Dict[str, Any], job_datetime: str) -> Dict[str, Dict[str, Any]]:
+    def _collect_batch_keys(self, data_config: Dict[str, Any], placeholders: Dict[str, Any], job_datetime: str) -> Tuple[List[str], Dict[int, str]]:
         """
         收集所有需要批量获取的键
         
         Returns:
-            键名到配置的映射
+            (去重后按变量顺序排列的键名列表, 变量配置的id到键名的映射)，后者供处理结果时直接取用，无需重新构建键名
         """
-        batch_keys = {}
+        variable_keys = {}
         
         for variable_config in data_config.get("variable", []):
-            variable_name = variable_config["name"]
             redis_config = variable_config["redis_config"]
             redis_type = redis_config["type"]
             
@@ -645,79 +828,29 @@ class DataLoader:
                 field = redis_config["field"]
                 prefixes = redis_config.get("prefix", [])
                 
-                redis_key = self._build_redis_key(effective_namespace, redis_type, prefixes, field, placeholders, job_datetime)
-                key_suffix = self._extract_key_suffix(redis_key, effective_namespace, redis_type)
-                
-                batch_keys[redis_key] = {
-                    "variable_name": variable_name,
-                    "redis_type": redis_type,
-                    "namespace": effective_namespace,
-                    "key_suffix": key_suffix,
-                    "variable_config": variable_config
-                }
-        
-        return batch_keys
+                variable_keys[id(variable_config)] = self._build_redis_key(effective_namespace, redis_type, prefixes, field, placeholders, job_datetime)
+        
+        return list(dict.fromkeys(variable_keys.values())), variable_keys
     
-    def _batch_get_data(self, batch_keys: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    def _batch_get_data(self, redis_keys: List[str]) -> Dict[str, Any]:
         """
         批量获取数据
         
         Args:
-            batch_keys: 键名到配置的映射
+            redis_keys: value和json变量的完整键名列表
             
         Returns:
             键名到数据的映射
         """
-        if not batch_keys:
+        if not redis_keys:
             return {}
         
-        # 按类型分组
-        value_keys = []
-        json_keys = []
-        
-        for redis_key, config in batch_keys.items():
-            if config["redis_type"] == "value":
-                value_keys.append((redis_key, config))
-            elif config["redis_type"] == "json":
-                json_keys.append((redis_key, config))
-        
-        batch_results = {}
-        
-        # 批量获取value类型数据
-        if value_keys:
-            value_namespaces = {}
-            for redis_key, config in value_keys:
-                namespace = config["namespace"]
-                if namespace not in value_namespaces:
-                    value_namespaces[namespace] = []
-                value_namespaces[namespace].append((redis_key, config))
-            
-            for namespace, keys_configs in value_namespaces.items():
-                key_suffixes = [config["key_suffix"] for _, config in keys_configs]
-                results = self.redis_connector.redis_client.mget([f"{namespace}::value::{suffix}" for suffix in key_suffixes])
-                
-                for i, (redis_key, config) in enumerate(keys_configs):
-                    batch_results[redis_key] = results[i]
-        
-        # 批量获取json类型数据
-        if json_keys:
-            json_namespaces = {}
-            for redis_key, config in json_keys:
-                namespace = config["namespace"]
-                if namespace not in json_namespaces:
-                    json_namespaces[namespace] = []
-                json_namespaces[namespace].append((redis_key, config))
-            
-            for namespace, keys_configs in json_namespaces.items():
-                key_suffixes = [config["key_suffix"] for _, config in keys_configs]
-                results = self.redis_connector.redis_client.mget([f"{namespace}::json::{suffix}" for suffix in key_suffixes])
-                
-                for i, (redis_key, config) in enumerate(keys_configs):
-                    batch_results[redis_key] = results[i]
-        
-        return batch_results
+        # value和json类型的键都是普通字符串键，不分命名空间和类型，用一次MGET全部取回，只需一次网络往返
+        results = self.redis_connector.redis_client.mget(redis_keys)
+        return dict(zip(redis_keys, results))
     
-    def _process_batch_result(self, variable_config: Dict[str, Any], namespace: str, batch_results: Dict[str, Any], placeholders: Dict[str, Any], job_datetime: str) -> Any:
+    def _process_batch_result(self, variable_config: Dict[str, Any], namespace: str, batch_results: Dict[str, Any], placeholders: Dict[str, Any], job_datetime: str,
+                              redis_key: Optional[str] = None, range_data: Optional[List[Dict]] = None) -> Any:
         """
         处理批量获取的结果
         
@@ -727,9 +860,11 @@ class DataLoader:
             batch_results: 批量获取的结果
             placeholders: 占位符值映射
             job_datetime: 作业日期时间
+            redis_key: 收集批量键时已构建的键名，为None时重新构建
+            range_data: 已预取的时间序列/densets数据，为None时从Redis查询
             
         Returns:
-            处理后的变量数据
+            处理后的变量数据，键在批量结果中不存在时返回_MISSING
         """
         redis_config = variable_config["redis_config"]
         redis_type = redis_config["type"]
@@ -737,23 +872,25 @@ class DataLoader:
         effective_namespace = variable_config.get("namespace") or namespace
         
         if redis_type in ["value", "json"]:
-            field = redis_config["field"]
-            prefixes = redis_config.get("prefix", [])
-            redis_key = self._build_redis_key(effective_namespace, redis_type, prefixes, field, placeholders, job_datetime)
+            if redis_key is None:
+                field = redis_config["field"]
+                prefixes = redis_config.get("prefix", [])
+                redis_key = self._build_redis_key(effective_namespace, redis_type, prefixes, field, placeholders, job_datetime)
             
-            if redis_key not in batch_results or batch_results[redis_key] is None:
-                raise KeyError(f"变量 '{variable_config['name']}' 在Redis中不存在")
+            # 键不存在时返回标记，由调用方记录，不抛出异常
+            value = batch_results.get(redis_key)
+            if value is None:
+                return _MISSING
             
             if redis_type == "value":
-                return batch_results[redis_key]
+                return value
             elif redis_type == "json":
-                import json
-                return json.loads(batch_results[redis_key])
+                return loads_fast(value)
         elif redis_type == "timeseries":
-            # 时间序列仍然需要单独处理
-            return self._load_timeseries(variable_config, effective_namespace, placeholders, job_datetime)
+            # 时间序列使用预取的数据，未能预取时单独查询
+            return self._load_timeseries(variable_config, effective_namespace, placeholders, job_datetime, range_data)
         elif redis_type == "densets":
-            # densets 仍然需要单独处理
-            return self._load_densets(variable_config, effective_namespace, placeholders, job_datetime)
+            # densets 使用预取的数据，未能预取时单独查询
+            return self._load_densets(variable_config, effective_namespace, placeholders, job_datetime, range_data)
         else:
             raise ValueError(f"不支持的Redis类型: {redis_type}")
@@ -3,6 +3,25 @@ import json
 import numpy as np
 from typing import Any, Dict, Union, Optional
 from datetime import datetime
+from utils.json_parser import loads_fast
+
+
+# float() 可接受的字符串去掉空白后的首字符（数字另行判断），用于在调用前排除普通文本
+_FLOAT_LEADING_CHARS = frozenset('+-.iInN')
+# 常见标量类型到Python类型的转换，type(value) 查表比逐个 isinstance 判断更快
+_SCALAR_CONVERTERS = {
+    np.int8: int, np.int16: int, np.int32: int, np.int64: int,
+    np.uint8: int, np.uint16: int, np.uint32: int, np.uint64: int,
+    np.float16: float, np.float32: float, np.float64: float,
+    np.bool_: bool,
+    pd.Timestamp: str,
+    np.datetime64: str,
+}
+# JSON文本（含json.loads额外接受的NaN/Infinity）的首字符
+_JSON_LEADING_CHARS = frozenset('{["-0123456789tfnNI')
+# 可识别为布尔值的字符串（小写）
+_BOOL_VALUES = frozenset(('true', 'false', '1', '0', 'yes', 'no'))
+_BOOL_TRUE = frozenset(('true', '1', 'yes'))
 
 
 class Parser:
@@ -73,11 +92,29 @@ class Parser:
         Returns:
             Any: 解析后的值
         """
+        value_type = type(value)
+        # 字符串不会是NaN，直接解析
+        if value_type is str:
+            return self._parse_string_value(value, column_name)
+        
+        # Python原生标量不必经过pd.isna：float只有NaN需要转换为None，int/bool原样返回
+        if value is None:
+            return None
+        if value_type is float:
+            return None if value != value else value
+        if value_type is int or value_type is bool:
+            return value
+        
         # 处理NaN值
         if pd.isna(value):
             return None
+        
+        # 常见的numpy标量和时间类型按具体类型直接查表转换
+        converter = _SCALAR_CONVERTERS.get(value_type)
+        if converter is not None:
+            return converter(value)
             
-        # 处理numpy类型
+        # 处理numpy类型（包括上表未列出的子类）
         if isinstance(value, np.integer):
             return int(value)
         elif isinstance(value, np.floating):
@@ -107,9 +144,14 @@ class Parser:
         Returns:
             Any: 解析后的值
         """
+        # JSON文本去掉JSON空白后只能以这些字符开头，其余字符串（如普通文本）不必尝试JSON解析
+        stripped = value.lstrip(' \t\n\r')
+        if not stripped or stripped[0] not in _JSON_LEADING_CHARS:
+            return self._try_type_conversion(value)
+        
         # 尝试JSON解析
         try:
-            parsed_json = json.loads(value)
+            parsed_json = loads_fast(value)
             
             # 检查是否包含type和records字段
             if isinstance(parsed_json, dict) and 'type' in parsed_json and 'records' in parsed_json:
@@ -127,13 +169,16 @@ class Parser:
         解析包含DataFrame信息的JSON对象
         
         Args:
-            json_obj: 包含type和records字段的JSON对象
+            json_obj: 包含type和records字段的JSON对象，records可以是JSON字符串或已解析的对象
             
         Returns:
             Union[pd.DataFrame, Dict[str, Any]]: 解析后的DataFrame或原始JSON对象
         """
         try:
-            records = json.loads(json_obj['records'])
+            # records直接以JSON对象给出时无需再次解析
+            records = json_obj['records']
+            if isinstance(records, str):
+                records = loads_fast(records)
             
             # 检查records是否为字典格式（列名到数组的映射）
             if isinstance(records, dict):
@@ -150,14 +195,21 @@ class Parser:
                 if len(unique_lengths) > 1:
                     return json_obj
                 
-                # 如果所有数组长度一致，转换为DataFrame
-                df = pd.DataFrame(records)
-                
                 # 检查是否有额外的字段需要作为列添加
-                extra_fields = {k: v for k, v in json_obj.items() if k not in ['type', 'records']}
-                if extra_fields:
+                extra_fields = {k: v for k, v in json_obj.items() if k not in ('type', 'records')}
+                
+                # 额外字段都是标量时，与records的列一起一次性构建DataFrame
+                row_count = array_lengths[0]
+                if row_count and all(pd.api.types.is_scalar(value) for value in extra_fields.values()):
+                    columns = dict(records)
                     for column, value in extra_fields.items():
-                        df[column] = value
+                        columns[column] = [value] * row_count
+                    return pd.DataFrame.from_dict(columns)
+                
+                # 如果所有数组长度一致，转换为DataFrame
+                df = pd.DataFrame(records)
+                for column, value in extra_fields.items():
+                    df[column] = value
                 
                 return df
             else:
@@ -179,26 +231,28 @@ class Parser:
         Returns:
             Any: 转换后的值
         """
-        # 尝试转换为整数
-        try:
-            if value.isdigit() or (value.startswith('-') and value[1:].isdigit()):
-                return int(value)
-        except:
-            pass
+        # 尝试转换为整数：十进制数字串（可带负号）一定能被int解析
+        if value.isdecimal() or (value.startswith('-') and value[1:].isdecimal()):
+            return int(value)
         
-        # 尝试转换为浮点数
-        try:
-            float_val = float(value)
-            # 检查是否为整数
-            if float_val.is_integer():
-                return int(float_val)
-            return float_val
-        except:
-            pass
+        # 尝试转换为浮点数：float只接受去掉空白后以符号、小数点、数字或inf/nan开头的字符串，
+        # 其他字符串（如普通文本）直接跳过，不必抛出再捕获异常
+        stripped = value.strip()
+        if stripped and (stripped[0] in _FLOAT_LEADING_CHARS or stripped[0].isdecimal()):
+            try:
+                float_val = float(value)
+            except ValueError:
+                pass
+            else:
+                # 检查是否为整数
+                if float_val.is_integer():
+                    return int(float_val)
+                return float_val
         
         # 尝试转换为布尔值
-        if value.lower() in ['true', 'false', '1', '0', 'yes', 'no']:
-            return value.lower() in ['true', '1', 'yes']
+        value_lower = value.lower()
+        if value_lower in _BOOL_VALUES:
+            return value_lower in _BOOL_TRUE
         
         # # 尝试转换为日期时间
         # try:
@@ -224,11 +278,50 @@ class Parser:
         Returns:
             list: 解析后的行数据列表
         """
-        results = []
-        for index, row in df.iterrows():
-            parsed_row = self.parse_row(row)
-            results.append(parsed_row)
-        return results
+        values = df.values
+        # 全部为日期时间列时，iterrows得到的行是Timestamp序列，沿用逐行解析
+        if values.dtype.kind in 'mM':
+            return [self.parse_row(row) for _, row in df.iterrows()]
+        
+        # 与iterrows一致按整张表的公共dtype取值，但不为每一行构造Series：
+        # tolist() 与 Series 迭代同样逐个调用 item()，得到的都是Python标量或原对象
+        names = []
+        parsed_columns = []
+        for position, (column_name, dtype) in enumerate(zip(df.columns.tolist(), df.dtypes.tolist())):
+            # 跳过索引列
+            if column_name == 'Unnamed: 0':
+                continue
+            names.append(column_name)
+            parsed_columns.append(self._parse_column(values[:, position].tolist(), column_name, dtype))
+        
+        if not parsed_columns:
+            return [{} for _ in range(len(df))]
+        return [dict(zip(names, row_values)) for row_values in zip(*parsed_columns)]
+    
+    def _parse_column(self, column: list, column_name: str, dtype) -> list:
+        """
+        按列解析值，numpy数值列按dtype整列处理，其余列逐个解析
+        
+        Args:
+            column: 已转换为Python对象的列值
+            column_name: 列名
+            dtype: 列在DataFrame中的dtype
+            
+        Returns:
+            list: 解析后的值列表
+        """
+        if isinstance(dtype, np.dtype):
+            # 整数和布尔列没有缺失值，取出的已是Python标量，原样返回
+            if dtype.kind in 'iub':
+                return column
+            # 浮点列只需把NaN转换为None
+            if dtype.kind == 'f':
+                return [None if value != value else value for value in column]
+        # 字符串不会是NaN，直接解析；其他值仍走完整的缺失值和类型判断
+        parse_string_value = self._parse_string_value
+        parse_value = self._parse_value
+        return [parse_string_value(value, column_name) if type(value) is str else parse_value(value, column_name)
+                for value in column]
 
 
 def parse_excel_file(file_path: str) -> list:
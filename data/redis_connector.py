@@ -1,6 +1,61 @@
+import logging
 import redis
 import json
-from typing import Dict, List, Optional, Any, Union
+import numpy as np
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Union, Tuple, Sequence
+from utils.json_parser import loads_fast, loads_many
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow 为可选依赖，仅 get_timeseries_arrow 需要
+    pa = None
+
+
+@lru_cache(maxsize=256)
+def _parse_schema(schema_str: str) -> Tuple[Tuple[str, str], ...]:
+    """解析densets的schema字符串为 ((列名, 类型), ...)，没有类型定义的列默认为string，同一字符串只解析一次"""
+    if not schema_str:
+        return ()
+    
+    columns = []
+    for col_def in schema_str.split(','):
+        col_def = col_def.strip()
+        if ':' in col_def:
+            col_name, col_type = col_def.split(':', 1)
+            columns.append((col_name.strip(), col_type.strip()))
+        else:
+            # 如果没有类型定义，默认为string
+            columns.append((col_def.strip(), 'string'))
+    
+    return tuple(columns)
+
+
+def _column_to_strings(column: Sequence) -> List[str]:
+    """将一列值转换为字符串列表，结果与逐个调用str()一致；数值/布尔类型的numpy数组整列向量化转换"""
+    if isinstance(column, np.ndarray) and column.dtype.kind in 'biuf':
+        return column.astype(str).tolist()
+    return [str(value) for value in column]
+
+
+# 按 (host, port, db, password) 共享的连接池，同一服务器的多个RedisConnector复用连接
+_CONNECTION_POOLS: Dict[Tuple[str, int, int, Optional[str]], redis.ConnectionPool] = {}
+
+
+def _get_connection_pool(host: str, port: int, password: Optional[str], db: int) -> redis.ConnectionPool:
+    """获取（必要时创建）指定服务器的共享连接池"""
+    pool_key = (host, port, db, password)
+    pool = _CONNECTION_POOLS.get(pool_key)
+    if pool is None:
+        pool = _CONNECTION_POOLS.setdefault(pool_key, redis.ConnectionPool(
+            host=host,
+            port=port,
+            password=password,
+            db=db,
+            decode_responses=True
+        ))
+    return pool
+
 
 class RedisConnector:
     """Redis连接器"""
@@ -21,20 +76,15 @@ class RedisConnector:
         self.password = password
         self.db = db
         self.use_json_module = use_json_module
+        self.logger = logging.getLogger("RedisConnector")
         
-        # 创建Redis连接
-        self.redis_client = redis.Redis(
-            host=host,
-            port=port,
-            password=password,
-            db=db,
-            decode_responses=True
-        )
+        # 创建Redis连接，连接池在同一服务器的实例之间共享
+        self.redis_client = redis.Redis(connection_pool=_get_connection_pool(host, port, password, db))
         
         # 测试连接
         try:
             self.redis_client.ping()
-            print(f"✅ Redis连接成功: {host}:{port}")
+            self.logger.info("Redis连接成功: %s:%s", host, port)
             
             # 如果启用JSON模块，测试是否可用
             if use_json_module:
@@ -42,13 +92,13 @@ class RedisConnector:
                     # 测试JSON模块是否可用
                     self.redis_client.execute_command('JSON.SET', 'test_key', '.', '{}')
                     self.redis_client.delete('test_key')
-                    print("✅ RedisJSON模块可用")
+                    self.logger.info("RedisJSON模块可用")
                 except redis.ResponseError:
-                    print("⚠️ RedisJSON模块不可用，回退到字符串模式")
+                    self.logger.warning("RedisJSON模块不可用，回退到字符串模式")
                     self.use_json_module = False
                     
         except redis.ConnectionError as e:
-            print(f"❌ Redis连接失败: {e}")
+            self.logger.error("Redis连接失败: %s", e)
             raise
 
     # ========== JSON 变量存储相关方法 ==========
@@ -65,14 +115,38 @@ class RedisConnector:
         redis_key = f"{namespace}::json::{key}"
         
         if self.use_json_module:
-            # 使用RedisJSON模块存储
-            self.redis_client.execute_command('JSON.SET', redis_key, '.', json.dumps(json_values))
-            self.redis_client.expire(redis_key, ttl)
-            print(f"✅ JSON变量已存储(JSON模块): {redis_key}")
+            # 使用RedisJSON模块存储，JSON.SET和EXPIRE通过一个pipeline发送，只需一次网络往返
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.execute_command('JSON.SET', redis_key, '.', json.dumps(json_values))
+            pipe.expire(redis_key, ttl)
+            pipe.execute()
+            self.logger.debug("JSON变量已存储(JSON模块): %s", redis_key)
         else:
             # 使用字符串存储
             self.redis_client.set(redis_key, json.dumps(json_values), ex=ttl)
-            print(f"✅ JSON变量已存储(字符串): {redis_key}")
+            self.logger.debug("JSON变量已存储(字符串): %s", redis_key)
+    
+    def store_json_variables_bulk(self, items: List[Tuple[str, str, Dict[str, Any]]], ttl: int = 432000, batch_size: int = 1000):
+        """
+        批量存储JSON变量，命令通过pipeline发送，每batch_size个变量执行一次
+        
+        Args:
+            items: (命名空间, 键名, JSON数据) 列表
+            ttl: 生存时间（秒），默认5天（432000秒）
+            batch_size: 每次pipeline执行包含的变量数
+        """
+        pipe = self.redis_client.pipeline(transaction=False)
+        for index, (namespace, key, json_values) in enumerate(items, 1):
+            redis_key = f"{namespace}::json::{key}"
+            if self.use_json_module:
+                pipe.execute_command('JSON.SET', redis_key, '.', json.dumps(json_values))
+                pipe.expire(redis_key, ttl)
+            else:
+                pipe.set(redis_key, json.dumps(json_values), ex=ttl)
+            if index % batch_size == 0:
+                pipe.execute()
+        pipe.execute()
+        self.logger.debug("JSON变量已批量存储: %s 个", len(items))
     
     def get_json_variable(self, namespace: str, key: str) -> Any:
         """
@@ -93,7 +167,7 @@ class RedisConnector:
                 data_str = self.redis_client.execute_command('JSON.GET', redis_key, '.')
                 if data_str is None:
                     raise KeyError(f"JSON变量 '{redis_key}' 不存在")
-                return json.loads(data_str)
+                return loads_fast(data_str)
             except redis.ResponseError:
                 raise KeyError(f"JSON变量 '{redis_key}' 不存在")
         else:
@@ -101,7 +175,7 @@ class RedisConnector:
             data_str = self.redis_client.get(redis_key)
             if not data_str:
                 raise KeyError(f"JSON变量 '{redis_key}' 不存在")
-            return json.loads(data_str)
+            return loads_fast(data_str)
     
     def get_json_field(self, namespace: str, key: str, field_path: str) -> Any:
         """
@@ -135,7 +209,7 @@ class RedisConnector:
             result = self.redis_client.execute_command('JSON.GET', redis_key, field_path)
             if result is None:
                 raise KeyError(f"字段 '{field_path}' 不存在")
-            return json.loads(result)
+            return loads_fast(result)
         except redis.ResponseError:
             raise KeyError(f"字段 '{field_path}' 不存在")
     
@@ -171,7 +245,7 @@ class RedisConnector:
         redis_key = f"{namespace}::json::{key}"
         try:
             self.redis_client.execute_command('JSON.SET', redis_key, field_path, json.dumps(value))
-            print(f"✅ JSON字段已更新: {redis_key}{field_path}")
+            self.logger.debug("JSON字段已更新: %s%s", redis_key, field_path)
         except redis.ResponseError as e:
             raise ValueError(f"无法更新字段 '{field_path}': {e}")
 
@@ -188,11 +262,15 @@ class RedisConnector:
         """
         redis_key = f"{namespace}::value::{key}"
         
-        # 如果是复杂类型，转换为JSON
+        # 如果是复杂类型，转换为JSON；字符串直接写入，其余类型转换为字符串
         if isinstance(value, (dict, list)):
-            value = json.dumps(value)
+            payload = json.dumps(value)
+        elif type(value) is str:
+            payload = value
+        else:
+            payload = str(value)
         
-        self.redis_client.set(redis_key, str(value), ex=ttl)
+        self.redis_client.set(redis_key, payload, ex=ttl)
     
     def get_direct_variable(self, namespace: str, key: str) -> Any:
         """
@@ -231,19 +309,36 @@ class RedisConnector:
         """
         redis_key = f"{namespace}::timeseries::{series_key}"
         
-        # 将值序列化为JSON字符串
-        if isinstance(value, (dict, list)):
-            serialized_value = json.dumps(value)
-        else:
-            serialized_value = json.dumps({"value": value})
-        
         # 直接添加数据，不删除相同时间戳的数据
-        self.redis_client.zadd(redis_key, {serialized_value: timestamp})
+        self._zadd_with_ttl(redis_key, {self._serialize_timeseries_value(value): timestamp}, ttl)
         
-        # 设置TTL
-        self.redis_client.expire(redis_key, ttl)
+        self.logger.debug("时间序列数据点已添加: %s @ %s", redis_key, timestamp)
+    
+    def add_timeseries_points_bulk(self, namespace: str, series_key: str, points: List[Tuple[float, Any]], ttl: int = 432000):
+        """
+        批量添加时间序列数据点，所有数据点通过一次ZADD写入
         
-        print(f"✅ 时间序列数据点已添加: {redis_key} @ {timestamp}")
+        Args:
+            namespace: 命名空间
+            series_key: 时间序列键名
+            points: (时间戳, 数据值) 列表
+            ttl: 生存时间（秒），默认5天
+        """
+        if not points:
+            return
+        redis_key = f"{namespace}::timeseries::{series_key}"
+        
+        mapping = {self._serialize_timeseries_value(value): timestamp for timestamp, value in points}
+        self._zadd_with_ttl(redis_key, mapping, ttl)
+        
+        self.logger.debug("时间序列数据点已批量添加: %s, %s 个", redis_key, len(points))
+    
+    @staticmethod
+    def _serialize_timeseries_value(value: Any) -> str:
+        """将时间序列的值序列化为JSON字符串，非dict/list的值包装为 {"value": value}"""
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        return json.dumps({"value": value})
 
     # ========== densets 存储相关方法 ==========
     
@@ -261,61 +356,95 @@ class RedisConnector:
         """
         redis_key = f"{namespace}::densets::{series_key}"
         
-        # 将值序列化为分隔符分隔的字符串
-        if isinstance(value, dict):
-            if schema:
-                # 根据schema顺序序列化
-                schema_columns = self._parse_schema_string(schema)
-                serialized_values = []
-                for col_name, col_type in schema_columns:
-                    if col_name in value:
-                        serialized_values.append(str(value[col_name]))
-                    else:
-                        # 如果字段不存在，使用空字符串
-                        serialized_values.append("")
-                serialized_value = ",".join(serialized_values)
-            else:
-                # 如果没有schema，按字典键的顺序（不保证顺序）
-                serialized_value = ",".join(str(v) for v in value.values())
-        elif isinstance(value, list):
-            serialized_value = ",".join(str(v) for v in value)
-        else:
-            serialized_value = str(value)
-        
         # 直接添加数据，不删除相同时间戳的数据
-        self.redis_client.zadd(redis_key, {serialized_value: timestamp})
+        self._zadd_with_ttl(redis_key, {self._serialize_densets_value(value, schema): timestamp}, ttl)
+        
+        self.logger.debug("densets数据点已添加: %s @ %s, schema: %s", redis_key, timestamp, schema)
+    
+    def add_densets_points_bulk(self, namespace: str, series_key: str, points: List[Tuple[float, Any]], schema: str = None, ttl: int = 432000):
+        """
+        批量添加densets数据点，所有数据点通过一次ZADD写入
+        
+        Args:
+            namespace: 命名空间
+            series_key: densets键名
+            points: (时间戳, 数据值) 列表
+            schema: 数据schema，格式如 "col1:string,col2:int,col3:double"，用于保证字段顺序
+            ttl: 生存时间（秒），默认5天
+        """
+        if not points:
+            return
+        redis_key = f"{namespace}::densets::{series_key}"
         
-        # 设置TTL
-        self.redis_client.expire(redis_key, ttl)
+        mapping = {self._serialize_densets_value(value, schema): timestamp for timestamp, value in points}
+        self._zadd_with_ttl(redis_key, mapping, ttl)
         
-        print(f"✅ densets数据点已添加: {redis_key} @ {timestamp}")
-        if schema:
-            print(f"   使用schema: {schema}")
+        self.logger.debug("densets数据点已批量添加: %s, %s 个, schema: %s", redis_key, len(points), schema)
     
-    def _parse_schema_string(self, schema_str: str) -> List[tuple]:
+    def add_densets_columns_bulk(self, namespace: str, series_key: str, timestamps: Sequence[float], columns: Dict[str, Sequence], schema: str = None, ttl: int = 432000):
         """
-        解析schema字符串，返回列名和类型的元组列表
+        按列批量添加densets数据点，结果与逐行以 {列名: 值} 字典调用 add_densets_point 一致
+        
+        Args:
+            namespace: 命名空间
+            series_key: densets键名
+            timestamps: 时间戳序列（列表或numpy数组）
+            columns: 列名到值序列的映射，每列长度与timestamps一致
+            schema: 数据schema，格式如 "col1:string,col2:int,col3:double"，用于保证字段顺序，缺少的列写为空字符串
+            ttl: 生存时间（秒），默认5天
+        """
+        row_count = len(timestamps)
+        if not row_count:
+            return
+        for col_name, column in columns.items():
+            if len(column) != row_count:
+                raise ValueError(f"densets列 {col_name} 的长度 {len(column)} 与时间戳数量 {row_count} 不一致")
+        redis_key = f"{namespace}::densets::{series_key}"
+        
+        # 逐列转换为字符串后按行拼接，避免逐个数据点遍历字典
+        col_names = [col_name for col_name, _ in self._parse_schema_string(schema)] if schema else list(columns)
+        empty_column = [""] * row_count
+        column_strings = [_column_to_strings(columns[col_name]) if col_name in columns else empty_column
+                          for col_name in col_names]
+        members = [",".join(row) for row in zip(*column_strings)] if column_strings else empty_column
+        if isinstance(timestamps, np.ndarray):
+            timestamps = timestamps.tolist()
+        
+        self._zadd_with_ttl(redis_key, dict(zip(members, timestamps)), ttl)
+        
+        self.logger.debug("densets数据点已按列批量添加: %s, %s 个, schema: %s", redis_key, row_count, schema)
+    
+    def _zadd_with_ttl(self, redis_key: str, mapping: Dict[str, float], ttl: int):
+        """通过一个pipeline写入ZADD并刷新TTL，只需一次网络往返"""
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.zadd(redis_key, mapping)
+        pipe.expire(redis_key, ttl)
+        pipe.execute()
+    
+    def _serialize_densets_value(self, value: Any, schema: Optional[str]) -> str:
+        """将densets的值序列化为逗号分隔的字符串"""
+        if isinstance(value, dict):
+            if schema:
+                # 根据schema顺序序列化，字段不存在时使用空字符串
+                return ",".join(str(value[col_name]) if col_name in value else ""
+                                for col_name, _ in self._parse_schema_string(schema))
+            # 如果没有schema，按字典键的顺序（不保证顺序）
+            return ",".join(str(v) for v in value.values())
+        elif isinstance(value, list):
+            return ",".join(str(v) for v in value)
+        return str(value)
+    
+    def _parse_schema_string(self, schema_str: str) -> Tuple[Tuple[str, str], ...]:
+        """
+        解析schema字符串，返回列名和类型的元组
         
         Args:
             schema_str: schema字符串，格式如 "col1:string,col2:int,col3:double"
             
         Returns:
-            列名和类型的元组列表
+            列名和类型的元组（相同schema返回同一个缓存对象）
         """
-        if not schema_str:
-            return []
-        
-        columns = []
-        for col_def in schema_str.split(','):
-            col_def = col_def.strip()
-            if ':' in col_def:
-                col_name, col_type = col_def.split(':', 1)
-                columns.append((col_name.strip(), col_type.strip()))
-            else:
-                # 如果没有类型定义，默认为string
-                columns.append((col_def.strip(), 'string'))
-        
-        return columns
+        return _parse_schema(schema_str)
     
     def get_timeseries_range(self, namespace: str, series_key: str, start_time: float = None, end_time: float = None, limit: int = None) -> List[Dict]:
         """
@@ -332,34 +461,88 @@ class RedisConnector:
             时间序列数据列表，每个元素包含timestamp和value
         """
         redis_key = f"{namespace}::timeseries::{series_key}"
+        results = self._zrange_by_time(redis_key, start_time, end_time, limit)
+        return self._format_timeseries_results(results)
+    
+    def get_timeseries_arrow(self, namespace: str, series_key: str, start_time: float = None, end_time: float = None, limit: int = None) -> "pa.Table":
+        """
+        以列式的pyarrow.Table获取时间序列数据范围，供pandas/polars等分析场景直接使用
         
+        Args:
+            namespace: 命名空间
+            series_key: 时间序列键名
+            start_time: 开始时间戳（None表示从最早开始）
+            end_time: 结束时间戳（None表示到最晚结束）
+            limit: 限制返回数量
+            
+        Returns:
+            包含timestamp（float64）和value（string，未反序列化的JSON文本）两列的pyarrow.Table
+        """
+        if pa is None:
+            raise ImportError("get_timeseries_arrow 需要安装 pyarrow")
+        
+        redis_key = f"{namespace}::timeseries::{series_key}"
+        results = self._zrange_by_time(redis_key, start_time, end_time, limit)
+        return pa.table({
+            "timestamp": pa.array([timestamp for _, timestamp in results], type=pa.float64()),
+            "value": pa.array([value_str for value_str, _ in results], type=pa.string()),
+        })
+    
+    def _zrange_by_time(self, redis_key: str, start_time: Optional[float], end_time: Optional[float], limit: Optional[int]) -> List[Tuple[str, float]]:
+        """按时间戳范围查询有序集合，返回 [(成员, 时间戳), ...]"""
         # 设置查询范围
         min_score = start_time if start_time is not None else '-inf'
         max_score = end_time if end_time is not None else '+inf'
         
         # 获取数据
         if limit:
-            results = self.redis_client.zrangebyscore(redis_key, min_score, max_score, withscores=True, start=0, num=limit)
-        else:
-            results = self.redis_client.zrangebyscore(redis_key, min_score, max_score, withscores=True)
+            return self.redis_client.zrangebyscore(redis_key, min_score, max_score, withscores=True, start=0, num=limit)
+        return self.redis_client.zrangebyscore(redis_key, min_score, max_score, withscores=True)
+    
+    def get_timeseries_range_batch(self, queries: List[Tuple[str, str, Optional[float], Optional[float]]]) -> List[List[Dict]]:
+        """
+        批量获取多个时间序列的数据范围，所有查询通过一个pipeline在一次网络往返中完成
         
-        # 反序列化并格式化结果
-        timeseries_data = []
-        for value_str, timestamp in results:
-            try:
-                value_data = json.loads(value_str)
-                timeseries_data.append({
-                    "timestamp": timestamp,
-                    "value": value_data
-                })
-            except json.JSONDecodeError:
-                # 如果反序列化失败，使用原始字符串
-                timeseries_data.append({
-                    "timestamp": timestamp,
-                    "value": value_str
-                })
-        
-        return timeseries_data
+        Args:
+            queries: 查询列表，每个元素为 (namespace, series_key, start_time, end_time)，
+                     时间为None表示不限制
+            
+        Returns:
+            与queries顺序一致的时间序列数据列表，每个元素的格式同 get_timeseries_range
+        """
+        return self.pipeline_range_queries([("timeseries",) + tuple(query) for query in queries])
+    
+    def pipeline_range_queries(self, queries: List[Tuple[str, str, str, Optional[float], Optional[float]]]) -> List[List[Dict]]:
+        """
+        批量执行时间序列/densets的范围查询，所有查询通过一个pipeline在一次网络往返中完成
+        
+        Args:
+            queries: 查询列表，每个元素为 (redis_type, namespace, series_key, start_time, end_time)，
+                     redis_type为"timeseries"或"densets"，时间为None表示不限制
+            
+        Returns:
+            与queries顺序一致的数据列表，每个元素的格式同 get_timeseries_range / get_densets_range
+        """
+        formatters = []
+        pipe = self.redis_client.pipeline(transaction=False)
+        for redis_type, namespace, series_key, start_time, end_time in queries:
+            if redis_type == "timeseries":
+                formatters.append(self._format_timeseries_results)
+            elif redis_type == "densets":
+                formatters.append(self._format_densets_results)
+            else:
+                raise ValueError(f"不支持范围查询的Redis类型: {redis_type}")
+            min_score = start_time if start_time is not None else '-inf'
+            max_score = end_time if end_time is not None else '+inf'
+            pipe.zrangebyscore(f"{namespace}::{redis_type}::{series_key}", min_score, max_score, withscores=True)
+        
+        return [format_results(results) for format_results, results in zip(formatters, pipe.execute())]
+    
+    @staticmethod
+    def _format_timeseries_results(results) -> List[Dict]:
+        """反序列化并格式化时间序列查询结果，无法反序列化的值保留原始字符串"""
+        values = loads_many([value_str for value_str, _ in results])
+        return [{"timestamp": timestamp, "value": value} for (_, timestamp), value in zip(results, values)]
     
     def get_densets_range(self, namespace: str, series_key: str, start_time: float = None, end_time: float = None, limit: int = None) -> List[Dict]:
         """
@@ -387,15 +570,12 @@ class RedisConnector:
         else:
             results = self.redis_client.zrangebyscore(redis_key, min_score, max_score, withscores=True)
         
-        # 格式化结果
-        densets_data = []
-        for value_str, timestamp in results:
-            densets_data.append({
-                "timestamp": timestamp,
-                "value": value_str
-            })
-        
-        return densets_data
+        return self._format_densets_results(results)
+    
+    @staticmethod
+    def _format_densets_results(results) -> List[Dict]:
+        """格式化densets查询结果"""
+        return [{"timestamp": timestamp, "value": value_str} for value_str, timestamp in results]
     
     def get_timeseries_latest(self, namespace: str, series_key: str, count: int = 1) -> List[Dict]:
         """
@@ -414,22 +594,7 @@ class RedisConnector:
         # 获取最新的数据（按时间戳降序）
         results = self.redis_client.zrevrange(redis_key, 0, count - 1, withscores=True)
         
-        # 反序列化并格式化结果
-        timeseries_data = []
-        for value_str, timestamp in results:
-            try:
-                value_data = json.loads(value_str)
-                timeseries_data.append({
-                    "timestamp": timestamp,
-                    "value": value_data
-                })
-            except json.JSONDecodeError:
-                timeseries_data.append({
-                    "timestamp": timestamp,
-                    "value": value_str
-                })
-        
-        return timeseries_data
+        return self._format_timeseries_results(results)
     
     def get_densets_latest(self, namespace: str, series_key: str, count: int = 1) -> List[Dict]:
         """
@@ -448,15 +613,7 @@ class RedisConnector:
         # 获取最新的数据（按时间戳降序）
         results = self.redis_client.zrevrange(redis_key, 0, count - 1, withscores=True)
         
-        # 格式化结果
-        densets_data = []
-        for value_str, timestamp in results:
-            densets_data.append({
-                "timestamp": timestamp,
-                "value": value_str
-            })
-        
-        return densets_data
+        return self._format_densets_results(results)
     
     def get_timeseries_count(self, namespace: str, series_key: str, start_time: float = None, end_time: float = None) -> int:
         """
@@ -513,7 +670,7 @@ class RedisConnector:
         """
         redis_key = f"{namespace}::timeseries::{series_key}"
         removed_count = self.redis_client.zremrangebyscore(redis_key, start_time, end_time)
-        print(f"✅ 删除了 {removed_count} 个时间序列数据点")
+        self.logger.debug("删除了 %s 个时间序列数据点", removed_count)
         return removed_count
     
     def remove_densets_range(self, namespace: str, series_key: str, start_time: float, end_time: float) -> int:
@@ -531,7 +688,7 @@ class RedisConnector:
         """
         redis_key = f"{namespace}::densets::{series_key}"
         removed_count = self.redis_client.zremrangebyscore(redis_key, start_time, end_time)
-        print(f"✅ 删除了 {removed_count} 个densets数据点")
+        self.logger.debug("删除了 %s 个densets数据点", removed_count)
         return removed_count
     
     def cleanup_old_timeseries(self, namespace: str, series_key: str, keep_latest: int = 1000):
@@ -556,7 +713,7 @@ class RedisConnector:
         
         # 删除旧数据（保留最新的keep_latest个）
         removed_count = self.redis_client.zremrangebyrank(redis_key, 0, total_count - keep_latest - 1)
-        print(f"✅ 清理了 {removed_count} 个旧的时间序列数据点")
+        self.logger.debug("清理了 %s 个旧的时间序列数据点", removed_count)
         return removed_count
     
     def cleanup_old_densets(self, namespace: str, series_key: str, keep_latest: int = 1000):
@@ -581,7 +738,7 @@ class RedisConnector:
         
         # 删除旧数据（保留最新的keep_latest个）
         removed_count = self.redis_client.zremrangebyrank(redis_key, 0, total_count - keep_latest - 1)
-        print(f"✅ 清理了 {removed_count} 个旧的densets数据点")
+        self.logger.debug("清理了 %s 个旧的densets数据点", removed_count)
         return removed_count
     
 
@@ -600,8 +757,8 @@ class RedisConnector:
         return self.redis_client.ttl(key)
     
     def list_keys(self, pattern: str = "*") -> List[str]:
-        """列出所有匹配的键"""
-        return self.redis_client.keys(pattern)
+        """列出所有匹配的键，使用SCAN分批遍历，避免KEYS长时间阻塞Redis；SCAN可能重复返回同一个键，结果去重"""
+        return list(dict.fromkeys(self.redis_client.scan_iter(match=pattern, count=1000)))
     
     def delete_key(self, key: str) -> bool:
         """删除指定键"""
@@ -611,7 +768,7 @@ class RedisConnector:
     def clear_all(self):
         """清空所有数据"""
         self.redis_client.flushdb()
-        print("✅ 所有数据已清空")
+        self.logger.debug("所有数据已清空")
 
 
 if __name__ == "__main__":
@@ -126,26 +126,19 @@ output = xgb_forecast
 """
 import pandas as pd     
 # 拼接上游的输出; 不关心node_name      
-df_concat = pd.concat([collection[node_name]['output'] for node_name in collection])
+frames = [collection[node_name]['output'] for node_name in collection]
+df_concat = pd.concat(frames, copy=False, ignore_index=True, sort=False)
 df_concat.sort_values(by=["fcst_date", "model"], inplace=True) # 按fcst_date和model排序
 
-# 按fcst_date分组，取priority最高的行，并计算平均值
-output = df_concat.groupby("fcst_date").apply(
-    lambda group: group[group["priority"] == group["priority"].max()].mean(numeric_only=True)
-).reset_index()
-                        
-# 补充非数值列，并将model拼接为字符串
-for fcst_date in output["fcst_date"]:
-    original_group = df_concat[df_concat['fcst_date'] == fcst_date]
-    max_priority_group = original_group[original_group["priority"] == original_group["priority"].max()]
-    
-    # 获取最高priority的所有model，用逗号拼接
-    models = max_priority_group["model"].tolist()
-    model_str = ",".join(models)
-    
-    # 取第一行的其他非数值列
-    first_row = max_priority_group.iloc[0]
-    output.loc[output["fcst_date"] == fcst_date, "model"] = model_str
+# 每个fcst_date只保留priority最高的行
+max_priority = df_concat.groupby("fcst_date")["priority"].transform("max")
+df_top = df_concat[df_concat["priority"] == max_priority]
+
+# 按fcst_date分组计算数值列的平均值，并将最高priority的所有model用逗号拼接
+grouped = df_top.groupby("fcst_date")
+output = grouped.mean(numeric_only=True)
+output["model"] = grouped["model"].agg(",".join)
+output = output.reset_index()
 
 output['job_date'] = "${yyyy-MM-dd}"
 output['store_nbr'] = store_nbr
@@ -164,6 +157,19 @@ output['item_nbr'] = item_nbr
     
     return engine
 
+# 节点图只构建一次，多次执行时复用
+_ENGINE = None
+
+
+def get_rule_engine():
+    """获取复用的规则引擎，再次获取时只清空上一次的执行状态，不重新构建节点"""
+    global _ENGINE
+    if _ENGINE is None:
+        _ENGINE = create_rule_engine()
+    else:
+        _ENGINE.reset()
+    return _ENGINE
+
 
 def main():
     """主函数"""
@@ -218,18 +224,24 @@ def main():
         
         # 5. 创建规则引擎
         print("\n⚙️ 创建规则引擎...")
-        engine = create_rule_engine()
+        engine = get_rule_engine()
         
         # 6. 执行规则引擎
         print("🔄 执行规则引擎...")
         results = engine.execute(job_datetime, placeholders=placeholders, variables=loaded_data)
         
-        # 8. 输出结果
+        # 8. 输出结果，同时统计执行摘要
         print("\n📋 执行结果:")
+        successful_nodes = failed_nodes = blocked_nodes = 0
         for node_name, result in results.items():
             if result.success:
+                successful_nodes += 1
                 print(f"  ✅ {node_name}: 执行成功")
             else:
+                if result.status == "failed":
+                    failed_nodes += 1
+                elif result.status == "blocked":
+                    blocked_nodes += 1
                 print(f"  ❌ {node_name}: 执行失败 - {result.error}")
         
         # 9. 获取最终结果
@@ -239,14 +251,16 @@ def main():
             final_report = final_context["final_report"][0]
             print(json.dumps(final_report, ensure_ascii=False, indent=2))
         
-        # 10. 输出执行摘要
+        # 10. 输出执行摘要（总节点数按引擎中的全部节点统计，成功率不计阻塞节点）
         print("\n📊 执行摘要:")
-        summary = engine.get_execution_summary()
-        print(f"  总节点数: {summary['total_nodes']}")
-        print(f"  成功节点: {summary['successful_nodes']}")
-        print(f"  失败节点: {summary['failed_nodes']}")
-        print(f"  阻塞节点: {summary['blocked_nodes']}")
-        print(f"  成功率: {summary['success_rate']:.2%}")
+        total_nodes = len(engine.get_all_nodes())
+        counted_nodes = total_nodes - blocked_nodes
+        success_rate = successful_nodes / counted_nodes if counted_nodes > 0 else 0
+        print(f"  总节点数: {total_nodes}")
+        print(f"  成功节点: {successful_nodes}")
+        print(f"  失败节点: {failed_nodes}")
+        print(f"  阻塞节点: {blocked_nodes}")
+        print(f"  成功率: {success_rate:.2%}")
         
         print("\n✅ 示例程序执行完成!")
         
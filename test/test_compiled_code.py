@@ -0,0 +1,137 @@
+"""
+测试节点代码的预编译与缓存
+"""
+
+import contextlib
+import io
+import pytest
+from core.engine import RuleEngine
+from core.nodes import LogicNode, GateNode, CollectionNode, _compile_condition, _needs_stdout_capture
+
+
+class TestCompiledCode:
+    """测试LogicNode/GateNode/CollectionNode代码预编译"""
+
+    def test_logic_code_compiled_once(self):
+        """测试不含动态参数的代码在set_logic时预编译，并在多次执行间复用"""
+        logic = LogicNode("logic1", "x = 1 + 1")
+        logic.set_tracked_variables(["x"])
+        compiled = logic._code
+        assert compiled is not None
+
+        engine = RuleEngine("test_engine")
+        engine.add_dependency(None, logic)
+        for job_date in ["2024-01-01", "2024-01-02"]:
+            results = engine.execute(job_date=job_date)
+            assert results["logic1"].data["x"] == 2
+        assert logic._code is compiled
+
+    def test_dynamic_code_compiled_per_parsed_source(self):
+        """测试含动态参数的代码按解析后的源码编译"""
+        logic = LogicNode("logic1", "d = '${yyyy-MM-dd}'")
+        logic.set_tracked_variables(["d"])
+        assert logic._code is None
+
+        engine = RuleEngine("test_engine")
+        engine.add_dependency(None, logic)
+        assert engine.execute(job_date="2024-01-01")["logic1"].data["d"] == "2024-01-01"
+        assert engine.execute(job_date="2024-01-02")["logic1"].data["d"] == "2024-01-02"
+
+    def test_compiled_code_shared_across_nodes(self):
+        """测试相同源码在不同节点间共享编译结果"""
+        logic1 = LogicNode("logic1", "x = 40 + 2")
+        logic2 = LogicNode("logic2", "x = 40 + 2")
+        assert logic1._code is logic2._code
+
+    def test_syntax_error_reported_on_execute(self):
+        """测试语法错误仍在执行时以失败结果返回"""
+        collection = CollectionNode("collection1")
+        collection.set_logic("result = (")
+
+        engine = RuleEngine("test_engine")
+        engine.add_dependency(None, collection)
+        result = engine.execute()["collection1"]
+        assert not result.success
+        assert result.status == "failed"
+
+    def test_gate_condition_compiled_once(self):
+        """测试含函数调用的GateNode条件预编译为eval模式并在多次执行间复用"""
+        logic = LogicNode("logic1", "x = 5")
+        logic.set_tracked_variables(["x"])
+        gate = GateNode("gate1", "abs(x) > 3")
+        compiled = gate._code
+        assert compiled is not None
+        assert compiled.co_filename == "<string>"
+
+        engine = RuleEngine("test_engine")
+        engine.add_dependency(None, logic)
+        engine.add_dependency(logic, gate)
+        for _ in range(2):
+            results = engine.execute()
+            assert results["gate1"].data["should_continue"] is True
+        assert gate._code is compiled
+
+    @pytest.mark.parametrize("condition", [
+        "x > 3",
+        "1 < x <= 5",
+        "x == 5 and not flag",
+        "flag or x",
+        "x in (1, 5) and -x < 0",
+        "items[0] == 'a' and cfg['k'] is None",
+        "s.real == 5",
+        "x > 3 and None",
+    ])
+    def test_simple_condition_matches_eval(self, condition):
+        """测试简单条件走AST求值，结果与eval一致"""
+        local_vars = {"x": 5, "flag": False, "items": ["a"], "cfg": {"k": None}, "s": 5}
+        evaluator = _compile_condition(condition)
+        assert evaluator is not None
+        assert evaluator(local_vars) == eval(condition, {}, local_vars)
+
+    def test_unsupported_condition_falls_back_to_eval(self):
+        """测试包含函数调用或语法错误的条件不走AST求值"""
+        assert _compile_condition("len(x) > 0") is None
+        assert _compile_condition("x >") is None
+
+    def test_condition_undefined_name_fails(self):
+        """测试简单条件引用未定义变量时返回与eval一致的错误"""
+        gate = GateNode("gate1", "missing > 1")
+        result = gate.execute({})
+        assert not result.success
+        assert result.error == "name 'missing' is not defined"
+
+    @pytest.mark.parametrize("source, expected", [
+        ("x = 1 + 1", False),
+        ("total = sum(len(v) for v in [[1], [2, 3]])", True),
+        ("total = max(sorted([3, 1]))", False),
+        ("print(x)", True),
+        ("r = list(map(print, [1, 2]))", True),
+        ("r = sorted([2, 1], key=f)", True),
+        ("p = print\np(1)", True),
+        ("x = df.head()", True),
+        ("import math", True),
+        ("len = print\nlen('a')", True),
+        ("def f(sum): return sum\ny = 1", True),
+        ("x = (", True),
+    ])
+    def test_stdout_capture_detection(self, source, expected):
+        """测试只有确定不会产生输出的代码才跳过stdout捕获"""
+        assert _needs_stdout_capture(source) is expected
+
+    def test_print_passed_as_argument_is_captured(self):
+        """测试作为参数传入的print的输出被捕获到text_output，而不是写到进程stdout"""
+        logic = LogicNode("logic1", "r = list(map(print, [1, 2]))")
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            result = logic.execute({})
+        assert result.success
+        assert result.text_output == "1\n2\n"
+        assert stdout.getvalue() == ""
+
+    def test_silent_code_has_empty_text_output(self):
+        """测试跳过捕获的代码执行结果与text_output均正常"""
+        logic = LogicNode("logic1", "x = max(1, 2)")
+        logic.set_tracked_variables(["x"])
+        result = logic.execute({})
+        assert result.success
+        assert result.data == {"x": 2}
+        assert result.text_output == ""
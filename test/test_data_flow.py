@@ -0,0 +1,142 @@
+"""
+测试DataFlow依赖关系管理与拓扑排序
+"""
+
+import pytest
+from core.data_flow import DataFlow
+from core.nodes import StartNode, LogicNode
+
+
+def _build_flow(names):
+    """创建包含start_node和指定逻辑节点的数据流"""
+    flow = DataFlow()
+    flow.add_node(StartNode("start_node"))
+    for name in names:
+        flow.add_node(LogicNode(name))
+    return flow
+
+
+class TestDataFlow:
+    """测试DataFlow"""
+
+    def test_topological_sort_respects_dependencies(self):
+        """测试拓扑排序满足依赖关系"""
+        flow = _build_flow(["a", "b", "c", "d"])
+        flow.add_dependency("start_node", "a")
+        flow.add_dependency("start_node", "b")
+        flow.add_dependency("a", "c")
+        flow.add_dependency("b", "c")
+        flow.add_dependency("c", "d")
+
+        order = flow.get_execution_order()
+        assert order[0] == "start_node"
+        assert len(order) == 5
+        for target, sources in flow.dependencies.items():
+            for source in sources:
+                assert order.index(source) < order.index(target)
+
+    def test_circular_dependency_detected(self):
+        """测试循环依赖检测"""
+        flow = _build_flow(["a", "b"])
+        flow.add_dependency("start_node", "a")
+        flow.add_dependency("a", "b")
+        flow.add_dependency("b", "a")
+
+        with pytest.raises(ValueError, match="Circular dependency detected"):
+            flow.get_execution_order()
+
+    def test_children_index_follows_mutations(self):
+        """测试反向邻接表随增删同步更新"""
+        flow = _build_flow(["a", "b", "c"])
+        flow.add_dependency("start_node", "a")
+        flow.add_dependency("a", "b")
+        flow.add_dependency("a", "c")
+        assert flow.children["a"] == ["b", "c"]
+
+        flow.remove_dependency("a", "b")
+        assert flow.children["a"] == ["c"]
+
+        flow.remove_node("c")
+        assert flow.children["a"] == []
+        assert "c" not in flow.children
+
+        # 重复添加同名节点会清空其依赖
+        flow.add_node(LogicNode("a"))
+        assert flow.children["start_node"] == []
+        assert flow.get_node_dependencies("a") == []
+
+    def test_execution_order_cache_invalidated_on_mutation(self):
+        """测试执行顺序缓存在结构变更后失效"""
+        flow = _build_flow(["a", "b"])
+        flow.add_dependency("start_node", "a")
+        flow.add_dependency("start_node", "b")
+        assert flow.get_execution_order() == ["start_node", "a", "b"]
+
+        # 返回值是副本，修改不影响缓存
+        flow.get_execution_order().clear()
+        assert flow.get_execution_order() == ["start_node", "a", "b"]
+
+        flow.remove_dependency("start_node", "a")
+        flow.add_dependency("b", "a")
+        assert flow.get_execution_order() == ["start_node", "b", "a"]
+
+    def test_dependents_and_reachability(self):
+        """测试下游节点查询与可达性校验"""
+        flow = _build_flow(["a", "b", "orphan"])
+        flow.add_dependency("start_node", "a")
+        flow.add_dependency("a", "b")
+
+        assert flow.get_node_dependents("a") == ["b"]
+        assert flow.get_node_dependents("b") == []
+
+        is_valid, errors = flow.validate_structure()
+        assert not is_valid
+        assert errors == ["Unreachable node (not connected to start_node): orphan"]
+
+        flow.add_dependency("b", "orphan")
+        assert flow.validate_structure() == (True, [])
+
+    def test_duplicate_dependency_ignored(self):
+        """测试重复添加依赖关系不会产生重复边"""
+        flow = _build_flow(["a", "b"])
+        flow.add_dependency("start_node", "a")
+        flow.add_dependency("a", "b")
+        flow.add_dependency("a", "b")
+        assert flow.get_node_dependencies("b") == ["a"]
+        assert flow.get_node_dependents("a") == ["b"]
+
+        flow.remove_node("a")
+        assert flow.get_node_dependencies("b") == []
+        flow.add_dependency("start_node", "b")
+        assert flow.get_node_dependencies("b") == ["start_node"]
+
+    def test_bulk_set_dependencies(self):
+        """测试批量设置依赖关系会重建索引并忽略未知节点"""
+        flow = _build_flow(["a", "b"])
+        flow.add_dependency("start_node", "a")
+        flow._bulk_set_dependencies({
+            "a": ["start_node"],
+            "b": ["a", "a", "missing"],
+            "missing": ["a"],
+        })
+
+        assert flow.dependencies == {"start_node": [], "a": ["start_node"], "b": ["a"]}
+        assert flow.get_node_dependents("a") == ["b"]
+        assert flow.get_execution_order() == ["start_node", "a", "b"]
+
+    def test_validate_structure_cached_until_mutation(self):
+        """测试结构校验结果在结构未变更时复用，变更后重新校验"""
+        flow = _build_flow(["a"])
+        assert flow.validate_structure() == (False, ["Unreachable node (not connected to start_node): a"])
+
+        flow._check_structure = None  # 命中缓存时不应再次执行校验
+        valid, errors = flow.validate_structure()
+        assert not valid
+        errors.clear()
+        assert flow.validate_structure()[1] == ["Unreachable node (not connected to start_node): a"]
+        del flow._check_structure
+
+        flow.add_dependency("start_node", "a")
+        assert flow.validate_structure() == (True, [])
+        flow.remove_dependency("start_node", "a")
+        assert flow.validate_structure()[0] is False
@@ -220,6 +220,75 @@ class TestDataLoader:
         expected_key = "test_ns::timeseries::cloud_nbr=1001::item_nbr=2001::test_field"
         assert redis_key == expected_key
     
+    def test_redis_key_prefix_order(self, loader):
+        """测试前缀顺序与 "key=value" 字符串的字典序一致（包括key互为前缀和重复key的情况）"""
+        placeholders = {"a": "9", "b": "1"}
+        prefixes = [
+            {"key": "item", "value": "${a}"},
+            {"key": "item1", "value": "${b}"},
+            {"key": "cloud", "value": "x"},
+            {"key": "cloud", "value": "${b}"},
+        ]
+        for case in (prefixes[:3], prefixes):
+            expected_parts = sorted(f"{p['key']}={loader._replace_placeholders(p['value'], placeholders)}" for p in case)
+            redis_key = loader._build_redis_key("ns", "value", case, "f", placeholders)
+            assert redis_key == "ns::value::" + "::".join(expected_parts) + "::f"
+        assert loader._build_redis_key("ns", "value", [], "f", placeholders) == "ns::value::f"
+
+    def test_convert_timeseries_to_dataframe_columns(self, loader):
+        """测试字段一致与字段不一致的时间序列数据都能正确转换为DataFrame"""
+        uniform = [
+            {"timestamp": 2.0, "value": {"ds": "b", "qty": 2}},
+            {"timestamp": 1.0, "value": {"qty": 1, "ds": "a"}},
+        ]
+        df = loader._convert_timeseries_to_dataframe(uniform)
+        assert list(df.columns) == ["ds", "qty"]
+        assert df.to_dict("records") == [{"ds": "a", "qty": 1}, {"ds": "b", "qty": 2}]
+
+        ragged = [
+            {"timestamp": 1.0, "value": {"ds": "a"}},
+            {"timestamp": 2.0, "value": {"ds": "b", "qty": 2}},
+        ]
+        df = loader._convert_timeseries_to_dataframe(ragged)
+        assert list(df.columns) == ["ds", "qty"]
+        assert df["qty"].isna().tolist() == [True, False]
+
+    def test_keep_latest_unique_and_duplicate_timestamps(self, loader):
+        """测试keep_latest：时间戳不重复时原样保留，重复时每个时间戳保留etl_time最新的记录"""
+        unique = [
+            {"timestamp": 1.0, "value": {"etl_time": "2024-01-02", "qty": 1}},
+            {"timestamp": 2.0, "value": {"etl_time": "2024-01-01", "qty": 2}},
+        ]
+        df = loader._convert_timeseries_to_dataframe(unique, "keep_latest")
+        assert df.to_dict("records") == [item["value"] for item in unique]
+
+        duplicated = unique + [{"timestamp": 1.0, "value": {"etl_time": "2024-01-03", "qty": 3}}]
+        df = loader._convert_timeseries_to_dataframe(duplicated, "keep_latest")
+        assert df["qty"].tolist() == [3, 2]
+
+    def test_keep_latest_ignores_missing_etl_time(self, loader):
+        """测试keep_latest：重复时间戳中缺少etl_time的记录不会覆盖etl_time有效的记录"""
+        duplicated = [
+            {"timestamp": 1.0, "value": {"etl_time": "2024-01-02", "qty": 1}},
+            {"timestamp": 1.0, "value": {"etl_time": "2024-01-03", "qty": 2}},
+            {"timestamp": 1.0, "value": {"etl_time": None, "qty": 3}},
+            {"timestamp": 2.0, "value": {"qty": 4}},
+            {"timestamp": 2.0, "value": {"etl_time": "2024-01-01", "qty": 5}},
+        ]
+        df = loader._convert_timeseries_to_dataframe(duplicated, "keep_latest")
+        assert df["qty"].tolist() == [2, 5]
+
+    def test_densets_keep_latest_ignores_missing_etl_time(self, loader):
+        """测试densets的keep_latest：etl_time为空(nan)的记录不会覆盖etl_time有效的记录"""
+        duplicated = [
+            {"timestamp": 1.0, "value": "a,20240103"},
+            {"timestamp": 1.0, "value": "b,nan"},
+            {"timestamp": 2.0, "value": "c,nan"},
+            {"timestamp": 2.0, "value": "d,20240101"},
+        ]
+        df = loader._convert_densets_to_dataframe(duplicated, "keep_latest", ",", "name:string,etl_time:double")
+        assert df["name"].tolist() == ["a", "d"]
+
     def test_placeholder_replacement(self, loader):
         """测试占位符替换"""
         placeholders = {"name": "test", "value": "123"}
@@ -231,6 +300,24 @@ class TestDataLoader:
         # 测试缺少占位符
         with pytest.raises(ValueError, match="占位符 'missing' 未找到"):
             loader._replace_placeholders("${name}_${missing}", placeholders)
+
+    def test_placeholder_replacement_with_date_expressions(self, loader):
+        """测试占位符与日期表达式混合替换"""
+        placeholders = {"store": "S1", "day": "${yyyyMMdd-1d}"}
+
+        result = loader._replace_placeholders("${store}_${yyyy-MM-dd}_${store}", placeholders, "2024-01-15")
+        assert result == "S1_2024-01-15_S1"
+
+        # 占位符的值中包含的日期表达式同样会被解析
+        assert loader._replace_placeholders("d=${day}", placeholders, "2024-01-15") == "d=20240114"
+        assert loader._replace_placeholders("plain", placeholders) == "plain"
+
+        # 模板中的日期表达式与占位符值中的日期表达式同时存在
+        result = loader._replace_placeholders("${yyyy-MM-dd HH:mm:ss+2H}|${day}", placeholders, "2024-01-15 10:30:00")
+        assert result == "2024-01-15 12:30:00|20240114"
+        # 不合法的日期偏移按普通占位符处理
+        with pytest.raises(ValueError, match="占位符 'yyyy-MM-dd\\+1x' 未找到"):
+            loader._replace_placeholders("${yyyy-MM-dd+1x}", placeholders, "2024-01-15")
     
     def test_load_simple_variable_value(self, connector, loader):
         """测试加载简单变量（value类型）"""
@@ -549,7 +636,111 @@ class TestDataLoader:
             expected_columns = ["ds", "etl_time", "id1", "id2", "id3"]
             assert all(col in data["same_city_forecast"].columns for col in expected_columns)
 
+    def test_concurrent_load_matches_sequential(self, connector, loader):
+        """测试并发加载变量的结果与逐个加载一致，且保持配置中的变量顺序"""
+        self.setup_demo_data(connector)
+        data_config = self.get_demo_config()
+        data_config["variable"].append({
+            "name": "missing",
+            "namespace": None,
+            "redis_config": {"prefix": [], "field": "missing", "type": "value"}
+        })
+        placeholders = {"cloud_nbr": "1001", "item_nbr": "2001", "biz_date": "2024-01-15"}
+        job_datetime = "2024-01-15 10:30:00"
+
+        concurrent_loader = DataLoader(connector, max_workers=4)
+        for load in ("load_data", "load_data_batch"):
+            expected = getattr(loader, load)(data_config, placeholders, job_datetime)
+            actual = getattr(concurrent_loader, load)(data_config, placeholders, job_datetime)
+
+            assert list(actual) == ["df_quantity", "city_cn", "same_city_forecast", "missing"]
+            assert actual["city_cn"] == expected["city_cn"] == "深圳"
+            assert actual["missing"] is None
+            pd.testing.assert_frame_equal(actual["df_quantity"], expected["df_quantity"])
+            pd.testing.assert_frame_equal(actual["same_city_forecast"], expected["same_city_forecast"])
+
+    def test_load_data_prefetches_timeseries(self, connector, loader):
+        """测试load_data通过pipeline预取多个时间序列，结果与逐个查询一致"""
+        self.setup_demo_data(connector)
+        data_config = self.get_demo_config()
+        placeholders = {"cloud_nbr": "1001", "item_nbr": "2001", "biz_date": "2024-01-15"}
+        job_datetime = "2024-01-15 10:30:00"
+
+        queries = [
+            ("sams_demand_forecast", "cloud_nbr=1001::item_nbr=2001::order_quantity", None, None),
+            ("sams_demand_forecast", "cloud_nbr=1001::job_date=2024-01-01::same_city_forecast", 1704067200.0, None),
+            ("sams_demand_forecast", "missing", None, None),
+        ]
+        assert connector.get_timeseries_range_batch(queries) == [
+            connector.get_timeseries_range(namespace, key, start_time=start, end_time=end)
+            for namespace, key, start, end in queries
+        ]
+
+        result = loader.load_data(data_config, placeholders, job_datetime)
+        for variable_config in data_config["variable"]:
+            if variable_config["redis_config"]["type"] == "timeseries":
+                expected = loader._load_timeseries(variable_config, data_config["namespace"], placeholders, job_datetime)
+                pd.testing.assert_frame_equal(result[variable_config["name"]], expected)
+
+    def test_batch_get_data_single_mget(self, connector, loader, monkeypatch):
+        """测试跨命名空间的value和json变量只通过一次MGET批量获取"""
+        connector.store_direct_variable("ns_a", "k=1::v", "a")
+        connector.store_json_variable("ns_b", "k=1::j", {"b": 1})
+        variables = [
+            {"name": "v", "namespace": "ns_a", "redis_config": {"prefix": [{"key": "k", "value": "1"}], "field": "v", "type": "value"}},
+            {"name": "j", "namespace": "ns_b", "redis_config": {"prefix": [{"key": "k", "value": "1"}], "field": "j", "type": "json"}},
+            {"name": "missing", "namespace": "ns_b", "redis_config": {"prefix": [], "field": "missing", "type": "value"}},
+        ]
+        shared = {"name": "v_copy", "namespace": "ns_a", "redis_config": dict(variables[0]["redis_config"])}
+        redis_keys, variable_keys = loader._collect_batch_keys({"namespace": "ns_a", "variable": variables + [shared]}, {}, "2024-01-15")
+        assert [variable_keys[id(variable)] for variable in variables] == redis_keys
+        assert variable_keys[id(shared)] == redis_keys[0]
+
+        calls = []
+        mget = connector.redis_client.mget
+        monkeypatch.setattr(connector.redis_client, "mget", lambda keys: calls.append(keys) or mget(keys))
+        batch_results = loader._batch_get_data(redis_keys)
+
+        assert calls == [redis_keys]
+        assert batch_results == {
+            "ns_a::value::k=1::v": "a",
+            "ns_b::json::k=1::j": '{"b": 1}',
+            "ns_b::value::missing": None,
+        }
+
+    def test_load_data_batch_builds_keys_once(self, connector, loader, monkeypatch):
+        """测试批量加载时value/json变量的键名只在收集批量键时构建一次"""
+        self.setup_demo_data(connector)
+        data_config = self.get_demo_config()
+        data_config["variable"] = [v for v in data_config["variable"] if v["redis_config"]["type"] == "value"]
+        placeholders = {"cloud_nbr": "1001", "item_nbr": "2001", "biz_date": "2024-01-15"}
+
+        built = []
+        build_redis_key = loader._build_redis_key
+        monkeypatch.setattr(loader, "_build_redis_key", lambda *args: built.append(args) or build_redis_key(*args))
+        result = loader.load_data_batch(data_config, placeholders, "2024-01-15 10:30:00")
+
+        assert result == {"city_cn": "深圳"}
+        assert len(built) == 1
+
+    def test_load_results_logged_once(self, connector, loader, caplog):
+        """测试加载结果汇总后各记录一条日志，批量加载中不存在的变量置为None"""
+        connector.store_direct_variable("ns", "a", "1")
+        data_config = {"namespace": "ns", "variable": [
+            {"name": name, "redis_config": {"prefix": [], "field": name, "type": "value"}}
+            for name in ("a", "missing")
+        ]}
+
+        with caplog.at_level("INFO", logger="DataLoader"):
+            result = loader.load_data_batch(data_config, {}, "2024-01-15")
+
+        assert result == {"a": "1", "missing": None}
+        assert [(r.levelname, r.getMessage()) for r in caplog.records] == [
+            ("INFO", "成功批量加载变量: a"),
+            ("ERROR", "批量加载变量失败: missing, 错误: \"变量 'missing' 在Redis中不存在\""),
+        ]
+
 
 if __name__ == "__main__":
     print("🧪 运行DataLoader测试")
-    pytest.main([__file__, "-v"]) 
\ No newline at end of file
+    pytest.main([__file__, "-v"])
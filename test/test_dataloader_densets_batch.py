@@ -420,6 +420,50 @@ class TestDataLoaderDensetsBatch:
         pd.testing.assert_frame_equal(result1["fcst_data"], result2["fcst_data"])
         print("✅ load_data 和 load_data_batch densets 读取一致性测试通过")
 
+    def test_batch_range_queries_pipelined(self, connector, loader, monkeypatch):
+        """测试批量加载时时间序列和densets的范围查询通过一个pipeline完成，结果与逐个查询一致"""
+        connector.clear_all()
+        namespace = "test_pipeline"
+        for i in range(3):
+            timestamp = (datetime(2024, 1, 1) + timedelta(days=i)).timestamp()
+            connector.add_densets_point(namespace, "k=1::rows", timestamp, f"{i},2024-01-0{i + 1} 10:00:00")
+            connector.add_timeseries_point(namespace, "k=1::points", timestamp, {"v": i, "etl_time": "2024-01-01"})
+        prefix = [{"key": "k", "value": "${k}"}]
+        data_config = {
+            "namespace": namespace,
+            "variable": [
+                {"name": "rows", "redis_config": {"prefix": prefix, "field": "rows", "type": "densets",
+                                                  "from_datetime": "${yyyy-MM-dd-30d}", "schema": "v:int,etl_time:string"}},
+                {"name": "points", "redis_config": {"prefix": prefix, "field": "points", "type": "timeseries",
+                                                    "to_datetime": "${yyyy-MM-dd}"}},
+            ]
+        }
+        placeholders = {"k": "1"}
+        job_datetime = "2024-01-10 10:00:00"
+
+        queries = [("densets", namespace, "k=1::rows", None, None), ("timeseries", namespace, "k=1::points", 0, None)]
+        assert connector.pipeline_range_queries(queries) == [
+            connector.get_densets_range(namespace, "k=1::rows"),
+            connector.get_timeseries_range(namespace, "k=1::points", start_time=0),
+        ]
+
+        expected = {}
+        for variable_config in data_config["variable"]:
+            expected[variable_config["name"]] = loader._load_variable(variable_config, namespace, placeholders, job_datetime)
+
+        calls = []
+        pipeline_range_queries = connector.pipeline_range_queries
+        monkeypatch.setattr(connector, "pipeline_range_queries", lambda queries: calls.append(queries) or pipeline_range_queries(queries))
+        monkeypatch.setattr(connector, "get_densets_range", None)
+        monkeypatch.setattr(connector, "get_timeseries_range", None)
+        result = loader.load_data_batch(data_config, placeholders, job_datetime)
+
+        assert len(calls) == 1
+        assert list(result) == ["rows", "points"]
+        for name, df in expected.items():
+            assert len(df) == 3
+            pd.testing.assert_frame_equal(result[name], df)
+
 
 if __name__ == "__main__":
     print("🧪 运行 DataLoader densets 批量加载测试")
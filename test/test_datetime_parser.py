@@ -76,6 +76,14 @@ def test_edge_cases():
     
     print("✅ 边界情况测试通过")
 
+def test_datetime_parser_without_template():
+    """测试不含 ${ 的字符串原样返回"""
+    base_datetime = datetime(2025, 7, 1, 10, 0, 0)
+    text = "2025-07-01 10:00:00"
+    assert parse_datetime(text, base_datetime=base_datetime) is text
+    assert parse_datetime("") == ""
+    assert parse_datetime("$yyyyMMdd", base_datetime=base_datetime) == "$yyyyMMdd"
+
 def test_parse_datetime_to_timestamp():
     """测试parse_datetime_to_timestamp函数"""
     print("🧪 测试parse_datetime_to_timestamp函数")
@@ -132,6 +140,52 @@ def test_parse_datetime_to_timestamp():
             print(f"错误: {e}")
             print()
 
+@pytest.mark.parametrize("job_date, expected", [
+    ("2024-01-15", datetime(2024, 1, 15)),
+    ("2024-01-15 10:30:00", datetime(2024, 1, 15, 10, 30, 0)),
+    ("2024-1-5", datetime(2024, 1, 5)),
+])
+def test_parse_job_date(job_date, expected):
+    """测试job_date解析：标准格式走快速路径，未补零的写法仍可解析"""
+    from core.nodes import parse_job_date
+    from data.dataloader import parse_job_datetime
+    assert parse_job_date(job_date) == expected
+    assert parse_job_datetime(job_date) == expected
+
+
+@pytest.mark.parametrize("job_date", ["2024-W03-1", "2024-01-15T10:30:00", "2024-01-15 10:30+01", "20240115"])
+def test_parse_job_date_rejects_other_iso_formats(job_date):
+    """测试fromisoformat能接受但原格式不支持的写法仍然报错"""
+    from core.nodes import parse_job_date
+    from data.dataloader import parse_job_datetime
+    with pytest.raises(ValueError, match="不支持的日期格式"):
+        parse_job_date(job_date)
+    with pytest.raises(ValueError, match="不支持的日期格式"):
+        parse_job_datetime(job_date)
+
+
+def test_parse_dynamic_parameters_without_template(capsys):
+    """测试不含 ${ 的文本直接原样返回，不解析日期也不替换占位符"""
+    from core.nodes import parse_dynamic_parameters
+    text = "x = store_nbr + 1"
+    assert parse_dynamic_parameters(text, "not-a-date", {"store_nbr": 1}) is text
+    assert capsys.readouterr().out == ""
+    assert parse_dynamic_parameters("s = '${store_nbr}_${yyyyMMdd}'", "2024-01-15", {"store_nbr": 1}) == "s = '1_20240115'"
+
+
+def test_parse_job_datetime_cached():
+    """测试作业时间字符串只解析一次，重复解析返回同一对象，非法格式仍然报错"""
+    from data.dataloader import parse_job_datetime
+    first = parse_job_datetime("2024-01-15 10:30:00")
+    assert first == datetime(2024, 1, 15, 10, 30)
+    assert parse_job_datetime("2024-01-15 10:30:00") is first
+    assert parse_job_datetime(first) is first
+    assert parse_job_datetime("2024-01-15") == datetime(2024, 1, 15)
+    for _ in range(2):
+        with pytest.raises(ValueError, match="不支持的日期格式"):
+            parse_job_datetime("2024/01/15")
+
+
 if __name__ == "__main__":
     print("🧪 测试日期时间解析功能")
     print("=" * 50)
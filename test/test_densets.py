@@ -4,6 +4,7 @@
 测试densets数据类型功能
 """
 
+import pytest
 import pandas as pd
 import sys
 import os
@@ -443,6 +444,86 @@ def test_densets_schema_order():
     print("✅ 测试数据已清理")
 
 
+def test_densets_column_type_conversion():
+    """测试densets按列转换类型：多余的值忽略，布尔值不区分大小写，转换失败时报告具体的值"""
+    loader = DataLoader(None)
+    schema = "name:string,qty:int,price:double,active:boolean"
+    densets_data = [
+        {"timestamp": 2.0, "value": "b,2,2.5,OFF,extra,more"},
+        {"timestamp": 1.0, "value": "a,1,1.5,Yes"},
+    ]
+
+    df = loader._convert_densets_to_dataframe(densets_data, "none", ",", schema)
+
+    assert list(df.columns) == ["name", "qty", "price", "active"]
+    assert df.to_dict("records") == [
+        {"name": "a", "qty": 1, "price": 1.5, "active": True},
+        {"name": "b", "qty": 2, "price": 2.5, "active": False},
+    ]
+
+    for value, message in [("c,x,1.0,true", "无法将值 'x' 转换为 int 类型"),
+                           ("c,1,1.0,maybe", "无法将值 'maybe' 转换为 boolean 类型"),
+                           ("c,1", "数据值数量不足")]:
+        with pytest.raises(ValueError, match=message):
+            loader._convert_densets_to_dataframe(densets_data + [{"timestamp": 3.0, "value": value}], "none", ",", schema)
+
+
+
+def test_densets_schema_parse_cached():
+    """测试相同的schema字符串只解析一次，返回同一个不可变对象，格式错误仍然报错"""
+    loader = DataLoader(None)
+    schema = "job_date:string, fcst_qty:double"
+
+    columns = loader._parse_schema_string(schema)
+    assert columns == (("job_date", "string"), ("fcst_qty", "double"))
+    assert loader._parse_schema_string(schema) is columns
+    assert DataLoader(None)._parse_schema_string(schema) is columns
+    assert loader._parse_schema_string("  ") == ()
+
+    for bad_schema, message in [("job_date", "列定义格式错误"), ("qty:float", "不支持的类型")]:
+        for _ in range(2):
+            with pytest.raises(ValueError, match=message):
+                loader._parse_schema_string(bad_schema)
+
+
+def test_densets_numeric_columns_parsed_in_bulk():
+    """测试数值列整列解析为int64/float64，超出int64范围的整数回退为Python int"""
+    loader = DataLoader(None)
+    densets_data = [{"timestamp": 1.0, "value": "1, 1.5"}, {"timestamp": 2.0, "value": "2,nan"}]
+
+    df = loader._convert_densets_to_dataframe(densets_data, "none", ",", "qty:int,price:double")
+    assert df["qty"].dtype == "int64" and df["price"].dtype == "float64"
+    assert df["qty"].tolist() == [1, 2]
+    assert df["price"].iloc[0] == 1.5 and pd.isna(df["price"].iloc[1])
+
+    big = loader._convert_column_type(("99999999999999999999", "1"), "int")
+    assert big == [99999999999999999999, 1]
+
+
+@pytest.mark.parametrize("value, target_type, expected", [
+    ("abc", "string", "abc"),
+    ("42", "int", 42),
+    ("1.5", "double", 1.5),
+    ("Yes", "boolean", True),
+    ("off", "boolean", False),
+])
+def test_convert_value_type(value, target_type, expected):
+    """测试单个值按目标类型分派转换"""
+    result = DataLoader(None)._convert_value_type(value, target_type)
+    assert result == expected and type(result) is type(expected)
+
+
+@pytest.mark.parametrize("value, target_type, message", [
+    ("1.5", "int", "无法将值 '1.5' 转换为 int 类型"),
+    ("abc", "double", "无法将值 'abc' 转换为 double 类型"),
+    ("maybe", "boolean", "无法将值 'maybe' 转换为 boolean 类型"),
+    ("1", "float", "不支持的类型: float"),
+])
+def test_convert_value_type_errors(value, target_type, message):
+    """测试转换失败和不支持的类型给出原有的错误信息"""
+    with pytest.raises(ValueError, match=message):
+        DataLoader(None)._convert_value_type(value, target_type)
+
 if __name__ == "__main__":
     test_densets_functionality()
     test_densets_without_columns()
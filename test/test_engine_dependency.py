@@ -174,6 +174,85 @@ class TestEngineDependency:
         assert "gate1" in engine.get_node_dependencies("collection1")
         assert "collection1" in engine.get_node_dependencies("output")
 
+    def test_getters_return_read_only_views(self):
+        """测试上下文/占位符/节点getter返回只读视图"""
+        engine = RuleEngine("test_engine")
+        logic1 = LogicNode("logic1", "x = 1")
+        engine.add_dependency(None, logic1)
+        engine.execute(job_date="2024-01-01", placeholders={"store": "S1"})
+
+        context = engine.get_context()
+        assert context["store"] == "S1"
+        with pytest.raises(TypeError):
+            context["store"] = "S2"
+
+        assert engine.get_placeholders() == {"store": "S1"}
+        assert dict(engine.get_all_nodes())["logic1"] is logic1
+        with pytest.raises(TypeError):
+            engine.get_all_nodes()["logic2"] = LogicNode("logic2")
+
+    def test_execute_replaces_node_inputs(self):
+        """测试每次执行都会整体替换节点输入，且不包含全局上下文"""
+        engine = RuleEngine("test_engine")
+        logic1 = LogicNode("logic1", "x = 1")
+        logic2 = LogicNode("logic2", "y = 2")
+        engine.add_dependency(None, logic1)
+        engine.add_dependency(logic1, logic2)
+        logic2.add_input("stale", 0)
+
+        engine.execute(job_date="2024-01-01", placeholders={"store": "S1"})
+
+        assert logic2.inputs == {"__node_logic1": logic1}
+
+    def test_execute_discards_stale_results(self):
+        """测试每次执行只保留本次执行节点的结果"""
+        engine = RuleEngine("test_engine")
+        logic1 = LogicNode("logic1", "x = 1")
+        logic2 = LogicNode("logic2", "y = 2")
+        engine.add_dependency(None, logic1)
+        engine.add_dependency(logic1, logic2)
+        engine.execute()
+
+        engine.data_flow.remove_node("logic2")
+        results = engine.execute()
+
+        assert list(results) == ["start_node", "logic1"]
+        assert engine.get_execution_summary()["successful_nodes"] == 2
+
+    def test_interrupted_execute_keeps_only_finished_results(self):
+        """测试执行被中断时结果中只有已完成的节点，结果字典在多次执行间复用"""
+        engine = RuleEngine("test_engine")
+        logic1 = LogicNode("logic1", "x = 1")
+        logic2 = LogicNode("logic2", "raise KeyboardInterrupt")
+        logic3 = LogicNode("logic3", "z = 3")
+        engine.add_dependency(None, logic1)
+        engine.add_dependency(logic1, logic2)
+        engine.add_dependency(logic2, logic3)
+        first = engine.execution_results
+
+        with pytest.raises(KeyboardInterrupt):
+            engine.execute()
+
+        assert engine.execution_results is first
+        assert list(first) == ["start_node", "logic1"]
+        assert engine.get_execution_summary()["successful_nodes"] == 2
+        assert set(engine.get_final_outputs()) == {"start_node", "logic1"}
+
+    def test_context_dynamic_parameters_resolved_once(self):
+        """测试上下文中含动态参数的字符串在执行开始时解析，所有节点可见解析后的值"""
+        engine = RuleEngine("test_engine")
+        logic = LogicNode("logic1", "d = day")
+        logic.set_tracked_variables(["d"])
+        gate = GateNode("gate1", "day == '2024-01-01'")
+        engine.add_dependency(None, logic)
+        engine.add_dependency(logic, gate)
+
+        results = engine.execute(job_date="2024-01-02", variables={"day": "${yyyy-MM-dd-1d}"})
+
+        assert results["logic1"].data["d"] == "2024-01-01"
+        assert results["gate1"].data["should_continue"] is True
+        assert engine.get_context()["day"] == "2024-01-01"
+
 
 if __name__ == '__main__':
     pytest.main([__file__]) 
\ No newline at end of file
@@ -39,10 +39,10 @@ final_result = result + z
     assert "y" in flow_context1
     assert "result" in flow_context1
     
-    x_value, x_node, x_time = flow_context1["x"]
+    x_value, x_node, x_version = flow_context1["x"]
     assert x_value == 10
     assert x_node == "logic1"
-    assert isinstance(x_time, datetime)
+    assert isinstance(x_version, int)
     
     # 验证logic2的flow_context
     flow_context2 = engine.get_node_flow_context("logic2")
@@ -582,4 +582,141 @@ def test_flow_context_json_serialization_success():
         except ValueError as e:
             assert False, f"数据类型 {type(value)} 应该可以序列化，但抛出了异常: {e}"
 
- 
\ No newline at end of file
+ 
+def test_flow_context_serialization_check_without_dumps():
+    """测试结构化校验接受常见嵌套结构，并对非基础类型做与json.dumps一致的判断"""
+    import numpy as np
+    import pandas as pd
+
+    test_node = LogicNode("test_node")
+    shared = [1, 2]
+    accepted = {
+        "nested": {"a": [1, 2.5, None, True, ("x", {"b": "c"})], 1: "int_key"},
+        "shared": [shared, shared],
+        "dataframe": pd.DataFrame({"v": [1, 2]}),
+        "timestamp": pd.Timestamp("2024-01-01"),
+        "numpy_scalar": np.int64(3),
+    }
+    for var_name, value in accepted.items():
+        test_node.update_flow_context(var_name, value)
+        assert var_name in test_node.get_flow_context()
+
+    with pytest.raises(ValueError, match="无法序列化为JSON"):
+        test_node.update_flow_context("bad_key", {(1, 2): "tuple_key"})
+    with pytest.raises(ValueError, match="无法序列化为JSON"):
+        test_node.update_flow_context("bad_frame", pd.DataFrame({"v": [object()]}))
+
+def test_flow_context_rejects_non_plain_dataframes():
+    """测试无object列但含timedelta列或不可序列化行标签的DataFrame仍按json.dumps判定为不可序列化"""
+    import pandas as pd
+
+    test_node = LogicNode("test_node")
+    test_node.update_flow_context("dates", pd.DataFrame({"d": pd.to_datetime(["2024-01-01"])}, index=["a"]))
+    with pytest.raises(ValueError, match="无法序列化为JSON"):
+        test_node.update_flow_context("delta", pd.DataFrame({"d": pd.to_timedelta([1, 2], unit="s")}))
+    with pytest.raises(ValueError, match="无法序列化为JSON"):
+        test_node.update_flow_context("bad_index", pd.DataFrame({"v": [1]}, index=pd.Index([object()])))
+
+def test_flow_context_schema_validator_cached():
+    """测试同一schema在多次执行间只解析一次"""
+    engine = RuleEngine("schema_cache_test")
+    logic1 = LogicNode("logic1", "x = 10")
+    logic1.set_tracked_variables(["x"])
+    logic2 = LogicNode("logic2", "y = x + 1")
+    logic2.set_tracked_variables(["y"])
+    logic2.set_expected_input_schema({"x": "int"})
+    engine.add_dependency(None, logic1)
+    engine.add_dependency(logic1, logic2)
+
+    assert engine.execute()["logic2"].data["y"] == 11
+    validator = logic2._validators["int"]
+    assert engine.execute()["logic2"].data["y"] == 11
+    assert logic2._validators == {"int": validator}
+
+def test_flow_context_version_is_monotonic():
+    """测试flow_context使用单调递增的版本号，后写入的值总是生效"""
+    test_node = LogicNode("test_node")
+    for i in range(100):
+        test_node.update_flow_context("x", i, source_node=f"node_{i}")
+
+    value, source, version = test_node.get_flow_context()["x"]
+    assert (value, source) == (99, "node_99")
+    assert isinstance(version, int)
+
+    test_node.update_flow_context("y", 1)
+    assert test_node.get_flow_context()["y"][2] > version
+
+def test_flow_context_merge_only_from_node_inputs():
+    """测试只有__node_开头的输入参与flow_context合并，普通输入数据不参与"""
+    upstream = LogicNode("upstream")
+    upstream.update_flow_context("x", 1)
+    fake = LogicNode("fake")
+    fake.update_flow_context("y", 2)
+
+    downstream = LogicNode("downstream")
+    downstream.add_input("__node_upstream", upstream)
+    downstream.add_input("plain", fake)
+    downstream.merge_flow_context_from_inputs()
+    assert downstream.get_flow_context_values() == {"x": 1}
+
+    downstream.replace_inputs({"plain": upstream})
+    assert downstream._node_inputs == {}
+
+def test_flow_context_merge_without_node_inputs():
+    """测试没有上游节点输入时合并直接返回，已有的flow_context保持不变"""
+    node = LogicNode("node")
+    node.update_flow_context("x", 1)
+    node.add_input("plain", 2)
+    node.merge_flow_context_from_inputs()
+    assert node.get_flow_context_values() == {"x": 1}
+
+def test_flow_context_values_kept_in_sync():
+    """测试变量值视图与flow_context同步更新和清空，返回的是独立副本"""
+    node = LogicNode("node")
+    node.update_flow_context("x", 1)
+    node.update_flow_context("x", 2, source_node="other")
+    node.update_flow_context("y", [1, 2])
+
+    values = node.get_flow_context_values()
+    assert values == {name: value for name, (value, _, _) in node.get_flow_context().items()}
+    values["z"] = 3
+    assert "z" not in node.get_flow_context_values()
+
+    node.clear_flow_context()
+    assert node.get_flow_context_values() == {}
+
+def test_flow_context_template_strings_not_reparsed():
+    """测试上游输出中含${的字符串按原样传递，下游节点执行时不再扫描解析"""
+    engine = RuleEngine("test_engine")
+    upstream = LogicNode("upstream", "template = '$' + '{yyyy-MM-dd}'")
+    upstream.set_tracked_variables(["template"])
+    downstream = LogicNode("downstream", "copied = template")
+    downstream.set_tracked_variables(["copied"])
+    engine.add_dependency(None, upstream)
+    engine.add_dependency(upstream, downstream)
+
+    results = engine.execute(job_date="2024-01-02")
+
+    assert results["downstream"].data["copied"] == "${yyyy-MM-dd}"
+
+def test_collection_node_collects_only_complete_schema():
+    """测试collection节点只收集schema变量全部存在且校验通过的上游节点，值为None也算存在"""
+    complete = LogicNode("complete")
+    complete.update_flow_context("x", 1)
+    complete.update_flow_context("y", None)
+    complete.update_flow_context("extra", "ignored")
+    partial = LogicNode("partial")
+    partial.update_flow_context("x", 2)
+    invalid = LogicNode("invalid")
+    invalid.update_flow_context("x", "not int")
+    invalid.update_flow_context("y", None)
+
+    coll = CollectionNode("coll")
+    coll.set_expected_input_schema({"x": "int", "y": "None"})
+    for node in (complete, partial, invalid):
+        coll.add_input(f"__node_{node.name}", node)
+
+    result = coll.execute({})
+
+    assert result.success
+    assert result.data == {"collected_data": {"complete": {"x": 1, "y": None}}}
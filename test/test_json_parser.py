@@ -0,0 +1,40 @@
+
+import json
+import math
+import pytest
+from utils.json_parser import loads_fast, loads_many
+
+
+@pytest.mark.parametrize("text", [
+    '{"store_nbr": "5086", "city_cn": "福州", "qty": [0.0, 1.5, -2], "ok": true, "none": null}',
+    '{"id": 123456789012345678901234567890, "neg": -9223372036854775809}',
+    '[9223372036854775807, 18446744073709551615, 1e-400, -0.0]',
+    '{"a": 1, "a": 2}',
+    '"\\ud800"',
+    '  [1]  ',
+])
+def test_loads_fast_matches_json(text):
+    """测试解析结果与标准库一致，包括超出64位范围的整数和重复键"""
+    result = loads_fast(text)
+    expected = json.loads(text)
+    assert result == expected
+    assert repr(result) == repr(expected)
+
+
+def test_loads_fast_falls_back_to_json():
+    """测试orjson不接受的写法回退到标准库，错误时抛出标准库的异常"""
+    result = loads_fast('{"a": NaN, "b": Infinity}')
+    assert math.isnan(result["a"]) and result["b"] == float("inf")
+    with pytest.raises(json.JSONDecodeError, match="Expecting value"):
+        loads_fast("hello")
+    with pytest.raises(TypeError):
+        loads_fast(None)
+
+
+def test_loads_many_keeps_invalid_text():
+    """测试批量解析与逐个解析一致，无法解析的文本保留原字符串，超大整数不会变成float"""
+    texts = ['{"qty": 1}', 'not json', '[1', '2]', '{"id": 123456789012345678901234567890}', 'NaN']
+    values = loads_many(texts)
+    assert values[:5] == [{"qty": 1}, 'not json', '[1', '2]', {"id": 123456789012345678901234567890}]
+    assert math.isnan(values[5])
+    assert loads_many([]) == []
@@ -3,15 +3,20 @@
 测试 JSON 序列化和反序列化功能
 """
 
+import enum
 import json
+import re
+import uuid
 import pandas as pd
+import pytest
 import sys
 import os
 
 # 添加项目根目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from core.json_helper import UniversalEncoder, universal_decoder
+import numpy as np
+from core.json_helper import UniversalEncoder, ArrowEncoder, universal_decoder, dumps_fast, ensure_json_serializable
 
 def test_json_serialization():
     """测试 JSON 序列化和反序列化"""
@@ -52,5 +57,66 @@ def test_json_serialization():
     else:
         print("❌ JSON 序列化和反序列化测试失败！")
 
+def test_dumps_fast_round_trip():
+    """测试 dumps_fast 序列化嵌套 DataFrame/Timestamp/NumPy 类型后可以还原"""
+    df = pd.DataFrame({'qty': [1.5, 2.5], 'store': ['S1', 'S2']})
+    data = {
+        "outer": {"inner_df": df, "ts": pd.Timestamp("2024-01-01 10:30:00")},
+        "count": np.int64(3),
+        "ratio": np.float64(0.5),
+        "flag": np.bool_(True),
+    }
+
+    restored = json.loads(dumps_fast(data), object_hook=universal_decoder)
+
+    assert restored["outer"]["inner_df"].equals(df)
+    assert restored["outer"]["ts"] == pd.Timestamp("2024-01-01 10:30:00")
+    assert restored["count"] == 3
+    assert restored["ratio"] == 0.5
+    assert restored["flag"] is True
+
+
+def test_arrow_encoder_round_trip():
+    """测试 ArrowEncoder 以 Feather 格式编码 DataFrame 并可还原"""
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({'qty': np.arange(5, dtype='float64'), 'store': list('abcde')}, index=[3, 4, 5, 6, 7])
+
+    string = json.dumps({"outer": {"df": df}}, cls=ArrowEncoder)
+    assert '"__type__": "DataFrame_arrow"' in string
+
+    restored = json.loads(string, object_hook=universal_decoder)
+    assert restored["outer"]["df"].equals(df)
+
+
+def test_ensure_json_serializable_matches_json_dumps():
+    """测试 ensure_json_serializable 的判定与 json.dumps + UniversalEncoder 一致"""
+    from datetime import datetime
+
+    accepted = [pd.Timestamp("2024-01-01"), np.int64(1), pd.DataFrame({"v": [object]}).astype(str), {"a": [1.5, None]}]
+    for obj in accepted:
+        ensure_json_serializable(obj)
+
+    class Color(enum.Enum):
+        RED = 1
+
+    class Level(enum.IntEnum):
+        HIGH = 2
+
+    ensure_json_serializable({"level": [Level.HIGH]})
+
+    circular = []
+    circular.append(circular)
+    rejected = [
+        datetime(2024, 1, 1), object(), np.array([1, 2]), circular,
+        uuid.uuid4(), {"id": [uuid.uuid4()]}, Color.RED, {"a": {"color": (1, Color.RED)}},
+        pd.DataFrame({"id": [uuid.uuid4()]}),
+    ]
+    for obj in rejected:
+        with pytest.raises((TypeError, ValueError)) as excinfo:
+            json.dumps(obj, cls=UniversalEncoder)
+        with pytest.raises(type(excinfo.value), match=re.escape(str(excinfo.value))):
+            ensure_json_serializable(obj)
+
+
 if __name__ == "__main__":
     test_json_serialization() 
\ No newline at end of file
@@ -3,6 +3,7 @@
 测试Node基类的node_type属性和相关功能
 """
 
+import json
 import pytest
 import sys
 import os
@@ -284,6 +285,13 @@ class TestEngineNodeTypeSupport:
         # 获取执行摘要
         summary = self.engine.get_execution_summary()
         
+        # 检查总体计数
+        assert summary["successful_nodes"] == 3
+        assert summary["failed_nodes"] == 1
+        assert summary["blocked_nodes"] == 0
+        assert summary["failed_nodes_list"] == ["fail_logic"]
+        assert summary["blocked_nodes_list"] == []
+        
         # 检查节点类型统计
         assert "node_types_count" in summary
         type_counts = summary["node_types_count"]
@@ -350,8 +358,9 @@ class TestEngineNodeTypeSupport:
         json_str = self.engine.export_to_json()
         
         # 检查JSON包含node_type
-        assert '"node_type": "logic"' in json_str
-        assert '"node_type": "gate"' in json_str
+        config = json.loads(json_str)
+        assert config["nodes"]["test_logic"]["node_type"] == "logic"
+        assert config["nodes"]["test_gate"]["node_type"] == "gate"
         
         # 导入
         new_engine = RuleEngine.import_from_json(json_str)
@@ -417,6 +426,15 @@ class TestEngineNodeTypeSupport:
         assert result.node_type == "logic"
         assert "test error" in result.error
 
+    def test_nodes_use_slots(self):
+        """测试内置节点与执行结果使用__slots__，不创建实例字典"""
+        for node in (StartNode("s"), LogicNode("l"), GateNode("g"), CollectionNode("c")):
+            assert not hasattr(node, "__dict__")
+        assert not hasattr(NodeResult(success=True), "__dict__")
+
+        with pytest.raises(AttributeError):
+            LogicNode("l").undeclared = 1
+
 
 if __name__ == "__main__":
     pytest.main([__file__]) 
\ No newline at end of file
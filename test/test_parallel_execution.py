@@ -0,0 +1,49 @@
+"""
+测试规则引擎并行执行
+"""
+
+import sys
+from core.engine import RuleEngine
+from core.nodes import LogicNode, GateNode, CollectionNode
+
+
+def _build_fan_out_engine(max_workers):
+    """构建扇出-汇聚结构的引擎：start -> branch_i -> gate -> collection"""
+    engine = RuleEngine("parallel_engine", max_workers=max_workers)
+    collection = CollectionNode("collection", "total = sum(item['value'] for item in collection.values())")
+    collection.set_expected_input_schema({"value": "int"})
+    collection.set_tracked_variables(["total"])
+
+    for i in range(6):
+        branch = LogicNode(f"branch_{i}", f"print('branch {i}')\nvalue = {i} * base")
+        branch.set_tracked_variables(["value"])
+        engine.add_dependency(None, branch)
+        engine.add_dependency(branch, collection)
+
+    gate = GateNode("gate", "base > 100")
+    blocked = LogicNode("blocked", "never = 1")
+    engine.add_dependency(None, gate)
+    engine.add_dependency(gate, blocked)
+    return engine
+
+
+class TestParallelExecution:
+    """测试并行执行与串行执行结果一致"""
+
+    def test_parallel_matches_sequential(self):
+        """测试并行执行结果与串行执行一致，且每个节点只捕获自己的输出"""
+        sequential = _build_fan_out_engine(max_workers=1).execute(variables={"base": 10})
+        stdout_before = sys.stdout
+        parallel = _build_fan_out_engine(max_workers=4).execute(variables={"base": 10})
+
+        assert sys.stdout is stdout_before
+        assert set(parallel) == set(sequential)
+        for name, result in sequential.items():
+            assert parallel[name].success == result.success
+            assert parallel[name].status == result.status
+            assert parallel[name].data == result.data
+
+        assert parallel["collection"].data == {"total": sum(i * 10 for i in range(6))}
+        assert parallel["blocked"].status == "blocked"
+        for i in range(6):
+            assert parallel[f"branch_{i}"].text_output == f"branch {i}\n"
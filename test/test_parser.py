@@ -1,4 +1,7 @@
+import math
+import numpy as np
 import pandas as pd
+import pytest
 import sys
 import os
 
@@ -77,6 +80,109 @@ def test_json_parsing():
         print(f"  字典内容: {result}")
 
 
+
+def test_parse_dataframe_matches_parse_row():
+    """测试整表解析与逐行parse_row结果一致，包括数值列按整表公共类型取值的情况"""
+    parser = Parser()
+    frames = [
+        pd.DataFrame({
+            'Unnamed: 0': [0, 1],
+            'store_nbr': [5086, 5087],
+            'qty': [1.5, float('nan')],
+            'dim_store': ['{"city_cn": "福州"}', 'hello'],
+            'job_date': pd.to_datetime(['2025-08-04', '2025-08-05']),
+        }),
+        pd.DataFrame({'store_nbr': [5086, 5087], 'qty': [1.5, 2.0]}),
+        pd.DataFrame({'job_date': pd.to_datetime(['2025-08-04', None])}),
+        pd.DataFrame({'is_activate': [True, False], 'qty': [float('nan'), 1.0]}),
+        pd.DataFrame({'qty': pd.array([1.5, None], dtype='Float64'), 'item_nbr': pd.array([1, None], dtype='Int64')}),
+    ]
+    for df in frames:
+        expected = [parser.parse_row(row) for _, row in df.iterrows()]
+        result = parser.parse_dataframe(df)
+        assert [{k: repr(v) for k, v in row.items()} for row in result] == \
+               [{k: repr(v) for k, v in row.items()} for row in expected]
+    assert parser.parse_dataframe(frames[1])[0] == {'store_nbr': 5086.0, 'qty': 1.5}
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("00123", 123),
+    ("-0042", -42),
+    ("١٢", 12),
+    (" 1.50 ", 1.5),
+    ("1_000", 1000),
+    ("+5", 5),
+    (".5", 0.5),
+    ("inf", float("inf")),
+    ("Yes", True),
+    ("NO", False),
+    ("²", "²"),
+    ("hello world", "hello world"),
+    ("福州", "福州"),
+    ("", ""),
+])
+def test_try_type_conversion(value, expected):
+    """测试非JSON字符串的数值和布尔转换，普通文本原样返回"""
+    result = Parser()._try_type_conversion(value)
+    assert result == expected and type(result) is type(expected)
+    assert math.isnan(Parser()._try_type_conversion("nan"))
+
+
+@pytest.mark.parametrize("value, expected", [
+    ('{"city_cn": "福州"}', {"city_cn": "福州"}),
+    (' \n[1, 2]', [1, 2]),
+    ("null", None),
+    ("Infinity", float("inf")),
+    ("-5", -5),
+    ("hello world", "hello world"),
+    ("yes", True),
+    ("\u3000{}", "\u3000{}"),
+    ("2025-08-04", "2025-08-04"),
+])
+def test_parse_string_value(value, expected):
+    """测试字符串按JSON、数值、布尔的顺序解析，不像JSON的文本不做JSON解析"""
+    result = Parser()._parse_string_value(value, "test")
+    assert result == expected and type(result) is type(expected)
+
+
+def test_dataframe_json_with_object_records():
+    """测试records直接是JSON对象时与嵌套JSON字符串的结果一致"""
+    parser = Parser()
+    nested = parser._parse_string_value('{"type":"dataframe","records":"{\\"col1\\":[1,2],\\"col2\\":[\\"a\\",\\"b\\"]}","source":"api"}', "test")
+    direct = parser._parse_string_value('{"type":"dataframe","records":{"col1":[1,2],"col2":["a","b"]},"source":"api"}', "test")
+    assert isinstance(direct, pd.DataFrame)
+    pd.testing.assert_frame_equal(direct, nested)
+    inconsistent = '{"type":"dataframe","records":{"col1":[1,2],"col2":["a"]}}'
+    assert parser._parse_string_value(inconsistent, "test") == {"type": "dataframe", "records": {"col1": [1, 2], "col2": ["a"]}}
+
+
+class _Text(str):
+    pass
+
+
+@pytest.mark.parametrize("value, expected", [
+    (np.int64(5), 5),
+    (np.uint8(7), 7),
+    (np.float32(1.5), 1.5),
+    (np.bool_(True), True),
+    (pd.Timestamp("2025-08-04"), "2025-08-04 00:00:00"),
+    (np.datetime64("2025-08-04"), "2025-08-04"),
+    (np.longdouble(2.5), 2.5),
+    (np.float64("nan"), None),
+    (pd.NaT, None),
+    (_Text('{"a": 1}'), {"a": 1}),
+    ("12", 12),
+    (3, 3),
+    (True, True),
+    (1.5, 1.5),
+    (float("nan"), None),
+    (None, None),
+])
+def test_parse_value_scalar_types(value, expected):
+    """测试标量按具体类型查表转换，未列出的子类仍按isinstance判断处理"""
+    result = Parser()._parse_value(value, "test")
+    assert result == expected and type(result) is type(expected)
+
 if __name__ == "__main__":
     test_parser()
     test_json_parsing() 
\ No newline at end of file
@@ -1,7 +1,10 @@
+import contextlib
+import io
 import unittest
 import sys
 import os
 import time
+import numpy as np
 from unittest.mock import patch
 
 # 添加父目录到路径以便导入RedisConnector
@@ -119,6 +122,117 @@ class TestRedisConnector(unittest.TestCase):
         self.assertTrue(ttl_direct > 0)
         self.assertTrue(ttl_direct <= 1800)
     
+    def test_bulk_and_pipelined_store(self):
+        """测试批量存储JSON变量，以及ZADD和设置TTL合并发送后数据和TTL都正确"""
+        items = [("bulk", f"item_{i}", {"index": i}) for i in range(5)]
+        with patch.object(self.connector.redis_client, "pipeline", wraps=self.connector.redis_client.pipeline) as pipeline:
+            self.connector.store_json_variables_bulk(items, ttl=600, batch_size=2)
+        self.assertEqual(pipeline.call_count, 1)
+        for namespace, key, json_values in items:
+            self.assertEqual(self.connector.get_json_variable(namespace, key), json_values)
+            ttl = self.connector.get_ttl(f"{namespace}::json::{key}")
+            self.assertTrue(0 < ttl <= 600)
+        
+        self.connector.add_timeseries_point("bulk", "series", 1.0, {"qty": 1}, ttl=600)
+        self.connector.add_densets_point("bulk", "densets", 1.0, [1, 2], ttl=600)
+        self.assertEqual(self.connector.get_timeseries_range("bulk", "series"), [{"timestamp": 1.0, "value": {"qty": 1}}])
+        self.assertTrue(0 < self.connector.get_ttl("bulk::timeseries::series") <= 600)
+        self.assertTrue(0 < self.connector.get_ttl("bulk::densets::densets") <= 600)
+    
+    def test_bulk_points_match_single_points(self):
+        """测试批量添加时间序列和densets数据点与逐个添加的结果一致，且只发送一次ZADD"""
+        ts_points = [(1.0, {"qty": 1}), (2.0, [1, 2]), (3.0, 5)]
+        ds_points = [(1.0, {"b": 2, "a": 1}), (2.0, [3, 4]), (3.0, {"a": 5})]
+        for timestamp, value in ts_points:
+            self.connector.add_timeseries_point("single", "series", timestamp, value)
+        for timestamp, value in ds_points:
+            self.connector.add_densets_point("single", "densets", timestamp, value, schema="a:int,b:int")
+        
+        with patch.object(redis.client.Pipeline, "zadd", autospec=True, side_effect=redis.client.Pipeline.zadd) as zadd:
+            self.connector.add_timeseries_points_bulk("bulk", "series", ts_points, ttl=600)
+            self.connector.add_densets_points_bulk("bulk", "densets", ds_points, schema="a:int,b:int", ttl=600)
+            self.connector.add_densets_points_bulk("bulk", "empty", [])
+        self.assertEqual(zadd.call_count, 2)
+        
+        self.assertEqual(self.connector.get_timeseries_range("bulk", "series"), self.connector.get_timeseries_range("single", "series"))
+        self.assertEqual(self.connector.get_densets_range("bulk", "densets"), self.connector.get_densets_range("single", "densets"))
+        self.assertEqual([item["value"] for item in self.connector.get_densets_range("bulk", "densets")], ["1,2", "3,4", "5,"])
+        self.assertTrue(0 < self.connector.get_ttl("bulk::densets::densets") <= 600)
+    
+    def test_point_writes_refresh_full_ttl(self):
+        """测试每次写入都在同一个pipeline中用普通EXPIRE把TTL重置为完整的ttl"""
+        with patch.object(redis.client.Pipeline, "expire", autospec=True, side_effect=redis.client.Pipeline.expire) as expire:
+            for i in range(3):
+                self.connector.add_timeseries_point("ttl", "series", float(i), i, ttl=600)
+            self.connector.add_timeseries_point("ttl", "series", 3.0, 3, ttl=900)
+        self.assertEqual([call.args[1:] for call in expire.call_args_list], [("ttl::timeseries::series", 600)] * 3 + [("ttl::timeseries::series", 900)])
+        self.assertTrue(all(not call.kwargs for call in expire.call_args_list))
+        self.assertTrue(600 < self.connector.get_ttl("ttl::timeseries::series") <= 900)
+    
+    def test_rewrite_after_delete_by_other_connector_keeps_ttl(self):
+        """测试键被另一个连接器删除后，在ttl/4内重新写入仍会设置TTL"""
+        other = RedisConnector()
+        self.connector.add_timeseries_point("ttl", "shared", 1.0, 1, ttl=3600)
+        self.connector.add_densets_point("ttl", "shared", 1.0, {"a": 1}, schema="a:int", ttl=3600)
+        self.assertTrue(0 < self.connector.get_ttl("ttl::timeseries::shared") <= 3600)
+        
+        other.delete_key("ttl::timeseries::shared")
+        other.redis_client.delete("ttl::densets::shared")
+        self.connector.add_timeseries_point("ttl", "shared", 2.0, 2, ttl=3600)
+        self.connector.add_densets_point("ttl", "shared", 2.0, {"a": 2}, schema="a:int", ttl=3600)
+        self.assertTrue(0 < self.connector.get_ttl("ttl::timeseries::shared") <= 3600)
+        self.assertTrue(0 < self.connector.get_ttl("ttl::densets::shared") <= 3600)
+    
+    def test_densets_columns_bulk_matches_points(self):
+        """测试按列批量添加densets与逐行字典添加的结果一致，schema中缺少的列写为空字符串"""
+        timestamps = np.array([1.0, 2.0, 3.0])
+        columns = {"qty": np.array([1, 2, 3]), "price": np.array([0.1, 2.5, 1e16]), "name": ["a", "b", None]}
+        rows = [{name: column[i] for name, column in columns.items()} for i in range(3)]
+        self.connector.add_densets_points_bulk("rows", "densets", list(zip(timestamps.tolist(), rows)), schema="name:string,qty:int,price:double,memo:string")
+        self.connector.add_densets_columns_bulk("cols", "densets", timestamps, columns, schema="name:string,qty:int,price:double,memo:string", ttl=600)
+        self.connector.add_densets_columns_bulk("cols", "noschema", [1.0, 2.0], {"x": [1, 2.5], "y": np.array([True, False])})
+        self.connector.add_densets_columns_bulk("cols", "empty", [], {})
+        
+        self.assertEqual(self.connector.get_densets_range("cols", "densets"), self.connector.get_densets_range("rows", "densets"))
+        self.assertEqual([item["value"] for item in self.connector.get_densets_range("cols", "densets")], ["a,1,0.1,", "b,2,2.5,", "None,3,1e+16,"])
+        self.assertEqual([item["value"] for item in self.connector.get_densets_range("cols", "noschema")], ["1,True", "2.5,False"])
+        self.assertTrue(0 < self.connector.get_ttl("cols::densets::densets") <= 600)
+        with self.assertRaises(ValueError):
+            self.connector.add_densets_columns_bulk("cols", "bad", [1.0, 2.0], {"x": [1]})
+    
+    def test_timeseries_arrow_matches_range(self):
+        """测试列式结果与get_timeseries_range的时间戳和原始值一致"""
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            self.skipTest("pyarrow未安装")
+        points = [(3.0, {"qty": 3}), (1.0, {"qty": 1}), (2.0, "text")]
+        self.connector.add_timeseries_points_bulk("arrow", "series", points)
+        
+        table = self.connector.get_timeseries_arrow("arrow", "series", start_time=1.5)
+        self.assertEqual(table.column_names, ["timestamp", "value"])
+        self.assertEqual(table.column("timestamp").to_pylist(), [2.0, 3.0])
+        self.assertEqual(table.column("value").to_pylist(), ['{"value": "text"}', '{"qty": 3}'])
+        self.assertEqual(self.connector.get_timeseries_arrow("arrow", "missing").num_rows, 0)
+    
+    def test_densets_schema_parse_cached(self):
+        """测试写入densets时schema只解析一次，未写类型的列默认为string"""
+        columns = self.connector._parse_schema_string("a:int, b")
+        self.assertEqual(columns, (("a", "int"), ("b", "string")))
+        self.assertIs(self.connector._parse_schema_string("a:int, b"), columns)
+        self.assertEqual(self.connector._parse_schema_string(""), ())
+        self.assertEqual(self.connector._serialize_densets_value({"b": "x", "c": 1}, "a:int, b"), ",x")
+    
+    def test_store_logs_instead_of_printing(self):
+        """测试存储操作不向标准输出打印，只记录DEBUG日志"""
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout), self.assertLogs("RedisConnector", level="DEBUG") as logs:
+            self.connector.store_json_variable("test", "quiet", {"a": 1})
+            self.connector.add_densets_point("test", "quiet", 1.0, {"a": 1}, schema="a:int")
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertEqual([record.levelname for record in logs.records], ["DEBUG", "DEBUG"])
+        self.assertEqual(logs.records[1].getMessage(), "densets数据点已添加: test::densets::quiet @ 1.0, schema: a:int")
+    
     def test_utility_functions(self):
         """测试工具函数"""
         # 存储一些测试数据
@@ -148,6 +262,15 @@ class TestRedisConnector(unittest.TestCase):
             updated_keys = self.connector.list_keys("user::*")
             self.assertEqual(len(updated_keys), len(user_keys) - 1)
     
+    def test_list_keys_scans_all_batches(self):
+        """测试list_keys分批SCAN后返回与KEYS相同的键集合，且没有重复"""
+        for i in range(1500):
+            self.connector.store_direct_variable("scan", f"key_{i}", i)
+        keys = self.connector.list_keys("scan::*")
+        self.assertEqual(len(keys), len(set(keys)))
+        self.assertEqual(set(keys), set(self.connector.redis_client.keys("scan::*")))
+        self.assertEqual(len(keys), 1500)
+    
     def test_error_handling(self):
         """测试错误处理"""
         # 测试获取不存在的JSON变量
@@ -371,6 +494,18 @@ class TestRedisConnectorConnection(unittest.TestCase):
         except redis.ConnectionError:
             self.skipTest("Redis服务器未运行")
     
+    def test_connection_pool_shared(self):
+        """测试同一服务器的连接器共享连接池，不同db使用各自的连接池"""
+        try:
+            first = RedisConnector()
+            second = RedisConnector()
+            other_db = RedisConnector(db=1)
+        except redis.ConnectionError:
+            self.skipTest("Redis服务器未运行")
+        self.assertIs(first.redis_client.connection_pool, second.redis_client.connection_pool)
+        self.assertIsNot(first.redis_client.connection_pool, other_db.redis_client.connection_pool)
+        self.assertEqual(other_db.redis_client.connection_pool.connection_kwargs["db"], 1)
+    
     @patch('redis.Redis')
     def test_connection_failure(self, mock_redis):
         """测试连接失败"""
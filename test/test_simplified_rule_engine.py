@@ -4,6 +4,7 @@
 """
 
 import unittest
+import tempfile
 import sys
 import os
 import pandas as pd
@@ -334,6 +335,22 @@ class TestSimplifiedRuleEngine(unittest.TestCase):
         assert results["logic2"].success
         assert results["logic2"].data["result"] == 1.0
 
+    def test_save_load_file(self):
+        """测试保存到文件并重新加载"""
+        logic1 = LogicNode("logic1")
+        logic1.set_logic("# 计算趋势\ntrend = 0.5")
+        logic1.set_tracked_variables(["trend"])
+        self.engine.add_dependency(None, logic1)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "engine.json")
+            self.engine.save_to_file(file_path)
+            new_engine = RuleEngine.load_from_file(file_path)
+
+        assert new_engine.get_node("logic1").logic_code == "# 计算趋势\ntrend = 0.5"
+        results = new_engine.execute()
+        assert results["logic1"].data["trend"] == 0.5
+
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
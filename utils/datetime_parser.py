@@ -6,49 +6,64 @@ from datetime import datetime, timedelta
 from typing import Tuple
 
 
+# 支持的日期时间模式，模块加载时编译一次
+_DATETIME_PATTERNS = [(re.compile(regex), config) for regex, config in {
+    # 简单模式
+    r'\$\{yyyy([+-]\d+y)?\}': {'format': '%Y', 'units': {'y': 'years'}},
+    r'\$\{MM([+-]\d+M)?\}': {'format': '%m', 'units': {'M': 'months'}},
+    r'\$\{dd([+-]\d+d)?\}': {'format': '%d', 'units': {'d': 'days'}},
+    r'\$\{HH([+-]\d+H)?\}': {'format': '%H', 'units': {'H': 'hours'}},
+    r'\$\{mm([+-]\d+m)?\}': {'format': '%M', 'units': {'m': 'minutes'}},
+    r'\$\{ss([+-]\d+s)?\}': {'format': '%S', 'units': {'s': 'seconds'}},
+    # 复杂模式
+    r'\$\{yyyyMMdd([+-]\d+[yMwd])?\}': {
+        'format': '%Y%m%d',
+        'units': {'y': 'years', 'M': 'months', 'w': 'weeks', 'd': 'days'}
+    },
+    r'\$\{yyyy-MM-dd([+-]\d+[yMwd])?\}': {
+        'format': '%Y-%m-%d',
+        'units': {'y': 'years', 'M': 'months', 'w': 'weeks', 'd': 'days'}
+    },
+    r'\$\{yyyyMMddHHmmss([+-]\d+[yMwHmd])?\}': {
+        'format': '%Y%m%d%H%M%S',
+        'units': {'y': 'years', 'M': 'months', 'w': 'weeks', 'H': 'hours', 'm': 'minutes', 'd': 'days'}
+    },
+    r'\$\{yyyy-MM-dd HH:mm:ss([+-]\d+[yMwHmd])?\}': {
+        'format': '%Y-%m-%d %H:%M:%S',
+        'units': {'y': 'years', 'M': 'months', 'w': 'weeks', 'H': 'hours', 'm': 'minutes', 'd': 'days'}
+    }
+}.items()]
+_OFFSET_RE = re.compile(r'([+-])(\d+)([yMwdHms])')
+_TEMPLATE_RE = re.compile(r'\$\{[^}]+\}')
+
+
+def is_standard_job_datetime(text: str) -> bool:
+    """判断是否为补零的 'YYYY-MM-DD' 或 'YYYY-MM-DD HH:MM:SS'，满足时可用fromisoformat快速解析，避免其接受其他ISO写法"""
+    length = len(text)
+    if length != 10 and not (length == 19 and text[10] == ' ' and text[13] == ':' and text[16] == ':'):
+        return False
+    return text[4] == '-' and text[7] == '-'
+
+
 def parse_datetime(datetime_str: str, base_datetime: datetime = None) -> str:
     """
     解析日期时间模式并返回格式化的字符串
     支持简单模式如${yyyy}、${MM}、${dd}、${HH}、${mm}、${ss}，以及原有复杂模式
     """
-    # 定义支持的模式
-    patterns = {
-        # 简单模式
-        r'\$\{yyyy([+-]\d+y)?\}': {'format': '%Y', 'units': {'y': 'years'}},
-        r'\$\{MM([+-]\d+M)?\}': {'format': '%m', 'units': {'M': 'months'}},
-        r'\$\{dd([+-]\d+d)?\}': {'format': '%d', 'units': {'d': 'days'}},
-        r'\$\{HH([+-]\d+H)?\}': {'format': '%H', 'units': {'H': 'hours'}},
-        r'\$\{mm([+-]\d+m)?\}': {'format': '%M', 'units': {'m': 'minutes'}},
-        r'\$\{ss([+-]\d+s)?\}': {'format': '%S', 'units': {'s': 'seconds'}},
-        # 复杂模式
-        r'\$\{yyyyMMdd([+-]\d+[yMwd])?\}': {
-            'format': '%Y%m%d',
-            'units': {'y': 'years', 'M': 'months', 'w': 'weeks', 'd': 'days'}
-        },
-        r'\$\{yyyy-MM-dd([+-]\d+[yMwd])?\}': {
-            'format': '%Y-%m-%d',
-            'units': {'y': 'years', 'M': 'months', 'w': 'weeks', 'd': 'days'}
-        },
-        r'\$\{yyyyMMddHHmmss([+-]\d+[yMwHmd])?\}': {
-            'format': '%Y%m%d%H%M%S',
-            'units': {'y': 'years', 'M': 'months', 'w': 'weeks', 'H': 'hours', 'm': 'minutes', 'd': 'days'}
-        },
-        r'\$\{yyyy-MM-dd HH:mm:ss([+-]\d+[yMwHmd])?\}': {
-            'format': '%Y-%m-%d %H:%M:%S',
-            'units': {'y': 'years', 'M': 'months', 'w': 'weeks', 'H': 'hours', 'm': 'minutes', 'd': 'days'}
-        }
-    }
-
+    # 所有模式都以 ${ 开头，不含 ${ 的字符串（如固定日期）直接返回
+    if '${' not in datetime_str:
+        return datetime_str
+    
     def replace_datetime_pattern(match):
         pattern_str = match.group(0)
         pattern_config = None
-        for regex, config in patterns.items():
-            if re.match(regex, pattern_str):
+        for regex, config in _DATETIME_PATTERNS:
+            if regex.match(pattern_str):
                 pattern_config = config
                 break
         if not pattern_config:
             return pattern_str
-        offset_match = re.search(r'([+-])(\d+)([yMwdHms])', pattern_str)
+        offset_match = _OFFSET_RE.search(pattern_str)
         now = base_datetime or datetime.now()
         if offset_match:
             operation = offset_match.group(1)
@@ -84,7 +99,7 @@ def parse_datetime(datetime_str: str, base_datetime: datetime = None) -> str:
                 now = now + timedelta(seconds=seconds) if operation == '+' else now - timedelta(seconds=seconds)
         formatted = now.strftime(pattern_config['format'])
         return formatted
-    result = re.sub(r'\$\{[^}]+\}', replace_datetime_pattern, datetime_str)
+    result = _TEMPLATE_RE.sub(replace_datetime_pattern, datetime_str)
     return result
 
 
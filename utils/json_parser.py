@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+from typing import Any, List
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
+
+
+# 所有数字映射为0，用于查找连续的长数字串
+_DIGITS_TO_ZERO = bytes.maketrans(b'123456789', b'000000000')
+# orjson会把超出64位范围的整数（至少19位数字）静默转换为float，与标准库结果不同
+_LONG_DIGIT_RUN = b'0' * 19
+
+
+def _may_contain_big_integer(data: bytes) -> bool:
+    """判断UTF-8文本中是否有至少19位的连续数字"""
+    return _LONG_DIGIT_RUN in data.translate(_DIGITS_TO_ZERO)
+
+
+def loads_fast(text):
+    """
+    解析JSON字符串，优先使用orjson，结果与 json.loads 一致。
+
+    可能含超大整数的文本和orjson拒绝的输入（NaN/Infinity、孤立代理字符等）回退到标准库，
+    错误时抛出标准库的异常；非字符串参数直接交给标准库处理。
+    """
+    if orjson is not None and isinstance(text, str):
+        data = text.encode('utf-8', 'surrogatepass')
+        if not _may_contain_big_integer(data):
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+    return json.loads(text)
+
+
+def loads_many(texts: List[str]) -> List[Any]:
+    """
+    逐个解析一批JSON字符串，结果与逐个调用 json.loads 一致，无法解析的文本保留原字符串。
+
+    超大整数只需对整批文本检查一次：以逗号连接不会让相邻文本的数字连成一串。
+    """
+    use_orjson = orjson is not None and not _may_contain_big_integer(",".join(texts).encode('utf-8', 'surrogatepass'))
+    values = []
+    for text in texts:
+        if use_orjson:
+            try:
+                values.append(orjson.loads(text))
+                continue
+            except orjson.JSONDecodeError:
+                pass
+        try:
+            values.append(json.loads(text))
+        except json.JSONDecodeError:
+            values.append(text)
+    return values